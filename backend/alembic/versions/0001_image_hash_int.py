@@ -0,0 +1,51 @@
+"""이미지 해시 BIGINT 컬럼 추가 및 기존 hex 해시 백필
+
+Revision ID: 0001_image_hash_int
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_image_hash_int"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HASH_COLUMNS = [
+    ("sightings", "image_hash", "image_hash_int"),
+    ("cleanups", "before_image_hash", "before_image_hash_int"),
+    ("cleanups", "after_image_hash", "after_image_hash_int"),
+]
+
+
+def _has_column(table: str, column: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(c["name"] == column for c in inspector.get_columns(table))
+
+
+def upgrade() -> None:
+    # 테이블은 앱 시작 시 create_all로 만들어지므로 이미 컬럼이 있을 수 있음
+    for table, _, int_column in HASH_COLUMNS:
+        if not _has_column(table, int_column):
+            op.add_column(table, sa.Column(int_column, sa.BigInteger(), nullable=True))
+
+    # Postgres: hex 문자열 → bit(64) → bigint (부호 있는 64비트로 그대로 재해석)
+    if op.get_bind().dialect.name == "postgresql":
+        for table, hex_column, int_column in HASH_COLUMNS:
+            op.execute(
+                f"UPDATE {table} "
+                f"SET {int_column} = ('x' || lpad({hex_column}, 16, '0'))::bit(64)::bigint "
+                f"WHERE {hex_column} ~ '^[0-9a-f]{{1,16}}$' AND {int_column} IS NULL"
+            )
+    # 그 외 DB는 앱 시작 시 ImageHashService.backfill_hash_ints가 채운다
+
+
+def downgrade() -> None:
+    for table, _, int_column in HASH_COLUMNS:
+        op.drop_column(table, int_column)
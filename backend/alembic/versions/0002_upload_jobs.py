@@ -0,0 +1,81 @@
+"""지연 업로드 큐: upload_jobs 테이블, upload_status 컬럼, 사진 URL nullable
+
+Revision ID: 0002_upload_jobs
+Revises: 0001_image_hash_int
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_upload_jobs"
+down_revision: Union[str, None] = "0001_image_hash_int"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PHOTO_URL_COLUMNS = [
+    ("sightings", "photo_url"),
+    ("cleanups", "before_photo_url"),
+    ("cleanups", "after_photo_url"),
+]
+
+
+def _has_table(table: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def _has_column(table: str, column: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(c["name"] == column for c in inspector.get_columns(table))
+
+
+def upgrade() -> None:
+    # 테이블은 앱 시작 시 create_all로 만들어질 수 있으므로 없을 때만 생성
+    if not _has_table("upload_jobs"):
+        op.create_table(
+            "upload_jobs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("target_type", sa.String(20), nullable=False),
+            sa.Column("target_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("target_field", sa.String(30), nullable=False),
+            sa.Column("folder", sa.String(50), nullable=False),
+            sa.Column("spool_path", sa.String(), nullable=False),
+            sa.Column("content_type", sa.String(50)),
+            sa.Column("status", sa.String(20)),
+            sa.Column("attempts", sa.Integer()),
+            sa.Column("next_attempt_at", sa.DateTime()),
+            sa.Column("locked_until", sa.DateTime(), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index(
+            "ix_upload_jobs_status_next_attempt", "upload_jobs", ["status", "next_attempt_at"]
+        )
+
+    for table in ("sightings", "cleanups"):
+        if not _has_column(table, "upload_status"):
+            op.add_column(
+                table,
+                sa.Column("upload_status", sa.String(20), nullable=True, server_default="uploaded"),
+            )
+
+    # 지연 업로드 중에는 URL이 비어 있다
+    for table, column in PHOTO_URL_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.String(), nullable=True)
+
+
+def downgrade() -> None:
+    for table, column in PHOTO_URL_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.String(), nullable=False)
+    for table in ("sightings", "cleanups"):
+        op.drop_column(table, "upload_status")
+    op.drop_index("ix_upload_jobs_status_next_attempt", table_name="upload_jobs")
+    op.drop_table("upload_jobs")
@@ -0,0 +1,41 @@
+"""이미지 정규화: 썸네일 URL 컬럼
+
+Revision ID: 0003_thumbnails
+Revises: 0002_upload_jobs
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_thumbnails"
+down_revision: Union[str, None] = "0002_upload_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+THUMBNAIL_COLUMNS = [
+    ("sightings", "thumbnail_url"),
+    ("cleanups", "before_thumbnail_url"),
+    ("cleanups", "after_thumbnail_url"),
+]
+
+
+def _has_column(table: str, column: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(c["name"] == column for c in inspector.get_columns(table))
+
+
+def upgrade() -> None:
+    # 기존 기록은 썸네일 없이 원본 URL만 사용
+    for table, column in THUMBNAIL_COLUMNS:
+        if not _has_column(table, column):
+            op.add_column(table, sa.Column(column, sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    for table, column in THUMBNAIL_COLUMNS:
+        op.drop_column(table, column)
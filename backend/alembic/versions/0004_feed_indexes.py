@@ -0,0 +1,61 @@
+"""피드/승인 대기열/지도 조회용 인덱스
+
+Revision ID: 0004_feed_indexes
+Revises: 0003_thumbnails
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_feed_indexes"
+down_revision: Union[str, None] = "0003_thumbnails"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = sa.text("status = 'pending'")
+
+# (이름, 테이블, 컬럼, 부분 인덱스 조건)
+INDEXES = [
+    ("ix_sightings_created_at_id", "sightings", ["created_at", "id"], None),
+    ("ix_sightings_status_created_at", "sightings", ["status", "created_at"], None),
+    ("ix_sightings_user_status", "sightings", ["user_id", "status"], None),
+    ("ix_sightings_pending_created_at", "sightings", ["created_at"], PENDING),
+    ("ix_cleanups_created_at_id", "cleanups", ["created_at", "id"], None),
+    ("ix_cleanups_status_created_at", "cleanups", ["status", "created_at"], None),
+    ("ix_cleanups_user_status", "cleanups", ["user_id", "status"], None),
+    ("ix_cleanups_trash_type_created_at", "cleanups", ["trash_type", "created_at"], None),
+    ("ix_cleanups_pending_created_at", "cleanups", ["created_at"], PENDING),
+]
+
+
+def _has_index(table: str, name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(index["name"] == name for index in inspector.get_indexes(table))
+
+
+def upgrade() -> None:
+    # 테이블은 앱 시작 시 create_all로 인덱스까지 만들어질 수 있으므로 없을 때만 생성
+    # Postgres는 CONCURRENTLY로 만들어 운영 중 쓰기를 막지 않음 (트랜잭션 밖에서 실행해야 함)
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            if _has_index(table, name):
+                continue
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=where,
+                postgresql_concurrently=postgres,
+                sqlite_where=where,
+            )
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,52 @@
+"""목록/랭킹 전체 개수 카운터: row_counters 테이블 + 현재 데이터로 채움
+
+Revision ID: 0005_row_counters
+Revises: 0004_feed_indexes
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_row_counters"
+down_revision: Union[str, None] = "0004_feed_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.services.count_service.TRACKED_COLUMNS와 같게 유지
+TRACKED_COLUMNS = {
+    "sightings": ("status",),
+    "cleanups": ("status", "trash_type"),
+    "users": (),
+}
+
+
+def upgrade() -> None:
+    # 테이블은 앱 시작 시 create_all로 만들어질 수 있으므로 없을 때만 생성
+    if not sa.inspect(op.get_bind()).has_table("row_counters"):
+        op.create_table(
+            "row_counters",
+            sa.Column("name", sa.String(100), primary_key=True),
+            sa.Column("value", sa.BigInteger(), nullable=False),
+        )
+
+    # 기록 추가/상태 변경은 같은 트랜잭션에서 카운터를 갱신하므로, 그 사이 쓰기가 끼지 않게 잠근 뒤 집계
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("LOCK TABLE sightings, cleanups, users IN SHARE MODE")
+    op.execute("DELETE FROM row_counters")
+    for table, columns in TRACKED_COLUMNS.items():
+        op.execute(f"INSERT INTO row_counters (name, value) SELECT '{table}', COUNT(*) FROM {table}")
+        for column in columns:
+            op.execute(
+                f"INSERT INTO row_counters (name, value) "
+                f"SELECT '{table}:{column}=' || {column}, COUNT(*) FROM {table} "
+                f"WHERE {column} IS NOT NULL GROUP BY {column}"
+            )
+
+
+def downgrade() -> None:
+    op.drop_table("row_counters")
@@ -0,0 +1,60 @@
+"""유저 프로필 통계: user_stats 테이블 + 현재 데이터로 채움
+
+Revision ID: 0006_user_stats
+Revises: 0005_row_counters
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_user_stats"
+down_revision: Union[str, None] = "0005_row_counters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 테이블은 앱 시작 시 create_all로 만들어질 수 있으므로 없을 때만 생성
+    if not sa.inspect(op.get_bind()).has_table("user_stats"):
+        op.create_table(
+            "user_stats",
+            sa.Column(
+                "user_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("sighting_count", sa.Integer(), nullable=False),
+            sa.Column("cleanup_count", sa.Integer(), nullable=False),
+            sa.Column("creature_count", sa.Integer(), nullable=False),
+            sa.Column("badge_count", sa.Integer(), nullable=False),
+        )
+
+    # 승인/도감 등록/뱃지 획득은 같은 트랜잭션에서 통계를 갱신하므로, 그 사이 쓰기가 끼지 않게 잠근 뒤 집계
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "LOCK TABLE users, sightings, cleanups, user_collections, user_badges IN SHARE MODE"
+        )
+    op.execute("DELETE FROM user_stats")
+    op.execute(
+        """
+        INSERT INTO user_stats (user_id, sighting_count, cleanup_count, creature_count, badge_count)
+        SELECT
+            u.id,
+            (SELECT COUNT(*) FROM sightings s WHERE s.user_id = u.id AND s.status = 'approved'),
+            (SELECT COUNT(*) FROM cleanups c WHERE c.user_id = u.id AND c.status = 'approved'),
+            (SELECT COUNT(*) FROM user_collections uc WHERE uc.user_id = u.id),
+            (SELECT COUNT(*) FROM user_badges ub WHERE ub.user_id = u.id)
+        FROM users u
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_stats")
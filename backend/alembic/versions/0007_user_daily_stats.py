@@ -0,0 +1,79 @@
+"""기간 랭킹: user_daily_stats 테이블 + 현재 데이터로 채움
+
+Revision ID: 0007_user_daily_stats
+Revises: 0006_user_stats
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_user_daily_stats"
+down_revision: Union[str, None] = "0006_user_stats"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # 테이블은 앱 시작 시 create_all로 만들어질 수 있으므로 없을 때만 생성
+    if not sa.inspect(bind).has_table("user_daily_stats"):
+        op.create_table(
+            "user_daily_stats",
+            sa.Column(
+                "user_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("cleanup_count", sa.Integer(), nullable=False),
+            sa.Column("creature_count", sa.Integer(), nullable=False),
+            sa.Column("points", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_user_daily_stats_day", "user_daily_stats", ["day"])
+
+    # 지난 포인트 지급 내역은 따로 없으므로 승인된 목격/수거의 지급 포인트를 기록 날짜로 채움
+    if bind.dialect.name == "postgresql":
+        op.execute("LOCK TABLE users, cleanups, sightings, user_collections IN SHARE MODE")
+
+        def day(column: str) -> str:
+            return f"CAST({column} AS DATE)"
+    else:
+        def day(column: str) -> str:
+            return f"DATE({column})"
+
+    op.execute("DELETE FROM user_daily_stats")
+    # (컬럼, 테이블, 날짜로 쓸 시각, 값, 조건)
+    sources = [
+        ("cleanup_count", "cleanups", "created_at", "COUNT(*)", "status = 'approved'"),
+        ("creature_count", "user_collections", "discovered_at", "COUNT(*)", "true"),
+        ("points", "sightings", "created_at", "SUM(points_earned)", "status = 'approved' AND points_earned > 0"),
+        ("points", "cleanups", "created_at", "SUM(points_earned)", "status = 'approved' AND points_earned > 0"),
+    ]
+    for column, table, timestamp, value, condition in sources:
+        values = {name: "0" for name in ("cleanup_count", "creature_count", "points")}
+        values[column] = value
+        # SQLite는 INSERT ... SELECT ... ON CONFLICT에 WHERE가 있어야 파싱됨
+        op.execute(
+            f"""
+            INSERT INTO user_daily_stats (user_id, day, cleanup_count, creature_count, points, updated_at)
+            SELECT user_id, {day(timestamp)}, {values["cleanup_count"]}, {values["creature_count"]},
+                {values["points"]}, CURRENT_TIMESTAMP
+            FROM {table}
+            WHERE {condition} AND {timestamp} IS NOT NULL
+            GROUP BY user_id, {day(timestamp)}
+            ON CONFLICT (user_id, day) DO UPDATE SET {column} = user_daily_stats.{column} + excluded.{column}
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_daily_stats_day", table_name="user_daily_stats")
+    op.drop_table("user_daily_stats")
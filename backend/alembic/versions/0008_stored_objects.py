@@ -0,0 +1,40 @@
+"""저장소 파일 참조 수: stored_objects 테이블
+
+Revision ID: 0008_stored_objects
+Revises: 0007_user_daily_stats
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_stored_objects"
+down_revision: Union[str, None] = "0007_user_daily_stats"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 테이블은 앱 시작 시 create_all로 만들어질 수 있으므로 없을 때만 생성
+    # URL → 파일 경로 변환은 저장소 설정이 필요하므로 참조 수는 앱 시작 시 채움 (행이 없는 파일은 지우지 않음)
+    if not sa.inspect(op.get_bind()).has_table("stored_objects"):
+        op.create_table(
+            "stored_objects",
+            sa.Column("path", sa.String(500), primary_key=True),
+            sa.Column("ref_count", sa.Integer(), nullable=False),
+            sa.Column("protected_until", sa.DateTime(), nullable=False),
+        )
+        op.create_index(
+            "ix_stored_objects_unreferenced", "stored_objects", ["protected_until"],
+            postgresql_where=sa.text("ref_count <= 0"),
+            sqlite_where=sa.text("ref_count <= 0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stored_objects_unreferenced", table_name="stored_objects")
+    op.drop_table("stored_objects")
@@ -1,6 +1,6 @@
 """API 라우터"""
 from fastapi import APIRouter
-from app.api import auth, users, sightings, cleanups, creatures, collection, badges, rankings, maps, ai, market, aquarium
+from app.api import auth, users, sightings, cleanups, creatures, collection, badges, rankings, maps, ai, market, aquarium, media, uploads
 
 api_router = APIRouter()
 
@@ -16,3 +16,5 @@ api_router.include_router(maps.router, prefix="/maps", tags=["지도"])
 api_router.include_router(ai.router, prefix="/ai", tags=["AI 분류"])
 api_router.include_router(market.router)
 api_router.include_router(aquarium.router)
+api_router.include_router(media.router, prefix="/media", tags=["미디어"])
+api_router.include_router(uploads.router, prefix="/uploads", tags=["업로드"])
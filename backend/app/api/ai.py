@@ -1,8 +1,8 @@
 """AI 분류 엔드포인트"""
 from fastapi import APIRouter, Depends, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_admin_user
 from app.models.user import User
 from app.schemas.ai import (
     CreatureClassifyResponse,
@@ -13,6 +13,8 @@ from app.schemas.ai import (
 from app.services.creature_ai import creature_classifier
 from app.services.trash_ai import trash_classifier
 from app.services.image_hash import image_hash_service
+from app.services.result_cache import result_cache
+from app.services.upload_reader import read_image_upload
 
 
 router = APIRouter()
@@ -28,8 +30,8 @@ async def classify_creature(
     - AI가 생물 종류 추천
     - 신뢰도 반환
     """
-    image_bytes = await photo.read()
-    result = await creature_classifier.classify(image_bytes)
+    upload = await read_image_upload(photo)
+    result = await creature_classifier.classify(upload.data, upload.digest)
 
     return CreatureClassifyResponse(
         suggested_creature=result["suggested_creature"],
@@ -48,8 +50,8 @@ async def classify_trash(
     """
     쓰레기 사진 → 종류 분류
     """
-    image_bytes = await photo.read()
-    result = await trash_classifier.classify_trash(image_bytes)
+    upload = await read_image_upload(photo)
+    result = await trash_classifier.classify_trash(upload.data, upload.digest)
 
     return TrashClassifyResponse(
         trash_type=result["trash_type"],
@@ -68,10 +70,12 @@ async def verify_cleanup(
     Before/After 변화 검증
     - 실제로 청소가 되었는지 확인
     """
-    before_bytes = await before_photo.read()
-    after_bytes = await after_photo.read()
+    before = await read_image_upload(before_photo)
+    after = await read_image_upload(after_photo)
 
-    result = await trash_classifier.verify_cleanup(before_bytes, after_bytes)
+    result = await trash_classifier.verify_cleanup(
+        before.data, after.data, [before.digest, after.digest]
+    )
 
     return CleanupVerifyResponse(
         is_valid=result["is_valid"],
@@ -85,16 +89,17 @@ async def verify_cleanup(
 async def check_duplicate(
     photo: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     이미지 중복 검사
     - 같은 사진 재업로드 방지
     - 도용 방지
     """
-    image_bytes = await photo.read()
+    upload = await read_image_upload(photo)
+    image_hash = await image_hash_service.compute_hash_async(upload.data, upload.digest)
     result = await image_hash_service.check_duplicate(
-        db, image_bytes, current_user.id
+        db, upload.data, current_user.id, image_hash=image_hash
     )
 
     return DuplicateCheckResponse(
@@ -104,3 +109,21 @@ async def check_duplicate(
         is_same_user=result.get("is_same_user"),
         distance=result.get("distance"),
     )
+
+
+@router.get("/metrics")
+async def get_ai_metrics(
+    admin_user: User = Depends(get_admin_user)
+):
+    """
+    AI 추론 지표 (관리자)
+    - 모델별 배치 크기 분포
+    - 결과 캐시 적중률
+    """
+    return {
+        "batching": {
+            "creature": creature_classifier.batcher.stats(),
+            "trash": trash_classifier.batcher.stats(),
+        },
+        "result_cache": result_cache.stats(),
+    }
@@ -1,6 +1,7 @@
 """아쿠아리움 API"""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
@@ -13,11 +14,11 @@ router = APIRouter(prefix="/aquarium", tags=["아쿠아리움"])
 
 @router.get("", response_model=AquariumListResponse)
 async def get_my_aquarium(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """내 아쿠아리움 목록"""
-    items = db.query(Aquarium).filter(Aquarium.user_id == current_user.id).all()
+    items = (await db.scalars(select(Aquarium).where(Aquarium.user_id == current_user.id))).all()
 
     result = []
     for item in items:
@@ -40,14 +41,14 @@ async def get_my_aquarium(
 @router.delete("/{creature_id}")
 async def remove_from_aquarium(
     creature_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """아쿠아리움에서 제거 (포인트 환불 없음)"""
-    item = (
-        db.query(Aquarium)
-        .filter(Aquarium.user_id == current_user.id, Aquarium.creature_id == creature_id)
-        .first()
+    item = await db.scalar(
+        select(Aquarium)
+        .where(Aquarium.user_id == current_user.id, Aquarium.creature_id == creature_id)
+        .limit(1)
     )
 
     if not item:
@@ -56,6 +57,6 @@ async def remove_from_aquarium(
             detail="아쿠아리움에서 찾을 수 없습니다",
         )
 
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     return {"message": "아쿠아리움에서 제거되었습니다"}
@@ -1,16 +1,17 @@
 """인증 (구글 OAuth)"""
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt
 from pydantic import BaseModel
-import httpx
 import logging
 
 from app.api.deps import get_db, get_current_user
 from app.config import settings
 from app.models.user import User
 from app.schemas.user import UserResponse, TokenResponse
+from app.services.http_client import http_client
 
 
 router = APIRouter()
@@ -45,82 +46,80 @@ def create_access_token(user_id: str) -> str:
 
 async def verify_google_token(id_token: str) -> GoogleUserInfo:
     """Google ID 토큰 검증"""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"https://oauth2.googleapis.com/tokeninfo?id_token={id_token}"
+    response = await http_client.client.get(
+        f"https://oauth2.googleapis.com/tokeninfo?id_token={id_token}"
+    )
+
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="유효하지 않은 Google 토큰입니다"
         )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="유효하지 않은 Google 토큰입니다"
-            )
-
-        data = response.json()
-
-        # 클라이언트 ID 검증
-        if data.get("aud") != settings.GOOGLE_CLIENT_ID:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="토큰의 대상이 올바르지 않습니다"
-            )
-
-        return GoogleUserInfo(
-            email=data["email"],
-            name=data.get("name", data["email"].split("@")[0]),
-            picture=data.get("picture"),
-            sub=data["sub"]
+    data = response.json()
+
+    # 클라이언트 ID 검증
+    if data.get("aud") != settings.GOOGLE_CLIENT_ID:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="토큰의 대상이 올바르지 않습니다"
         )
 
+    return GoogleUserInfo(
+        email=data["email"],
+        name=data.get("name", data["email"].split("@")[0]),
+        picture=data.get("picture"),
+        sub=data["sub"]
+    )
+
 
 async def exchange_authorization_code(code: str) -> str:
     """Google Authorization Code를 ID 토큰으로 교환"""
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                "grant_type": "authorization_code",
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+    response = await http_client.client.post(
+        "https://oauth2.googleapis.com/token",
+        data={
+            "code": code,
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            "grant_type": "authorization_code",
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+    if response.status_code != 200:
+        try:
+            error_body = response.json()
+        except Exception:
+            error_body = response.text
+
+        logger.warning(
+            "Google token exchange failed: status=%s body=%s",
+            response.status_code,
+            error_body,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "message": "Google 인증 코드가 유효하지 않습니다",
+                "google_response": error_body,
+            }
         )
 
-        if response.status_code != 200:
-            try:
-                error_body = response.json()
-            except Exception:
-                error_body = response.text
-
-            logger.warning(
-                "Google token exchange failed: status=%s body=%s",
-                response.status_code,
-                error_body,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "message": "Google 인증 코드가 유효하지 않습니다",
-                    "google_response": error_body,
-                }
-            )
-
-        tokens = response.json()
-        id_token = tokens.get("id_token")
-        if not id_token:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Google 토큰을 가져올 수 없습니다"
-            )
-        return id_token
+    tokens = response.json()
+    id_token = tokens.get("id_token")
+    if not id_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Google 토큰을 가져올 수 없습니다"
+        )
+    return id_token
 
 
 @router.post("/google", response_model=TokenResponse)
 async def google_login(
     request: GoogleLoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     구글 로그인
@@ -142,7 +141,7 @@ async def google_login(
         google_user = await verify_google_token(id_token)
 
     # 기존 유저 조회
-    user = db.query(User).filter(User.email == google_user.email).first()
+    user = await db.scalar(select(User).where(User.email == google_user.email).limit(1))
 
     if not user:
         # 신규 유저 생성
@@ -154,13 +153,13 @@ async def google_login(
             provider_id=google_user.sub
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
     else:
         # 기존 유저 정보 업데이트
         if google_user.picture and user.profile_image != google_user.picture:
             user.profile_image = google_user.picture
-            db.commit()
+            await db.commit()
 
     # JWT 토큰 생성
     access_token = create_access_token(str(user.id))
@@ -1,7 +1,8 @@
 """업적/뱃지"""
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user, get_admin_user
 from app.models.user import User
@@ -14,12 +15,12 @@ router = APIRouter()
 
 
 @router.get("", response_model=BadgeListResponse)
-async def list_badges(db: Session = Depends(get_db)):
+async def list_badges(db: AsyncSession = Depends(get_db)):
     """전체 뱃지 목록"""
     from app.services.badge_awarder import _seed_static_badges
 
-    _seed_static_badges(db)
-    badges = db.query(Badge).order_by(Badge.name).all()
+    await db.run_sync(_seed_static_badges)
+    badges = (await db.scalars(select(Badge).order_by(Badge.name))).all()
     return BadgeListResponse(
         badges=badges,
         total=len(badges)
@@ -29,21 +30,22 @@ async def list_badges(db: Session = Depends(get_db)):
 @router.get("/my")
 async def get_my_badges(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """내 뱃지"""
-    user_badges = db.query(UserBadge).filter(
-        UserBadge.user_id == current_user.id
-    ).all()
-
-    result = []
-    for ub in user_badges:
-        badge = db.query(Badge).filter(Badge.id == ub.badge_id).first()
-        if badge:
-            result.append({
-                "badge": badge,
-                "earned_at": ub.earned_at
-            })
+    rows = (await db.execute(
+        select(Badge, UserBadge.earned_at)
+        .join(UserBadge, UserBadge.badge_id == Badge.id)
+        .where(UserBadge.user_id == current_user.id)
+    )).all()
+
+    result = [
+        {
+            "badge": badge,
+            "earned_at": earned_at
+        }
+        for badge, earned_at in rows
+    ]
 
     return {"badges": result, "total": len(result)}
 
@@ -51,7 +53,7 @@ async def get_my_badges(
 @router.post("", response_model=BadgeResponse, status_code=status.HTTP_201_CREATED)
 async def create_badge(
     badge_data: BadgeCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """정적 뱃지로 관리 → 생성 비활성화"""
     raise HTTPException(
@@ -65,17 +67,17 @@ async def award_badge(
     badge_id: UUID,
     user_id: UUID,
     admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """뱃지 수여 (관리자)"""
-    badge = db.query(Badge).filter(Badge.id == badge_id).first()
+    badge = await db.get(Badge, badge_id)
     if not badge:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="뱃지를 찾을 수 없습니다"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -83,10 +85,10 @@ async def award_badge(
         )
 
     # 이미 보유 중인지 확인
-    existing = db.query(UserBadge).filter(
+    existing = await db.scalar(select(UserBadge).where(
         UserBadge.user_id == user_id,
         UserBadge.badge_id == badge_id
-    ).first()
+    ).limit(1))
 
     if existing:
         raise HTTPException(
@@ -100,6 +102,6 @@ async def award_badge(
     )
 
     db.add(user_badge)
-    db.commit()
+    await db.commit()
 
     return {"message": "뱃지가 수여되었습니다"}
@@ -1,15 +1,26 @@
 """쓰레기 수거 CRUD"""
+import asyncio
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 
 from app.api.deps import get_db, get_current_user, get_admin_user
 from app.models.user import User
 from app.models.cleanup import Cleanup
-from app.schemas.cleanup import CleanupCreate, CleanupResponse, CleanupListResponse, CleanupDetailResponse
+from app.schemas.cleanup import (
+    CleanupCreate, CleanupFinalize, CleanupResponse, CleanupListResponse, CleanupDetailResponse
+)
+from app.config import settings
 from app.services.storage import storage_service
+from app.services.image_pipeline import image_pipeline
+from app.services.upload_queue import upload_queue
+from app.services.count_service import count_service
+from app.services.pagination import fetch_feed_page
+from app.services.upload_reader import UploadedImage, read_image_upload
+from app.services.direct_upload import direct_upload_service
 from app.services.image_hash import image_hash_service
 from app.services.point_service import point_service
 
@@ -17,41 +28,47 @@ from app.services.point_service import point_service
 router = APIRouter()
 
 
-@router.post("", response_model=CleanupResponse, status_code=status.HTTP_201_CREATED)
-async def create_cleanup(
-    latitude: float = Form(...),
-    longitude: float = Form(...),
-    location_name: Optional[str] = Form(None),
-    trash_type: str = Form(...),
-    amount: str = Form(...),
-    ai_verified: bool = Form(False),
-    ai_confidence: Optional[float] = Form(None),
-    before_photo: UploadFile = File(...),
-    after_photo: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    수거 인증 등록
-    - Before/After 사진 업로드
-    - AI 검증 결과 포함 가능
-    """
-    # 이미지 읽기
-    before_bytes = await before_photo.read()
-    after_bytes = await after_photo.read()
+def reward_cleanup(db: Session, cleanup: Cleanup) -> None:
+    """승인된 수거 포인트 지급 (커밋은 호출한 쪽에서)"""
+    # 포인트 계산
+    points_result = point_service.calculate_cleanup_points(
+        db, str(cleanup.user_id), cleanup.amount,
+        cleanup.latitude, cleanup.longitude
+    )
+
+    cleanup.points_earned = points_result["total_points"]
+
+    # 유저 포인트 추가
+    point_service.add_points(db, str(cleanup.user_id), points_result["total_points"])
 
-    # 이미지 해시 계산 및 중복/유사도 검사
-    before_hash = image_hash_service.compute_hash(before_bytes)
-    after_hash = image_hash_service.compute_hash(after_bytes)
 
-    before_dup = await image_hash_service.check_duplicate(db, before_bytes, current_user.id)
+async def register_cleanup(
+    db: AsyncSession,
+    current_user: User,
+    before_upload: UploadedImage,
+    after_upload: UploadedImage,
+    data: CleanupCreate,
+) -> Cleanup:
+    """사진 확인 → 저장 → 수거 기록 생성 (멀티파트 업로드/직접 업로드 공통)"""
+    # 정규화 + 이미지 해시 계산 및 중복/유사도 검사 (두 장 동시에)
+    before, after = await asyncio.gather(
+        image_pipeline.prepare(before_upload),
+        image_pipeline.prepare(after_upload),
+    )
+    before_hash, after_hash = before.phash, after.phash
+
+    # 같은 세션을 동시에 쓰지 않도록 차례로 (인덱스 최신화는 첫 번째에서만, 검색은 메모리에서)
+    before_dup = await image_hash_service.check_duplicate(
+        db, before_upload.data, current_user.id, image_hash=before_hash
+    )
+    after_dup = await image_hash_service.check_duplicate(
+        db, after_upload.data, current_user.id, image_hash=after_hash, sync=False
+    )
     if before_dup["is_duplicate"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Before 사진이 이미 등록된 사진과 유사합니다. 다른 사진을 사용해 주세요."
         )
-
-    after_dup = await image_hash_service.check_duplicate(db, after_bytes, current_user.id)
     if after_dup["is_duplicate"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -65,91 +82,189 @@ async def create_cleanup(
             detail="Before/After 사진이 너무 비슷합니다. 다른 각도에서 촬영해 주세요."
         )
 
-    # Supabase Storage에 업로드
-    before_url = await storage_service.upload_image(before_bytes, folder="cleanups/before")
-    after_url = await storage_service.upload_image(after_bytes, folder="cleanups/after")
+    variants = (
+        before.variants("cleanups/before", "before_photo_url", "before_thumbnail_url")
+        + after.variants("cleanups/after", "after_photo_url", "after_thumbnail_url")
+    )
+    deferred = settings.UPLOAD_MODE == "deferred"
+    if deferred:
+        # 로컬에 저장만 하고 Storage 업로드는 백그라운드 워커가 처리
+        spool_paths = await asyncio.to_thread(upload_queue.spool_variants, variants)
+        urls = {}
+    else:
+        # Storage에 동시 업로드 (하나라도 실패하면 성공한 쪽을 지움)
+        urls = await image_pipeline.upload(variants, db)
 
     # 수거 기록 생성
     cleanup = Cleanup(
         user_id=current_user.id,
-        before_photo_url=before_url,
-        after_photo_url=after_url,
+        before_photo_url=urls.get("before_photo_url"),
+        after_photo_url=urls.get("after_photo_url"),
+        before_thumbnail_url=urls.get("before_thumbnail_url"),
+        after_thumbnail_url=urls.get("after_thumbnail_url"),
+        latitude=data.latitude,
+        longitude=data.longitude,
+        location_name=data.location_name,
+        trash_type=data.trash_type,
+        amount=data.amount,
+        before_image_hash=before_hash,
+        after_image_hash=after_hash,
+        before_image_hash_int=image_hash_service.hash_to_int(before_hash),
+        after_image_hash_int=image_hash_service.hash_to_int(after_hash),
+        ai_verified=data.ai_verified,
+        ai_confidence=data.ai_confidence,
+        status="pending",
+        upload_status="processing" if deferred else "uploaded",
+    )
+
+    try:
+        db.add(cleanup)
+        if deferred:
+            await db.flush()
+            upload_queue.enqueue_variants(db, "cleanup", cleanup.id, variants, spool_paths)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        if deferred:
+            upload_queue.discard_spool(spool_paths)
+        else:
+            await storage_service.discard_uploads(list(urls.values()))
+        raise
+    if deferred:
+        upload_queue.notify()
+    await db.refresh(cleanup)
+    image_hash_service.register_cleanup(cleanup)
+
+    return cleanup
+
+
+@router.post("", response_model=CleanupResponse, status_code=status.HTTP_201_CREATED)
+async def create_cleanup(
+    latitude: float = Form(...),
+    longitude: float = Form(...),
+    location_name: Optional[str] = Form(None),
+    trash_type: str = Form(...),
+    amount: str = Form(...),
+    ai_verified: bool = Form(False),
+    ai_confidence: Optional[float] = Form(None),
+    before_photo: UploadFile = File(...),
+    after_photo: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    수거 인증 등록
+    - Before/After 사진 업로드
+    - AI 검증 결과 포함 가능
+    """
+    data = CleanupCreate(
         latitude=latitude,
         longitude=longitude,
         location_name=location_name,
         trash_type=trash_type,
         amount=amount,
-        before_image_hash=before_hash,
-        after_image_hash=after_hash,
         ai_verified=ai_verified,
         ai_confidence=ai_confidence,
-        status="pending"
     )
 
-    db.add(cleanup)
-    db.commit()
-    db.refresh(cleanup)
+    # 이미지 읽기 (크기/형식 확인)
+    before_upload = await read_image_upload(before_photo)
+    after_upload = await read_image_upload(after_photo)
+    return await register_cleanup(db, current_user, before_upload, after_upload, data)
 
-    return cleanup
+
+@router.post("/finalize", response_model=CleanupResponse, status_code=status.HTTP_201_CREATED)
+async def finalize_cleanup(
+    request: CleanupFinalize,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    직접 업로드한 Before/After 사진으로 수거 인증 등록
+    - 두 사진을 각각 /api/uploads/sign으로 받은 URL에 올린 뒤 토큰과 함께 호출
+    """
+    object_keys = [
+        direct_upload_service.verify_token(request.before_upload_token, current_user.id),
+        direct_upload_service.verify_token(request.after_upload_token, current_user.id),
+    ]
+    try:
+        before_upload, after_upload = await asyncio.gather(
+            *(direct_upload_service.fetch(object_key) for object_key in object_keys)
+        )
+        return await register_cleanup(db, current_user, before_upload, after_upload, request)
+    finally:
+        # 성공/실패와 관계없이 임시 파일 정리 (실패하면 다시 서명받아 올려야 함)
+        await direct_upload_service.discard(object_keys)
 
 
 @router.get("", response_model=CleanupListResponse)
 async def list_cleanups(
-    page: int = 1,
-    limit: int = 20,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
     user_id: Optional[UUID] = None,
     trash_type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     수거 목록
-    - 페이지네이션
+    - 커서 페이지네이션: 응답의 next_cursor를 다음 요청의 cursor로 전달
+    - page는 이전 클라이언트 호환용 (cursor가 없고 page > 1이면 OFFSET)
     - 상태/유저/쓰레기 종류 필터링
     """
-    query = db.query(Cleanup)
+    query = select(Cleanup)
 
     if status:
-        query = query.filter(Cleanup.status == status)
+        query = query.where(Cleanup.status == status)
     if user_id:
-        query = query.filter(Cleanup.user_id == user_id)
+        query = query.where(Cleanup.user_id == user_id)
     if trash_type:
-        query = query.filter(Cleanup.trash_type == trash_type)
+        query = query.where(Cleanup.trash_type == trash_type)
 
-    total = query.count()
+    # 전체 개수는 첫 요청에서만 (카운터/캐시에서 조회)
+    total = None
+    if cursor is None:
+        total = await count_service.count(
+            db, Cleanup, status=status, user_id=user_id, trash_type=trash_type
+        )
 
-    cleanups = query.order_by(desc(Cleanup.created_at)).offset(
-        (page - 1) * limit
-    ).limit(limit).all()
+    cleanups, next_cursor = await fetch_feed_page(
+        db, query, Cleanup, cursor, limit, offset=(page - 1) * limit
+    )
 
     return CleanupListResponse(
         cleanups=cleanups,
         total=total,
         page=page,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{cleanup_id}", response_model=CleanupDetailResponse)
 async def get_cleanup(
     cleanup_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """수거 상세"""
-    cleanup = db.query(Cleanup).filter(Cleanup.id == cleanup_id).first()
+    cleanup = await db.get(Cleanup, cleanup_id)
     if not cleanup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="수거 기록을 찾을 수 없습니다"
         )
 
-    user = db.query(User).filter(User.id == cleanup.user_id).first()
+    user = await db.get(User, cleanup.user_id)
 
     return CleanupDetailResponse(
         id=cleanup.id,
         user_id=cleanup.user_id,
         before_photo_url=cleanup.before_photo_url,
         after_photo_url=cleanup.after_photo_url,
+        before_thumbnail_url=cleanup.before_thumbnail_url,
+        after_thumbnail_url=cleanup.after_thumbnail_url,
+        upload_status=cleanup.upload_status,
         latitude=cleanup.latitude,
         longitude=cleanup.longitude,
         location_name=cleanup.location_name,
@@ -170,13 +285,13 @@ async def get_cleanup(
 async def approve_cleanup(
     cleanup_id: UUID,
     admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     수거 승인 (관리자)
     - 포인트 지급
     """
-    cleanup = db.query(Cleanup).filter(Cleanup.id == cleanup_id).first()
+    cleanup = await db.get(Cleanup, cleanup_id)
     if not cleanup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -191,19 +306,11 @@ async def approve_cleanup(
 
     cleanup.status = "approved"
 
-    # 포인트 계산
-    points_result = point_service.calculate_cleanup_points(
-        db, str(cleanup.user_id), cleanup.amount,
-        cleanup.latitude, cleanup.longitude
-    )
-
-    cleanup.points_earned = points_result["total_points"]
-
-    # 유저 포인트 추가
-    point_service.add_points(db, str(cleanup.user_id), points_result["total_points"])
+    # 포인트 계산/지급은 동기 서비스라 run_sync로 같은 커넥션에서 실행
+    await db.run_sync(reward_cleanup, cleanup)
 
-    db.commit()
-    db.refresh(cleanup)
+    await db.commit()
+    await db.refresh(cleanup)
 
     return cleanup
 
@@ -212,10 +319,10 @@ async def approve_cleanup(
 async def reject_cleanup(
     cleanup_id: UUID,
     admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """수거 거절 (관리자)"""
-    cleanup = db.query(Cleanup).filter(Cleanup.id == cleanup_id).first()
+    cleanup = await db.get(Cleanup, cleanup_id)
     if not cleanup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -229,7 +336,7 @@ async def reject_cleanup(
         )
 
     cleanup.status = "rejected"
-    db.commit()
-    db.refresh(cleanup)
+    await db.commit()
+    await db.refresh(cleanup)
 
     return cleanup
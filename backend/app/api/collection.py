@@ -1,6 +1,7 @@
 """유저 도감 (발견 목록)"""
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
@@ -15,14 +16,14 @@ router = APIRouter()
 @router.get("")
 async def get_my_collection(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     내 도감 (발견 목록)
     """
-    user_collections = db.query(UserCollection).filter(
+    user_collections = (await db.scalars(select(UserCollection).where(
         UserCollection.user_id == current_user.id
-    ).all()
+    ))).all()
 
     result = [
         {
@@ -39,7 +40,7 @@ async def get_my_collection(
 @router.get("/stats", response_model=CollectionStatsResponse)
 async def get_collection_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     도감 완성률
@@ -47,11 +48,9 @@ async def get_collection_stats(
     - 발견한 생물 수
     - 희귀도별 통계
     """
-    discovered = db.query(UserCollection).filter(
+    discovered_ids = set((await db.scalars(select(UserCollection.creature_id).where(
         UserCollection.user_id == current_user.id
-    ).all()
-
-    discovered_ids = {uc.creature_id for uc in discovered}
+    ))).all())
 
     by_rarity: dict[str, dict[str, int]] = {}
     for rarity in ["common", "rare", "legendary"]:
@@ -1,11 +1,11 @@
 """의존성 (현재 유저, DB 세션)"""
-from typing import Generator
+from typing import AsyncGenerator
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
 from app.config import settings
 from app.models.user import User
 
@@ -13,18 +13,15 @@ from app.models.user import User
 security = HTTPBearer()
 
 
-def get_db() -> Generator:
-    """DB 세션 의존성"""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """DB 세션 의존성 (비동기: 쿼리를 기다리는 동안 이벤트 루프를 막지 않음)"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """현재 로그인한 유저 반환"""
     credentials_exception = HTTPException(
@@ -46,7 +43,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == UUID(user_id)).first()
+    user = await db.get(User, UUID(user_id))
     if user is None:
         raise credentials_exception
 
@@ -55,7 +52,7 @@ async def get_current_user(
 
 async def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User | None:
     """현재 로그인한 유저 반환 (선택적 - 비로그인 허용)"""
     if credentials is None:
@@ -74,8 +71,7 @@ async def get_current_user_optional(
     except JWTError:
         return None
 
-    user = db.query(User).filter(User.id == UUID(user_id)).first()
-    return user
+    return await db.get(User, UUID(user_id))
 
 
 async def get_admin_user(
@@ -1,7 +1,8 @@
 """지도 데이터 (히트맵)"""
 from typing import Optional
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
 from app.models.sighting import Sighting
@@ -19,18 +20,18 @@ async def get_sighting_markers(
     category: Optional[str] = None,
     rarity: Optional[str] = None,
     limit: int = 1000,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     목격 위치 데이터
     - 지도에 마커 표시용
     """
-    query = db.query(Sighting)
+    query = select(Sighting)
 
     if status:
-        query = query.filter(Sighting.status == status)
+        query = query.where(Sighting.status == status)
 
-    sightings = query.limit(limit).all()
+    sightings = (await db.scalars(query.limit(limit))).all()
 
     markers = []
     for s in sightings:
@@ -52,7 +53,8 @@ async def get_sighting_markers(
             location_name=s.location_name,
             creature_name=NAME_BY_ID.get(s.creature_id, s.ai_suggestion),
             rarity=creature_rarity,
-            photo_url=s.photo_url
+            photo_url=s.photo_url,
+            thumbnail_url=s.thumbnail_url,
         ))
 
     return MapDataResponse(
@@ -66,20 +68,20 @@ async def get_cleanup_markers(
     status: Optional[str] = "approved",
     trash_type: Optional[str] = None,
     limit: int = 1000,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     수거 위치 데이터
     - 지도에 마커 표시용
     """
-    query = db.query(Cleanup)
+    query = select(Cleanup)
 
     if status:
-        query = query.filter(Cleanup.status == status)
+        query = query.where(Cleanup.status == status)
     if trash_type:
-        query = query.filter(Cleanup.trash_type == trash_type)
+        query = query.where(Cleanup.trash_type == trash_type)
 
-    cleanups = query.limit(limit).all()
+    cleanups = (await db.scalars(query.limit(limit))).all()
 
     markers = []
     for c in cleanups:
@@ -103,7 +105,7 @@ async def get_cleanup_markers(
 @router.get("/heatmap", response_model=HeatmapResponse)
 async def get_heatmap(
     type: str = "combined",  # sighting, cleanup, combined
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     히트맵 데이터
@@ -112,7 +114,7 @@ async def get_heatmap(
     points = []
 
     if type in ["sighting", "combined"]:
-        sightings = db.query(Sighting).filter(Sighting.status == "approved").all()
+        sightings = (await db.scalars(select(Sighting).where(Sighting.status == "approved"))).all()
         for s in sightings:
             # 희귀도에 따라 가중치 부여
             rarity = RARITY_BY_ID.get(s.creature_id) if s.creature_id else None
@@ -125,7 +127,7 @@ async def get_heatmap(
             ))
 
     if type in ["cleanup", "combined"]:
-        cleanups = db.query(Cleanup).filter(Cleanup.status == "approved").all()
+        cleanups = (await db.scalars(select(Cleanup).where(Cleanup.status == "approved"))).all()
         for c in cleanups:
             # 수거량에 따라 가중치 부여
             weight = {"handful": 1.0, "one_bag": 2.0, "large": 3.0}.get(c.amount, 1.0)
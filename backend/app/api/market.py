@@ -1,6 +1,6 @@
 """마켓 API"""
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
@@ -12,18 +12,18 @@ router = APIRouter(prefix="/market", tags=["마켓"])
 
 @router.get("", response_model=MarketListResponse)
 async def get_market_items(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """마켓 목록 조회 (내 도감 보유 생물만 표시)"""
-    service = MarketService(db)
-    return service.get_market_items(current_user.id)
+    # 마켓 로직은 동기 Session 기준이므로 run_sync로 같은 커넥션에서 실행
+    return await db.run_sync(lambda session: MarketService(session).get_market_items(current_user.id))
 
 
 @router.post("/purchase", response_model=PurchaseResponse)
 async def purchase_creatures(
     request: PurchaseRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -32,5 +32,6 @@ async def purchase_creatures(
     - 이미 아쿠아리움에 있으면 불가
     - 포인트 부족 시 에러
     """
-    service = MarketService(db)
-    return service.purchase_creatures(current_user.id, request.creature_ids)
+    return await db.run_sync(
+        lambda session: MarketService(session).purchase_creatures(current_user.id, request.creature_ids)
+    )
@@ -0,0 +1,63 @@
+"""로컬 저장소 이미지 서빙 + 서명 URL 업로드 (STORAGE_BACKEND=local)"""
+import os
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app.services.direct_upload import STAGING_FOLDER
+from app.services.storage import LocalStorageBackend, storage_service
+from app.services.upload_reader import upload_too_large_error
+
+
+router = APIRouter()
+
+
+@router.get("/{file_path:path}")
+async def get_media(file_path: str):
+    """
+    저장된 이미지 파일 반환
+    - 파일을 메모리에 올리지 않고 스트리밍 (pathsend를 지원하는 서버에서는 sendfile)
+    - 업로드 파일명은 매번 새로 만들어지므로 오래 캐시해도 됨
+    """
+    backend = storage_service.backend
+    path = backend.resolve(file_path) if isinstance(backend, LocalStorageBackend) else None
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="파일을 찾을 수 없습니다"
+        )
+    return FileResponse(
+        path,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+@router.put("/upload/{file_path:path}", status_code=status.HTTP_204_NO_CONTENT)
+async def put_signed_upload(file_path: str, expires: int, signature: str, request: Request):
+    """
+    서명 URL로 직접 업로드 (Supabase 서명 업로드 URL의 로컬 대역)
+    - 임시 업로드 폴더에만 쓸 수 있고, 본문을 청크 단위로 디스크에 씀
+    """
+    backend = storage_service.backend
+    path = backend.resolve(file_path) if isinstance(backend, LocalStorageBackend) else None
+    if (
+        path is None
+        or not file_path.startswith(f"{STAGING_FOLDER}/")
+        or not backend.verify_upload_signature(file_path, expires, signature)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="업로드 URL이 유효하지 않거나 만료되었습니다"
+        )
+
+    async def limited_body():
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.UPLOAD_MAX_BYTES:
+                raise upload_too_large_error()
+            yield chunk
+
+    await backend.write_stream(path, limited_body())
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
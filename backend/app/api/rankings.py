@@ -1,154 +1,102 @@
 """랭킹"""
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user_optional
 from app.models.user import User
-from app.models.cleanup import Cleanup
-from app.models.user_creature import UserCollection
 from app.schemas.ranking import RankingEntry, RankingResponse
+from app.services.count_service import count_service
+from app.services.leaderboard import Period, leaderboard_service
 
 
 router = APIRouter()
 
 
+async def build_ranking(
+    db: AsyncSession,
+    metric: str,
+    period: Period,
+    limit: int,
+    current_user: User | None,
+) -> RankingResponse:
+    """리더보드 상위 limit명 + 내 순위 (같은 점수는 같은 순위)"""
+    board = await leaderboard_service.get(db, metric, period)
+    top = board.top(limit)
+
+    profiles = {
+        row.id: row for row in (await db.execute(
+            select(User.id, User.nickname, User.profile_image)
+            .where(User.id.in_([user_id for _, user_id, _ in top]))
+        )).all()
+    }
+    rankings = [
+        RankingEntry(
+            rank=rank,
+            user_id=user_id,
+            nickname=profiles[user_id].nickname,
+            profile_image=profiles[user_id].profile_image,
+            value=value
+        )
+        for rank, user_id, value in top
+        if user_id in profiles  # 리더보드 로드 후 삭제된 유저
+    ]
+
+    my_rank = my_value = None
+    if current_user:
+        # 아직 리더보드에 반영되지 않은 새 유저, 기간 안에 활동이 없는 유저는 0점
+        my_value = board.score(current_user.id) or 0
+        my_rank = board.rank_of_value(my_value)
+
+    return RankingResponse(
+        rankings=rankings,
+        my_rank=my_rank,
+        my_value=my_value,
+        period=period,
+        # 기간 랭킹은 활동한 유저만 들고 있으므로 전체 유저 수는 카운터에서
+        total_users=len(board) if period == "all" else await count_service.count(db, User)
+    )
+
+
 @router.get("/collection", response_model=RankingResponse)
 async def get_collection_ranking(
     limit: int = 100,
+    period: Period = "all",
     current_user: User | None = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     도감 완성률 랭킹
     - 발견한 생물 수 기준
+    - period: week(이번 주), month(이번 달), season(이번 분기), all(전체, 기본값)
     """
-    # 유저별 발견 수 집계
-    subquery = db.query(
-        UserCollection.user_id,
-        func.count(UserCollection.creature_id).label("count")
-    ).group_by(UserCollection.user_id).subquery()
-
-    results = db.query(
-        User.id,
-        User.nickname,
-        User.profile_image,
-        subquery.c.count
-    ).outerjoin(
-        subquery, User.id == subquery.c.user_id
-    ).order_by(
-        desc(subquery.c.count)
-    ).limit(limit).all()
-
-    rankings = []
-    my_rank = None
-
-    for idx, row in enumerate(results, 1):
-        rankings.append(RankingEntry(
-            rank=idx,
-            user_id=row.id,
-            nickname=row.nickname,
-            profile_image=row.profile_image,
-            value=row.count or 0
-        ))
-
-        if current_user and row.id == current_user.id:
-            my_rank = idx
-
-    total_users = db.query(User).count()
-
-    return RankingResponse(
-        rankings=rankings,
-        my_rank=my_rank,
-        total_users=total_users
-    )
+    return await build_ranking(db, "collection", period, limit, current_user)
 
 
 @router.get("/cleanup", response_model=RankingResponse)
 async def get_cleanup_ranking(
     limit: int = 100,
+    period: Period = "all",
     current_user: User | None = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     수거왕 랭킹
     - 승인된 수거 횟수 기준
+    - period: week, month, season은 그 기간에 기록한 수거만
     """
-    # 유저별 수거 횟수 집계
-    subquery = db.query(
-        Cleanup.user_id,
-        func.count(Cleanup.id).label("count")
-    ).filter(
-        Cleanup.status == "approved"
-    ).group_by(Cleanup.user_id).subquery()
-
-    results = db.query(
-        User.id,
-        User.nickname,
-        User.profile_image,
-        subquery.c.count
-    ).outerjoin(
-        subquery, User.id == subquery.c.user_id
-    ).order_by(
-        desc(subquery.c.count)
-    ).limit(limit).all()
-
-    rankings = []
-    my_rank = None
-
-    for idx, row in enumerate(results, 1):
-        rankings.append(RankingEntry(
-            rank=idx,
-            user_id=row.id,
-            nickname=row.nickname,
-            profile_image=row.profile_image,
-            value=row.count or 0
-        ))
-
-        if current_user and row.id == current_user.id:
-            my_rank = idx
-
-    total_users = db.query(User).count()
-
-    return RankingResponse(
-        rankings=rankings,
-        my_rank=my_rank,
-        total_users=total_users
-    )
+    return await build_ranking(db, "cleanup", period, limit, current_user)
 
 
 @router.get("/points", response_model=RankingResponse)
 async def get_points_ranking(
     limit: int = 100,
+    period: Period = "all",
     current_user: User | None = Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     포인트 랭킹
+    - period: week, month, season은 그 기간에 기록한 목격/수거로 얻은 포인트 (사용한 포인트는 빼지 않음)
     """
-    results = db.query(User).order_by(
-        desc(User.points)
-    ).limit(limit).all()
-
-    rankings = []
-    my_rank = None
-
-    for idx, user in enumerate(results, 1):
-        rankings.append(RankingEntry(
-            rank=idx,
-            user_id=user.id,
-            nickname=user.nickname,
-            profile_image=user.profile_image,
-            value=user.points
-        ))
-
-        if current_user and user.id == current_user.id:
-            my_rank = idx
-
-    total_users = db.query(User).count()
-
-    return RankingResponse(
-        rankings=rankings,
-        my_rank=my_rank,
-        total_users=total_users
-    )
+    return await build_ranking(db, "points", period, limit, current_user)
@@ -1,19 +1,28 @@
 """생물 목격 CRUD"""
+import asyncio
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 
 from app.api.deps import get_db, get_current_user, get_admin_user
 from app.models.user import User
 from app.models.sighting import Sighting
 from app.models.user_creature import UserCollection
 from app.schemas.sighting import (
-    SightingCreate, SightingResponse, SightingListResponse,
+    SightingCreate, SightingFinalize, SightingResponse, SightingListResponse,
     SightingStatusUpdate, SightingDetailResponse
 )
+from app.config import settings
 from app.services.storage import storage_service
+from app.services.image_pipeline import image_pipeline
+from app.services.upload_queue import upload_queue
+from app.services.count_service import count_service
+from app.services.pagination import fetch_feed_page
+from app.services.upload_reader import UploadedImage, read_image_upload
+from app.services.direct_upload import direct_upload_service
 from app.services.image_hash import image_hash_service
 from app.services.point_service import point_service
 from app.services.static_creatures import RARITY_BY_ID, NAME_BY_ID, ID_BY_NAME, ID_BY_NAME_LOWER
@@ -23,29 +32,8 @@ from app.services.badge_awarder import award_collection_badges
 router = APIRouter()
 
 
-@router.post("", response_model=SightingResponse, status_code=status.HTTP_201_CREATED)
-async def create_sighting(
-    latitude: float = Form(...),
-    longitude: float = Form(...),
-    location_name: Optional[str] = Form(None),
-    memo: Optional[str] = Form(None),
-    creature_id: Optional[str] = Form(None),
-    ai_suggestion: Optional[str] = Form(None),
-    ai_confidence: Optional[float] = Form(None),
-    photo: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    목격 등록
-    - 사진 업로드
-    - AI 추천 결과 포함 가능
-    - status: pending으로 생성
-    """
-    # 이미지 읽기
-    image_bytes = await photo.read()
-
-    # creature_id 없으면 ai_suggestion으로 정적 ID 추론
+def resolve_creature_id(creature_id: Optional[str], ai_suggestion: Optional[str]) -> Optional[str]:
+    """creature_id 확인 (없으면 ai_suggestion으로 정적 ID 추론)"""
     if not creature_id and ai_suggestion:
         creature_id = ID_BY_NAME.get(ai_suggestion) or ID_BY_NAME_LOWER.get(ai_suggestion.lower())
 
@@ -54,18 +42,73 @@ async def create_sighting(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="존재하지 않는 creature_id 입니다"
         )
+    return creature_id
+
+
+def add_to_collection(db: Session, sighting: Sighting) -> None:
+    """첫 발견이면 도감에 추가"""
+    existing = db.query(UserCollection).filter(
+        UserCollection.user_id == sighting.user_id,
+        UserCollection.creature_id == sighting.creature_id
+    ).first()
+    if not existing:
+        user_creature = UserCollection(
+            user_id=sighting.user_id,
+            creature_id=sighting.creature_id,
+            first_sighting_id=sighting.id
+        )
+        db.add(user_creature)
+
+
+def reward_sighting(db: Session, sighting: Sighting) -> None:
+    """승인된 목격 포인트 지급 + 도감 등록 (커밋은 호출한 쪽에서)"""
+    rarity = RARITY_BY_ID.get(sighting.creature_id, "common")
+    points_result = point_service.calculate_sighting_points(
+        db, str(sighting.user_id), str(sighting.creature_id), rarity
+    )
+
+    sighting.points_earned = points_result["total_points"]
 
-    # 중복 검사 + 이미지 해시 계산
-    image_hash = image_hash_service.compute_hash(image_bytes)
-    dup_result = await image_hash_service.check_duplicate(db, image_bytes, current_user.id)
+    # 유저 포인트 추가
+    point_service.add_points(db, str(sighting.user_id), points_result["total_points"])
+
+    # 도감에 추가 (첫 발견인 경우)
+    add_to_collection(db, sighting)
+
+
+async def register_sighting(
+    db: AsyncSession,
+    current_user: User,
+    upload: UploadedImage,
+    data: SightingCreate,
+) -> Sighting:
+    """
+    사진 확인 → 저장 → 목격 기록 생성 (멀티파트 업로드/직접 업로드 공통)
+    - creature_id가 있으면 자동 승인 + 도감 등록 + 포인트 지급
+    """
+    creature_id = data.creature_id
+
+    # 정규화(리사이즈/재인코딩/썸네일) + 이미지 해시 계산
+    prepared = await image_pipeline.prepare(upload)
+    image_hash = prepared.phash
+    dup_result = await image_hash_service.check_duplicate(
+        db, upload.data, current_user.id, image_hash=image_hash
+    )
     if dup_result["is_duplicate"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 업로드된 사진입니다. 다른 사진을 사용해 주세요."
         )
 
-    # Supabase Storage에 업로드
-    photo_url = await storage_service.upload_image(image_bytes, folder="sightings")
+    variants = prepared.variants("sightings", "photo_url", "thumbnail_url")
+    deferred = settings.UPLOAD_MODE == "deferred"
+    if deferred:
+        # 로컬에 저장만 하고 Storage 업로드는 백그라운드 워커가 처리
+        spool_paths = await asyncio.to_thread(upload_queue.spool_variants, variants)
+        urls = {}
+    else:
+        # Storage에 본 이미지와 썸네일 업로드
+        urls = await image_pipeline.upload(variants, db)
 
     status_value = "approved" if creature_id else "pending"
 
@@ -73,104 +116,171 @@ async def create_sighting(
     sighting = Sighting(
         user_id=current_user.id,
         creature_id=creature_id,
-        photo_url=photo_url,
-        latitude=latitude,
-        longitude=longitude,
-        location_name=location_name,
-        memo=memo,
+        photo_url=urls.get("photo_url"),
+        thumbnail_url=urls.get("thumbnail_url"),
+        latitude=data.latitude,
+        longitude=data.longitude,
+        location_name=data.location_name,
+        memo=data.memo,
         image_hash=image_hash,
-        ai_suggestion=ai_suggestion,
-        ai_confidence=ai_confidence,
-        status=status_value
+        image_hash_int=image_hash_service.hash_to_int(image_hash),
+        ai_suggestion=data.ai_suggestion,
+        ai_confidence=data.ai_confidence,
+        status=status_value,
+        upload_status="processing" if deferred else "uploaded",
     )
 
     db.add(sighting)
-    db.commit()
-    db.refresh(sighting)
+    if deferred:
+        try:
+            await db.flush()
+            upload_queue.enqueue_variants(db, "sighting", sighting.id, variants, spool_paths)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            upload_queue.discard_spool(spool_paths)
+            raise
+        upload_queue.notify()
+    else:
+        try:
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            await storage_service.discard_uploads(list(urls.values()))
+            raise
+    await db.refresh(sighting)
+    image_hash_service.register_sighting(sighting)
 
     # 자동 도감 등록 및 포인트 지급 (creature_id가 있는 경우)
     if creature_id:
-        rarity = RARITY_BY_ID.get(creature_id, "common")
-        points_result = point_service.calculate_sighting_points(
-            db, str(current_user.id), creature_id, rarity
-        )
-
-        sighting.points_earned = points_result["total_points"]
-        point_service.add_points(db, str(current_user.id), points_result["total_points"])
-        db.commit()
-
-        existing = db.query(UserCollection).filter(
-            UserCollection.user_id == current_user.id,
-            UserCollection.creature_id == creature_id
-        ).first()
-        if not existing:
-            user_creature = UserCollection(
-                user_id=current_user.id,
-                creature_id=creature_id,
-                first_sighting_id=sighting.id
-            )
-            db.add(user_creature)
-            db.commit()
+        # 포인트/도감/뱃지 로직은 동기 Session 기준이므로 run_sync로 같은 커넥션에서 실행
+        await db.run_sync(reward_sighting, sighting)
+        await db.commit()
 
         # 도감 뱃지 지급
-        award_collection_badges(db, current_user.id)
+        await db.run_sync(award_collection_badges, current_user.id)
 
     return sighting
 
 
+@router.post("", response_model=SightingResponse, status_code=status.HTTP_201_CREATED)
+async def create_sighting(
+    latitude: float = Form(...),
+    longitude: float = Form(...),
+    location_name: Optional[str] = Form(None),
+    memo: Optional[str] = Form(None),
+    creature_id: Optional[str] = Form(None),
+    ai_suggestion: Optional[str] = Form(None),
+    ai_confidence: Optional[float] = Form(None),
+    photo: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    목격 등록
+    - 사진 업로드
+    - AI 추천 결과 포함 가능
+    - status: pending으로 생성
+    """
+    data = SightingCreate(
+        latitude=latitude,
+        longitude=longitude,
+        location_name=location_name,
+        memo=memo,
+        creature_id=resolve_creature_id(creature_id, ai_suggestion),
+        ai_suggestion=ai_suggestion,
+        ai_confidence=ai_confidence,
+    )
+
+    # 이미지 읽기 (크기/형식 확인)
+    upload = await read_image_upload(photo)
+    return await register_sighting(db, current_user, upload, data)
+
+
+@router.post("/finalize", response_model=SightingResponse, status_code=status.HTTP_201_CREATED)
+async def finalize_sighting(
+    request: SightingFinalize,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    직접 업로드한 사진으로 목격 등록
+    - /api/uploads/sign으로 받은 URL에 사진을 올린 뒤 upload_token과 함께 호출
+    - 사진 검사/저장은 멀티파트 등록과 동일하고, 성공/실패와 관계없이 임시 파일 삭제
+    """
+    data = request.model_copy(
+        update={"creature_id": resolve_creature_id(request.creature_id, request.ai_suggestion)}
+    )
+    object_key = direct_upload_service.verify_token(request.upload_token, current_user.id)
+    try:
+        upload = await direct_upload_service.fetch(object_key)
+        return await register_sighting(db, current_user, upload, data)
+    finally:
+        # 성공/실패와 관계없이 임시 파일 정리 (실패하면 다시 서명받아 올려야 함)
+        await direct_upload_service.discard([object_key])
+
+
 @router.get("", response_model=SightingListResponse)
 async def list_sightings(
-    page: int = 1,
-    limit: int = 20,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
     user_id: Optional[UUID] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     목격 목록 (피드)
-    - 페이지네이션
+    - 커서 페이지네이션: 응답의 next_cursor를 다음 요청의 cursor로 전달
+    - page는 이전 클라이언트 호환용 (cursor가 없고 page > 1이면 OFFSET)
     - 상태/유저 필터링
     """
-    query = db.query(Sighting)
+    query = select(Sighting)
 
     if status:
-        query = query.filter(Sighting.status == status)
+        query = query.where(Sighting.status == status)
     if user_id:
-        query = query.filter(Sighting.user_id == user_id)
+        query = query.where(Sighting.user_id == user_id)
 
-    total = query.count()
+    # 전체 개수는 첫 요청에서만 (카운터/캐시에서 조회)
+    total = None
+    if cursor is None:
+        total = await count_service.count(db, Sighting, status=status, user_id=user_id)
 
-    sightings = query.order_by(desc(Sighting.created_at)).offset(
-        (page - 1) * limit
-    ).limit(limit).all()
+    sightings, next_cursor = await fetch_feed_page(
+        db, query, Sighting, cursor, limit, offset=(page - 1) * limit
+    )
 
     return SightingListResponse(
         sightings=sightings,
         total=total,
         page=page,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{sighting_id}", response_model=SightingDetailResponse)
 async def get_sighting(
     sighting_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """목격 상세"""
-    sighting = db.query(Sighting).filter(Sighting.id == sighting_id).first()
+    sighting = await db.get(Sighting, sighting_id)
     if not sighting:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="목격 기록을 찾을 수 없습니다"
         )
 
-    user = db.query(User).filter(User.id == sighting.user_id).first()
+    user = await db.get(User, sighting.user_id)
     return SightingDetailResponse(
         id=sighting.id,
         user_id=sighting.user_id,
         creature_id=sighting.creature_id,
         photo_url=sighting.photo_url,
+        thumbnail_url=sighting.thumbnail_url,
+        upload_status=sighting.upload_status,
         latitude=sighting.latitude,
         longitude=sighting.longitude,
         location_name=sighting.location_name,
@@ -191,14 +301,14 @@ async def update_sighting_status(
     sighting_id: UUID,
     status_update: SightingStatusUpdate,
     admin_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     승인/거절 (관리자)
     - 승인 시 포인트 지급
     - 첫 발견 시 도감에 추가
     """
-    sighting = db.query(Sighting).filter(Sighting.id == sighting_id).first()
+    sighting = await db.get(Sighting, sighting_id)
     if not sighting:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -230,31 +340,9 @@ async def update_sighting_status(
             sighting.creature_id = status_update.creature_id
 
         if sighting.creature_id:
-            rarity = RARITY_BY_ID.get(sighting.creature_id, "common")
-            points_result = point_service.calculate_sighting_points(
-                db, str(sighting.user_id), str(sighting.creature_id), rarity
-            )
-
-            sighting.points_earned = points_result["total_points"]
-
-            # 유저 포인트 추가
-            point_service.add_points(db, str(sighting.user_id), points_result["total_points"])
-
-            # 도감에 추가 (첫 발견인 경우)
-            existing = db.query(UserCollection).filter(
-                UserCollection.user_id == sighting.user_id,
-                UserCollection.creature_id == sighting.creature_id
-            ).first()
-
-            if not existing:
-                user_creature = UserCollection(
-                    user_id=sighting.user_id,
-                    creature_id=sighting.creature_id,
-                    first_sighting_id=sighting.id
-                )
-                db.add(user_creature)
+            await db.run_sync(reward_sighting, sighting)
 
-    db.commit()
-    db.refresh(sighting)
+    await db.commit()
+    await db.refresh(sighting)
 
     return sighting
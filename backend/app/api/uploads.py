@@ -0,0 +1,25 @@
+"""직접 업로드 (서명 URL 발급)"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_db
+from app.models.user import User
+from app.schemas.upload import UploadSignRequest, UploadSignResponse
+from app.services.direct_upload import direct_upload_service
+
+
+router = APIRouter()
+
+
+@router.post("/sign", response_model=UploadSignResponse)
+async def sign_upload(
+    request: UploadSignRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    서명 업로드 URL 발급
+    - 클라이언트는 upload_url로 사진을 PUT한 뒤
+      /api/sightings/finalize 또는 /api/cleanups/finalize에 upload_token을 보냄
+    """
+    return await direct_upload_service.issue(current_user.id, request.content_type, db)
@@ -6,6 +6,8 @@ from functools import lru_cache
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 4  # 비동기 엔진 (API 요청)
+    DB_SYNC_POOL_SIZE: int = 2  # 동기 엔진 (시작 시 초기화, 업로드 큐/정리 작업, 요청당 한 번의 짧은 정리)
     SUPABASE_URL: str
     SUPABASE_KEY: str
     SUPABASE_SERVICE_KEY: str
@@ -21,6 +23,57 @@ class Settings(BaseSettings):
     # AI
     HUGGINGFACE_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
+    AI_BATCH_MAX_SIZE: int = 8  # 한 번의 forward에 묶을 최대 이미지 수
+    AI_BATCH_MAX_WAIT_MS: int = 10  # 배치를 채우기 위해 기다리는 최대 시간
+    AI_PRELOAD_MODELS: bool = False  # 시작 시 모델 로드 + 워밍업 (/health/ready로 완료 확인)
+    AI_MODEL_RETRY_BACKOFF_SECONDS: int = 300  # 로드 실패 후 재시도까지 대기
+    AI_INFERENCE_BACKEND: str = "torch"  # torch, int8(동적 양자화), onnx(ONNX Runtime)
+    AI_ONNX_CACHE_DIR: str = ".cache/onnx"  # export한 ONNX 모델 저장 위치
+
+    # Result cache
+    RESULT_CACHE_MAX_ENTRIES: int = 2048
+    RESULT_CACHE_TTL_SECONDS: int = 60 * 60
+    RESULT_CACHE_REDIS_URL: str = ""  # 설정 시 워커 간 공유 (redis 패키지 필요)
+    COUNT_CACHE_TTL_SECONDS: int = 30  # 목록/랭킹 전체 개수 캐시 (워커 간에는 이 시간만큼 늦을 수 있음)
+    LEADERBOARD_REFRESH_SECONDS: int = 300  # 랭킹 전체 다시 로드 주기 (다른 워커의 변경 반영)
+
+    # Storage
+    STORAGE_BACKEND: str = "supabase"  # supabase, local
+    LOCAL_STORAGE_DIR: str = "media"  # local 백엔드 저장 위치
+    MEDIA_BASE_URL: str = ""  # local 백엔드 공개 URL 앞부분 (예: https://api.example.com)
+    STORAGE_DELETE_GRACE_SECONDS: int = 60 * 60  # 업로드 후 참조가 없어도 지우지 않는 시간 (커밋 전 요청 보호)
+    STORAGE_SWEEP_INTERVAL_SECONDS: int = 10 * 60  # 참조 없는 파일 정리 주기
+
+    # Upload
+    UPLOAD_MAX_BYTES: int = 15 * 1024 * 1024  # 사진 1장 크기 상한 (초과 시 413)
+    UPLOAD_MAX_REQUEST_BYTES: int = 32 * 1024 * 1024  # 요청 본문 상한 (Before/After 2장 + 폼 필드)
+    DIRECT_UPLOAD_URL_TTL_SECONDS: int = 300  # 서명된 업로드 URL 유효 시간
+    DIRECT_UPLOAD_TOKEN_TTL_SECONDS: int = 60 * 60  # 업로드 후 finalize까지 허용 시간
+    UPLOAD_MODE: str = "sync"  # sync(요청 안에서 업로드), deferred(스풀 후 백그라운드 업로드)
+    UPLOAD_SPOOL_DIR: str = ".cache/upload_spool"
+    UPLOAD_MAX_ATTEMPTS: int = 8
+    UPLOAD_RETRY_BASE_SECONDS: float = 2.0  # 지수 백오프 시작 간격
+    UPLOAD_RETRY_MAX_SECONDS: float = 300.0
+    UPLOAD_WORKER_POLL_SECONDS: float = 1.0
+
+    # HTTP client (Supabase, Google)
+    HTTP_CLIENT_HTTP2: bool = True  # h2 패키지가 없으면 HTTP/1.1
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10.0
+
+    # Image processing
+    IMAGE_WORKER_MODE: str = "process"  # process, thread
+    IMAGE_WORKER_MAX_WORKERS: int = 0  # 0이면 CPU 코어 수
+    IMAGE_WORKER_MAX_PENDING: int = 32  # 초과 시 503 반환
+    IMAGE_MAX_PIXELS: int = 50_000_000  # 압축 폭탄 차단용 픽셀 수 상한
+    IMAGE_NORMALIZE: bool = True  # 업로드 시 EXIF 제거 + 리사이즈 + 재인코딩 + 썸네일
+    IMAGE_MAX_DIMENSION: int = 2048  # 저장 이미지의 긴 변 상한
+    IMAGE_FORMAT: str = "webp"  # webp, jpeg
+    IMAGE_QUALITY: int = 82
+    IMAGE_THUMBNAIL_SIZE: int = 320  # 피드/지도 마커용 썸네일 긴 변
+    IMAGE_THUMBNAIL_QUALITY: int = 70
 
     # App
     FRONTEND_URL: str = "https://haemon-app.vercel.app"
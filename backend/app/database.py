@@ -1,29 +1,59 @@
 """DB 연결 설정"""
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
+# 비동기 엔진에서 쓸 드라이버 (psycopg 3는 같은 방언 이름으로 async를 지원)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """동기 DB URL → 비동기 드라이버 URL"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
 
 # Supabase session 모드: 제한을 넘지 않도록 풀 크기를 낮추되 타임아웃/재활용을 설정한다.
-engine = create_engine(
-    settings.DATABASE_URL,
+# 워커당 연결 수 = 비동기 풀 + 동기 풀 (DB_POOL_SIZE + DB_SYNC_POOL_SIZE, 풀러 권장치 10 이하)
+POOL_OPTIONS = dict(
     pool_pre_ping=True,
-    pool_size=5,        # 풀러의 권장치(10 이하)보다 작게 유지
     max_overflow=0,     # 초과 연결 생성 금지
     pool_timeout=5,     # 대기 시간을 줄여 타임아웃을 빨리 반환
     pool_recycle=1800,  # 오래된 커넥션 재활용(30분)
 )
 
+# 동기 엔진: Alembic, 시작 시 초기화, 백그라운드 스레드 작업 (업로드 큐, 정리 작업)
+# 요청 처리 중에는 짧은 정리(직접 업로드 임시 키 해제, 실패 시 보상 삭제)만 요청당 한 번이라 작은 풀만 둠
+# (업로드 보호 시간 기록은 요청 세션에서 한 번에 커밋)
+engine = create_engine(settings.DATABASE_URL, pool_size=settings.DB_SYNC_POOL_SIZE, **POOL_OPTIONS)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진: API 요청 처리 (쿼리를 기다리는 동안 이벤트 루프가 다른 요청을 처리)
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL), pool_size=settings.DB_POOL_SIZE, **POOL_OPTIONS
+)
+
+# 커밋 후 응답 직렬화 시 만료된 속성을 다시 읽느라 I/O가 생기지 않도록 expire_on_commit=False
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
 def get_db():
-    """DB 세션 의존성"""
+    """DB 세션 (동기, 스크립트/테스트용; API 의존성은 app.api.deps.get_db)"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
@@ -1,11 +1,33 @@
 """FastAPI 앱 진입점"""
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, async_engine, Base, SessionLocal
 from app.api import api_router
+from app.services.count_service import count_service
+from app.services.http_client import http_client
+from app.services.image_hash import image_hash_service
+from app.services.image_worker import image_worker
+from app.services.creature_ai import creature_classifier
+from app.services.trash_ai import trash_classifier
+from app.services.upload_queue import upload_queue
+from app.services.upload_reader import RequestSizeLimitMiddleware
+from app.services.user_stats import user_stats_service
+from app.services.daily_stats import daily_stats_service
+from app.services.storage import storage_service
+
+
+async def warm_up_models():
+    """분류 모델 로드 + 워밍업 (백그라운드)"""
+    for name, classifier in [("creature", creature_classifier), ("trash", trash_classifier)]:
+        if await asyncio.to_thread(classifier.warmup):
+            print(f"✅ {name} model loaded and warmed up")
+        else:
+            print(f"⚠️  {name} model failed to load, will retry after backoff")
 
 
 @asynccontextmanager
@@ -17,8 +39,68 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️  Database connection failed: {e}")
         print("⚠️  Server will start without database connection")
+
+    # 중복 검사용 이미지 해시 인덱스 구성
+    try:
+        with SessionLocal() as db:
+            backfilled = image_hash_service.backfill_hash_ints(db)
+            if backfilled:
+                print(f"✅ Backfilled {backfilled} integer image hashes")
+            indexed = image_hash_service.build_index(db)
+        print(f"✅ Image hash index built ({indexed} hashes)")
+    except Exception as e:
+        print(f"⚠️  Image hash index build failed, will retry on first check: {e}")
+
+    # 목록/랭킹 개수 카운터, 프로필 통계 (마이그레이션 없이 만든 DB면 현재 데이터로 채움)
+    try:
+        with SessionLocal() as db:
+            if count_service.initialize(db):
+                print("✅ Row counters initialized")
+            initialized = user_stats_service.initialize(db)
+            if initialized:
+                print(f"✅ User stats initialized ({initialized} users)")
+            initialized = daily_stats_service.initialize(db)
+            if initialized:
+                print(f"✅ Daily ranking buckets initialized ({initialized} rows)")
+    except Exception as e:
+        print(f"⚠️  Counter initialization failed, counts will fall back to COUNT(*): {e}")
+
+    # 저장소 파일 참조 수 (비어 있으면 기록의 URL로 채움, 행이 없는 파일은 지우지 않음)
+    try:
+        with SessionLocal() as db:
+            initialized = storage_service.initialize_references(db)
+            if initialized:
+                print(f"✅ Storage references initialized ({initialized} objects)")
+    except Exception as e:
+        print(f"⚠️  Storage reference initialization failed, untracked files will be kept: {e}")
+
+    # Supabase/Google 호출용 커넥션 풀
+    http_client.start()
+
+    # 지연 업로드 모드: 스풀된 이미지를 Storage로 올리는 워커 (재시작 시 남은 작업부터 처리)
+    upload_task = None
+    if settings.UPLOAD_MODE == "deferred":
+        upload_task = asyncio.create_task(upload_queue.run())
+
+    # 참조 없이 남은 업로드 정리 (보상 삭제에서 보호 시간 때문에 남긴 파일)
+    sweep_task = asyncio.create_task(storage_service.run_sweeper())
+
+    # 모델 워밍업은 백그라운드에서 진행하고 /health/ready로 완료 여부를 알린다
+    warmup_task = None
+    if settings.AI_PRELOAD_MODELS:
+        warmup_task = asyncio.create_task(warm_up_models())
     yield
     # 종료 시 정리 작업
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if upload_task is not None:
+        upload_task.cancel()
+    sweep_task.cancel()
+    await creature_classifier.batcher.close()
+    await trash_classifier.batcher.close()
+    image_worker.shutdown()
+    await http_client.close()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -30,6 +112,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# 큰 본문은 multipart 파싱 전에 거절 (CORS 안쪽에 두어 413 응답에도 CORS 헤더 포함)
+app.add_middleware(RequestSizeLimitMiddleware, max_bytes=settings.UPLOAD_MAX_REQUEST_BYTES)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -59,3 +144,21 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    준비 상태
+    - AI_PRELOAD_MODELS가 켜져 있으면 두 모델이 모두 로드된 뒤에만 ready
+    """
+    models = {
+        "creature": creature_classifier.status,
+        "trash": trash_classifier.status,
+    }
+    if settings.AI_PRELOAD_MODELS and any(s != "ready" for s in models.values()):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "loading", "models": models},
+        )
+    return {"status": "ready", "models": models}
@@ -6,6 +6,11 @@ from app.models.badge import Badge, UserBadge
 from app.models.user_creature import UserCollection
 from app.models.creature import Creature
 from app.models.aquarium import Aquarium, PurchaseHistory
+from app.models.upload_job import UploadJob
+from app.models.row_counter import RowCounter
+from app.models.user_stats import UserStats
+from app.models.user_daily_stats import UserDailyStats
+from app.models.stored_object import StoredObject
 
 __all__ = [
     "User",
@@ -17,4 +22,9 @@ __all__ = [
     "Creature",
     "Aquarium",
     "PurchaseHistory",
+    "UploadJob",
+    "RowCounter",
+    "UserStats",
+    "UserDailyStats",
+    "StoredObject",
 ]
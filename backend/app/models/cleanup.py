@@ -1,7 +1,7 @@
 """쓰레기 수거 기록 모델"""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Float
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, DateTime, ForeignKey, Float, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -9,11 +9,26 @@ from app.database import Base
 
 class Cleanup(Base):
     __tablename__ = "cleanups"
+    # B-tree는 역방향 스캔이 되므로 created_at DESC 정렬도 오름차순 인덱스로 처리
+    __table_args__ = (
+        Index("ix_cleanups_created_at_id", "created_at", "id"),  # 전체 피드
+        Index("ix_cleanups_status_created_at", "status", "created_at"),  # 상태별 피드, 지도
+        Index("ix_cleanups_user_status", "user_id", "status"),  # 유저 피드, 프로필/랭킹 집계
+        Index("ix_cleanups_trash_type_created_at", "trash_type", "created_at"),  # 종류별 피드
+        Index(
+            "ix_cleanups_pending_created_at", "created_at",  # 관리자 승인 대기열
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    before_photo_url = Column(String, nullable=False)
-    after_photo_url = Column(String, nullable=False)
+    before_photo_url = Column(String, nullable=True)  # 지연 업로드 중에는 비어 있음
+    after_photo_url = Column(String, nullable=True)
+    before_thumbnail_url = Column(String, nullable=True)
+    after_thumbnail_url = Column(String, nullable=True)
+    upload_status = Column(String(20), default="uploaded")  # processing, uploaded, failed
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     location_name = Column(String(100), nullable=True)
@@ -21,6 +36,8 @@ class Cleanup(Base):
     amount = Column(String(20), nullable=False)  # handful, one_bag, large
     before_image_hash = Column(String(64), nullable=True)
     after_image_hash = Column(String(64), nullable=True)
+    before_image_hash_int = Column(BigInteger, nullable=True)  # pHash 64비트 정수
+    after_image_hash_int = Column(BigInteger, nullable=True)
     ai_verified = Column(Boolean, default=False)
     ai_confidence = Column(Float, nullable=True)
     status = Column(String(20), default="pending")  # pending, approved, rejected
@@ -0,0 +1,10 @@
+"""행 개수 카운터 모델 (목록/랭킹 전체 개수용)"""
+from sqlalchemy import Column, String, BigInteger
+from app.database import Base
+
+
+class RowCounter(Base):
+    __tablename__ = "row_counters"
+
+    name = Column(String(100), primary_key=True)  # sightings, sightings:status=approved ...
+    value = Column(BigInteger, nullable=False, default=0)
@@ -1,7 +1,7 @@
 """생물 목격 기록 모델"""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, String, Integer, BigInteger, Text, DateTime, ForeignKey, Float, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -9,16 +9,30 @@ from app.database import Base
 
 class Sighting(Base):
     __tablename__ = "sightings"
+    # B-tree는 역방향 스캔이 되므로 created_at DESC 정렬도 오름차순 인덱스로 처리
+    __table_args__ = (
+        Index("ix_sightings_created_at_id", "created_at", "id"),  # 전체 피드
+        Index("ix_sightings_status_created_at", "status", "created_at"),  # 상태별 피드, 지도
+        Index("ix_sightings_user_status", "user_id", "status"),  # 유저 피드, 프로필/랭킹 집계
+        Index(
+            "ix_sightings_pending_created_at", "created_at",  # 관리자 승인 대기열
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     creature_id = Column(String(50), nullable=True)  # 정적 도감 ID
-    photo_url = Column(String, nullable=False)
+    photo_url = Column(String, nullable=True)  # 지연 업로드 중에는 비어 있음
+    thumbnail_url = Column(String, nullable=True)
+    upload_status = Column(String(20), default="uploaded")  # processing, uploaded, failed
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     location_name = Column(String(100), nullable=True)
     memo = Column(Text, nullable=True)
     image_hash = Column(String(64), nullable=True)
+    image_hash_int = Column(BigInteger, nullable=True)  # pHash 64비트 정수 (부호 있는 BIGINT)
     ai_suggestion = Column(String(50), nullable=True)
     ai_confidence = Column(Float, nullable=True)
     status = Column(String(20), default="pending")  # pending, approved, rejected
@@ -0,0 +1,19 @@
+"""저장소 파일 참조 수 모델 (같은 내용의 사진을 여러 기록이 공유)"""
+from sqlalchemy import Column, DateTime, Index, Integer, String, text
+from app.database import Base
+
+
+class StoredObject(Base):
+    __tablename__ = "stored_objects"
+    __table_args__ = (
+        # 정리 대상 (참조 없음 + 보호 시간 지남)
+        Index(
+            "ix_stored_objects_unreferenced", "protected_until",
+            postgresql_where=text("ref_count <= 0"),
+            sqlite_where=text("ref_count <= 0"),
+        ),
+    )
+
+    path = Column(String(500), primary_key=True)  # 버킷/루트 기준 상대 경로
+    ref_count = Column(Integer, nullable=False, default=0)  # 사진/썸네일로 쓰는 목격/수거 기록 수
+    protected_until = Column(DateTime, nullable=False)  # 업로드 직후 커밋 전인 요청을 위해 이 시각까지는 지우지 않음
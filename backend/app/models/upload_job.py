@@ -0,0 +1,28 @@
+"""지연 업로드 작업 모델 (UPLOAD_MODE=deferred)"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+    __table_args__ = (
+        Index("ix_upload_jobs_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    target_type = Column(String(20), nullable=False)  # sighting, cleanup
+    target_id = Column(UUID(as_uuid=True), nullable=False)
+    target_field = Column(String(30), nullable=False)  # photo_url, before_photo_url, after_photo_url
+    folder = Column(String(50), nullable=False)
+    spool_path = Column(String, nullable=False)  # 로컬 임시 파일 경로
+    content_type = Column(String(50), default="image/jpeg")
+    status = Column(String(20), default="pending")  # pending, done, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)  # 작업을 가져간 워커의 임대 만료 시각
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
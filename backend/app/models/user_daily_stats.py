@@ -0,0 +1,19 @@
+"""유저 일별 활동 집계 모델 (주간/월간/시즌 랭킹용)"""
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, Index, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class UserDailyStats(Base):
+    __tablename__ = "user_daily_stats"
+    __table_args__ = (
+        Index("ix_user_daily_stats_day", "day"),  # 기간 합산 (day >= 시작일)
+    )
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC 날짜 (수거/포인트는 기록 created_at, 도감은 발견 시각 기준)
+    cleanup_count = Column(Integer, nullable=False, default=0)  # 승인된 수거
+    creature_count = Column(Integer, nullable=False, default=0)  # 도감에 등록한 생물
+    points = Column(Integer, nullable=False, default=0)  # 승인된 목격/수거의 지급 포인트 (사용한 포인트는 빼지 않음)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # 동점 시 먼저 도달한 유저 우선
@@ -0,0 +1,22 @@
+"""유저 활동 통계 모델 (프로필용 집계, 승인/도감 등록/뱃지 획득 시 갱신)"""
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    sighting_count = Column(Integer, nullable=False, default=0)  # 승인된 목격
+    cleanup_count = Column(Integer, nullable=False, default=0)  # 승인된 수거
+    creature_count = Column(Integer, nullable=False, default=0)  # 도감에 등록한 생물
+    badge_count = Column(Integer, nullable=False, default=0)
+
+    def as_dict(self) -> dict:
+        return {
+            "sighting_count": self.sighting_count,
+            "cleanup_count": self.cleanup_count,
+            "creature_count": self.creature_count,
+            "badge_count": self.badge_count,
+        }
@@ -15,11 +15,19 @@ class CleanupCreate(CleanupBase):
     ai_confidence: float | None = None
 
 
+class CleanupFinalize(CleanupCreate):
+    before_upload_token: str  # /api/uploads/sign에서 받은 토큰
+    after_upload_token: str
+
+
 class CleanupResponse(CleanupBase):
     id: UUID
     user_id: UUID
-    before_photo_url: str
-    after_photo_url: str
+    before_photo_url: str | None
+    after_photo_url: str | None
+    before_thumbnail_url: str | None = None
+    after_thumbnail_url: str | None = None
+    upload_status: str | None = None
     before_image_hash: str | None
     after_image_hash: str | None
     ai_verified: bool
@@ -34,9 +42,10 @@ class CleanupResponse(CleanupBase):
 
 class CleanupListResponse(BaseModel):
     cleanups: list[CleanupResponse]
-    total: int
+    total: int | None = None  # 첫 페이지(커서 없음)에서만 계산
     page: int
     limit: int
+    next_cursor: str | None = None  # 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 None)
 
 
 class CleanupDetailResponse(CleanupResponse):
@@ -17,6 +17,7 @@ class SightingMarker(MapMarker):
     creature_name: str | None = None
     rarity: str | None = None
     photo_url: str | None = None
+    thumbnail_url: str | None = None
 
 
 class CleanupMarker(MapMarker):
@@ -31,7 +32,8 @@ class HeatmapPoint(BaseModel):
 
 
 class MapDataResponse(BaseModel):
-    markers: list[MapMarker]
+    # 하위 타입으로 선언해야 photo_url 등 마커별 필드가 응답에 포함된다
+    markers: list[SightingMarker | CleanupMarker]
     total: int
 
 
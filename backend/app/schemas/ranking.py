@@ -13,5 +13,7 @@ class RankingEntry(BaseModel):
 
 class RankingResponse(BaseModel):
     rankings: list[RankingEntry]
-    my_rank: int | None = None
+    my_rank: int | None = None  # 로그인한 경우 상위 limit 밖이어도 항상 채움
+    my_value: int | None = None
     total_users: int
+    period: str = "all"  # week, month, season, all
@@ -15,11 +15,17 @@ class SightingCreate(SightingBase):
     ai_confidence: float | None = None
 
 
+class SightingFinalize(SightingCreate):
+    upload_token: str  # /api/uploads/sign에서 받은 토큰
+
+
 class SightingResponse(SightingBase):
     id: UUID
     user_id: UUID
     creature_id: str | None
-    photo_url: str
+    photo_url: str | None
+    thumbnail_url: str | None = None
+    upload_status: str | None = None
     image_hash: str | None
     ai_suggestion: str | None
     ai_confidence: float | None
@@ -33,9 +39,10 @@ class SightingResponse(SightingBase):
 
 class SightingListResponse(BaseModel):
     sightings: list[SightingResponse]
-    total: int
+    total: int | None = None  # 첫 페이지(커서 없음)에서만 계산
     page: int
     limit: int
+    next_cursor: str | None = None  # 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 None)
 
 
 class SightingStatusUpdate(BaseModel):
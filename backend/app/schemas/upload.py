@@ -0,0 +1,16 @@
+"""직접 업로드 스키마"""
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class UploadSignRequest(BaseModel):
+    content_type: str = "image/jpeg"  # image/jpeg, image/png, image/webp
+
+
+class UploadSignResponse(BaseModel):
+    object_key: str
+    upload_url: str
+    method: str
+    headers: dict[str, str]
+    upload_token: str  # finalize 요청에 그대로 전달
+    expires_at: datetime  # 업로드 URL 만료 시각 (UTC)
@@ -0,0 +1,260 @@
+"""
+목록/랭킹 전체 개수
+- row_counters 테이블에 테이블별/상태별 개수를 유지 (기록 추가/삭제/상태 변경과 같은 트랜잭션에서 갱신)
+  - ORM flush 직전에 변경된 객체를 보고 UPDATE value = value + n (어느 라우터/서비스에서 바꿔도 반영)
+- 카운터는 정해진 값(상태, 쓰레기 종류)에만 둠
+  - 행이 없으면 (초기화 전, 아직 없던 값) 첫 조회 때 COUNT(*)로 행을 만들고 이후에는 카운터를 읽음
+  - 그 외 값으로 거른 개수는 행을 만들지 않고 매번 COUNT(*) (캐시도 하지 않음)
+- 그 외: 필터 없는 개수는 Postgres 통계(pg_class.reltuples) 추정치, 나머지는 COUNT(*)
+- 앞단에 프로세스 내 TTL 캐시 (이 프로세스에서 쓰기가 커밋되면 해당 테이블 캐시를 비움)
+  - 조회하는 동안 커밋된 쓰기가 있으면 읽은 값은 캐시하지 않음
+"""
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from sqlalchemy import event, func, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (카운터 대상 테이블 등록)
+from app.config import settings
+from app.database import Base, SessionLocal
+from app.models.row_counter import RowCounter
+from app.services.trash_ai import TRASH_TYPES
+
+STATUSES = ("pending", "approved", "rejected")
+# 테이블 → 카운터를 유지하는 컬럼 → 카운터를 두는 값 (쿼리 파라미터로 아무 값이나 올 수 있으므로)
+TRACKED_COLUMNS = {
+    "sightings": {"status": STATUSES},
+    "cleanups": {"status": STATUSES, "trash_type": tuple(TRASH_TYPES)},
+    "users": {},
+}
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+CHANGED_TABLES_KEY = "count_service_changed_tables"
+
+
+def counter_key(table: str, column: Optional[str] = None, value: Any = None) -> str:
+    return table if column is None else f"{table}:{column}={value}"
+
+
+def pending_value(obj, column: str) -> Any:
+    """flush 전이라 비어 있으면 컬럼 기본값 (status='pending' 등)"""
+    value = getattr(obj, column)
+    if value is None:
+        default = obj.__table__.c[column].default
+        if default is not None and default.is_scalar:
+            value = default.arg
+    return value
+
+
+def _row_keys(obj) -> list[str]:
+    table = obj.__tablename__
+    keys = [counter_key(table)]
+    for column, known in TRACKED_COLUMNS[table].items():
+        value = pending_value(obj, column)
+        if value in known:
+            keys.append(counter_key(table, column, value))
+    return keys
+
+
+class CountService:
+    def __init__(self, ttl_seconds: int, session_factory=SessionLocal):
+        self.ttl_seconds = ttl_seconds
+        # 없는 카운터 행 생성용 (조회 요청의 트랜잭션과 분리)
+        self.session_factory = session_factory
+        self._cache: dict[str, tuple[float, int]] = {}
+        # 테이블 → 커밋된 쓰기 횟수 (조회 전후로 바뀌었으면 읽은 값을 캐시하지 않음)
+        self._generations: dict[str, int] = {}
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def invalidate(self, tables) -> None:
+        for table in tables:
+            self._generations[table] = self._generations.get(table, 0) + 1
+        for key in [key for key in self._cache if key.split(":", 1)[0] in tables]:
+            self._cache.pop(key, None)
+
+    async def count(self, db: AsyncSession, model: Any, **filters: Any) -> int:
+        """
+        전체 개수 (필터 값이 None이면 무시)
+        - 필터 없음/카운터 컬럼 하나: row_counters
+        - 카운터가 없을 때 필터 없음: reltuples 추정 (Postgres), 그 외: COUNT(*)
+        """
+        table = model.__tablename__
+        filters = {column: value for column, value in filters.items() if value is not None}
+        cache_key = ":".join([table] + [f"{column}={filters[column]}" for column in sorted(filters)])
+
+        tracked = TRACKED_COLUMNS.get(table, {})
+        if any(column in tracked and value not in tracked[column] for column, value in filters.items()):
+            # 정해진 값이 아니면 카운터 행, 캐시 항목을 만들지 않음
+            return await db.scalar(
+                select(func.count()).select_from(model).where(
+                    *(getattr(model, column) == column_value for column, column_value in filters.items())
+                )
+            )
+
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        generation = self._generations.get(table, 0)
+
+        value = None
+        if table in TRACKED_COLUMNS and len(filters) <= 1 and set(filters) <= set(tracked):
+            column, column_value = next(iter(filters.items()), (None, None))
+            name = counter_key(table, column, column_value)
+            value = await db.scalar(select(RowCounter.value).where(RowCounter.name == name))
+            if value is None:
+                value = await asyncio.to_thread(self._create_counter, name, model, filters)
+        if value is None and not filters:
+            value = await self._estimate(db, table)
+        if value is None:
+            value = await db.scalar(
+                select(func.count()).select_from(model).where(
+                    *(getattr(model, column) == column_value for column, column_value in filters.items())
+                )
+            )
+
+        if self._generations.get(table, 0) == generation:
+            self._cache[cache_key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def _create_counter(self, name: str, model: Any, filters: dict) -> int:
+        """없는 카운터 행을 현재 개수로 생성 (이후 flush에서 같이 갱신됨)"""
+        with self.session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            if dialect == "postgresql":
+                # 없는 카운터에 대한 UPDATE는 아무것도 바꾸지 않으므로
+                # 커밋 전인 쓰기가 끝날 때까지 기다려 같이 세고, 행을 만들 때까지 새 쓰기를 막음
+                db.execute(text(f"LOCK TABLE {model.__tablename__} IN SHARE MODE"))
+            value = db.scalar(
+                select(func.count()).select_from(model).where(
+                    *(getattr(model, column) == column_value for column, column_value in filters.items())
+                )
+            )
+            insert = UPSERT_INSERTS.get(dialect)
+            if insert is None:
+                if db.get(RowCounter, name) is None:
+                    db.add(RowCounter(name=name, value=value))
+            else:
+                db.execute(
+                    insert(RowCounter).values(name=name, value=value)
+                    .on_conflict_do_nothing(index_elements=[RowCounter.name])
+                )
+            db.commit()
+            # 다른 요청이 먼저 만들었으면 그 값
+            return db.scalar(select(RowCounter.value).where(RowCounter.name == name))
+
+    async def _estimate(self, db: AsyncSession, table: str) -> Optional[int]:
+        """Postgres 통계 기반 추정 개수 (ANALYZE 전이면 None)"""
+        if db.bind.dialect.name != "postgresql":
+            return None
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        )
+        return estimate if estimate is not None and estimate > 0 else None
+
+    def rebuild(self, db: Session) -> int:
+        """카운터를 현재 데이터로 다시 계산 (시작 시 비어 있을 때, 운영 중 보정용)"""
+        tables = Base.metadata.tables
+        db.query(RowCounter).delete()
+        for table_name, columns in TRACKED_COLUMNS.items():
+            table = tables[table_name]
+            db.add(RowCounter(
+                name=counter_key(table_name),
+                value=db.scalar(select(func.count()).select_from(table)),
+            ))
+            for column, known in columns.items():
+                rows = db.execute(
+                    select(table.c[column], func.count())
+                    .where(table.c[column].in_(known))
+                    .group_by(table.c[column])
+                ).all()
+                for column_value, value in rows:
+                    db.add(RowCounter(name=counter_key(table_name, column, column_value), value=value))
+        db.commit()
+        self.clear()
+        return db.query(RowCounter).count()
+
+    def initialize(self, db: Session) -> int:
+        """테이블 전체 개수 카운터가 없으면 채움 (마이그레이션 없이 create_all로 만든 DB)"""
+        names = [counter_key(table) for table in TRACKED_COLUMNS]
+        if db.query(RowCounter).filter(RowCounter.name.in_(names)).count() == len(names):
+            return 0
+        return self.rebuild(db)
+
+    def track_flush(self, session: Session) -> None:
+        """flush될 추가/삭제/상태 변경을 카운터에 반영"""
+        deltas: Counter = Counter()
+        for obj in session.new:
+            if getattr(obj, "__tablename__", None) in TRACKED_COLUMNS:
+                deltas.update(_row_keys(obj))
+        for obj in session.deleted:
+            if getattr(obj, "__tablename__", None) in TRACKED_COLUMNS:
+                deltas.subtract(_row_keys(obj))
+        for obj in session.dirty:
+            table = getattr(obj, "__tablename__", None)
+            if table not in TRACKED_COLUMNS:
+                continue
+            state = inspect(obj)
+            for column, known in TRACKED_COLUMNS[table].items():
+                history = state.attrs[column].history
+                if history.added and history.deleted:
+                    for old in history.deleted:
+                        if old in known:
+                            deltas[counter_key(table, column, old)] -= 1
+                    for new in history.added:
+                        if new in known:
+                            deltas[counter_key(table, column, new)] += 1
+
+        changed = {key: delta for key, delta in deltas.items() if delta}
+        if not changed:
+            return
+        # 없는 카운터(초기화 전, 아직 없던 값)는 갱신되지 않고 첫 조회 때 COUNT(*)로 생성
+        for key, delta in sorted(changed.items()):
+            session.execute(
+                update(RowCounter).where(RowCounter.name == key).values(value=RowCounter.value + delta)
+            )
+        # 캐시는 커밋된 뒤에 비움 (커밋 전에 비우면 다른 요청이 이전 값을 다시 캐시함)
+        session.info.setdefault(CHANGED_TABLES_KEY, set()).update(key.split(":", 1)[0] for key in changed)
+
+
+# 싱글톤 인스턴스
+count_service = CountService(ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "before_flush")
+def _track_counts(session: Session, flush_context, instances) -> None:
+    count_service.track_flush(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    tables = session.info.pop(CHANGED_TABLES_KEY, None)
+    if tables:
+        count_service.invalidate(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_tables(session: Session) -> None:
+    session.info.pop(CHANGED_TABLES_KEY, None)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator) -> None:
+    """active_history를 켜기 위한 리스너 (하는 일 없음)"""
+
+
+# 커밋 후 만료된 객체의 상태를 바꿔도 이전 값을 알 수 있도록 값 변경 전에 기존 값을 읽어 둠
+for _mapper in Base.registry.mappers:
+    for _column in TRACKED_COLUMNS.get(_mapper.local_table.name, ()):
+        event.listen(
+            getattr(_mapper.class_, _column), "set", _keep_previous_value,
+            active_history=True,
+        )
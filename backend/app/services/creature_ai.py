@@ -3,12 +3,22 @@
 - HuggingFace 사전학습 분류기(jasasuster/sea-animals) 활용
 - 모델 라벨을 서비스 도감 라벨로 후처리 매핑
 """
+import asyncio
 import hashlib
-import io
 import logging
+import threading
+import time
 from typing import List, Optional, Tuple
 
 from PIL import Image
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services.image_loader import load_image, VIT_INPUT_SIZE
+from app.services.image_worker import image_worker
+from app.services.inference_backend import build_pipeline
+from app.services.inference_batcher import InferenceBatcher
+from app.services.result_cache import image_digest, result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +66,14 @@ class CreatureClassifier:
     def __init__(self):
         self.classifier = None
         self.model_name = "jasasuster/sea-animals"
+        self.load_failed_at: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self.batcher = InferenceBatcher(
+            "creature",
+            self._predict_batch,
+            max_batch_size=settings.AI_BATCH_MAX_SIZE,
+            max_wait_ms=settings.AI_BATCH_MAX_WAIT_MS,
+        )
         # 모델 로드 실패 시 예측 제공을 위한 백업 후보군
         self.fallback_creatures = [
             ("돌고래", "cetacean", "rare"),
@@ -72,18 +90,54 @@ class CreatureClassifier:
         ]
 
     def _load_model(self):
-        """모델 지연 로딩"""
-        if self.classifier is None:
+        """
+        모델 지연 로딩
+        - 실패하면 AI_MODEL_RETRY_BACKOFF_SECONDS 동안 재시도하지 않음
+        """
+        if self.classifier is not None:
+            return
+        with self._load_lock:
+            if self.classifier is not None:
+                return
+            if (
+                self.load_failed_at is not None
+                and time.monotonic() - self.load_failed_at < settings.AI_MODEL_RETRY_BACKOFF_SECONDS
+            ):
+                return
             try:
-                from transformers import pipeline
-
-                self.classifier = pipeline(
-                    "image-classification",
-                    model=self.model_name
-                )
+                self.classifier = build_pipeline(self.model_name)
+                self.load_failed_at = None
             except Exception as e:
-                logger.warning(f"Failed to load HuggingFace model: {e}")
-                self.classifier = None
+                logger.warning(f"Failed to load HuggingFace model ({settings.AI_INFERENCE_BACKEND}): {e}")
+                self.load_failed_at = time.monotonic()
+
+    @property
+    def status(self) -> str:
+        """모델 상태: ready, loading, failed, not_loaded"""
+        if self.classifier is not None:
+            return "ready"
+        if self._load_lock.locked():
+            return "loading"
+        if self.load_failed_at is not None:
+            return "failed"
+        return "not_loaded"
+
+    @property
+    def cache_namespace(self) -> str:
+        """결과 캐시 네임스페이스 (모델/백엔드가 바뀌면 이전 결과를 쓰지 않음)"""
+        return f"creature:{self.model_name}:{settings.AI_INFERENCE_BACKEND}"
+
+    def warmup(self) -> bool:
+        """모델 로드 후 더미 이미지로 forward 1회 (첫 요청 지연 제거)"""
+        self._load_model()
+        if self.classifier is None:
+            return False
+        self._predict_batch([Image.new("RGB", (VIT_INPUT_SIZE, VIT_INPUT_SIZE))])
+        return True
+
+    def _predict_batch(self, images: list) -> list:
+        """디코딩된 이미지 배치 → 이미지별 top-5 결과 (배처 워커 스레드에서 실행)"""
+        return self.classifier(images, top_k=5, batch_size=len(images))
 
     def _map_label(self, label: str) -> Optional[Tuple[str, str, str]]:
         """모델 라벨을 서비스 도감 라벨로 후처리 매핑."""
@@ -111,11 +165,13 @@ class CreatureClassifier:
                 return mapped
         return None
 
-    async def classify(self, image_bytes: bytes) -> dict:
+    async def classify(self, image_bytes: bytes, digest: Optional[str] = None) -> dict:
         """
         이미지 → 생물 카테고리 + 신뢰도
+        - digest: 업로드를 읽으며 계산한 SHA-256 (없으면 계산)
         """
-        self._load_model()
+        if self.classifier is None:
+            await asyncio.to_thread(self._load_model)
 
         if self.classifier is None:
             # 모델 로드 실패 시: 이미지 해시 기반의 결정적 백업 추정
@@ -130,12 +186,18 @@ class CreatureClassifier:
                 "is_confident": False,
             }
 
+        # 같은 사진으로 분류 → 등록/재시도가 반복되므로 이미지 내용 기준으로 캐시
+        cache_namespace = self.cache_namespace
+        digest = digest or image_digest(image_bytes)
+        cached = await result_cache.get(cache_namespace, digest)
+        if cached is not None:
+            return cached
+
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-            if image.mode != "RGB":
-                image = image.convert("RGB")
+            # 디코딩은 이미지 작업 풀로 (대기 작업이 많으면 503 + Retry-After)
+            image = await image_worker.run(load_image, image_bytes, VIT_INPUT_SIZE)
 
-            raw_results = self.classifier(image, top_k=5)
+            raw_results = await self.batcher.submit(image)
             candidates = []
             for result in raw_results:
                 mapped = self._map_label(result["label"])
@@ -155,7 +217,7 @@ class CreatureClassifier:
 
             if candidates:
                 best = candidates[0]
-                return {
+                result = {
                     "suggested_creature": best["creature"],
                     "category": best["category"],
                     "confidence": round(best["confidence"], 2),
@@ -163,19 +225,26 @@ class CreatureClassifier:
                     "is_confident": best["confidence"] >= MIN_CONFIDENT_SCORE,
                     "candidates": candidates,
                 }
+            else:
+                # 매핑되지 않은 경우: fallback
+                md5 = hashlib.md5(image_bytes).hexdigest()
+                idx = int(md5, 16) % len(self.fallback_creatures)
+                creature, category, rarity = self.fallback_creatures[idx]
+                result = {
+                    "suggested_creature": creature,
+                    "category": category,
+                    "confidence": 0.5,
+                    "rarity": rarity,
+                    "is_confident": False,
+                }
 
-            # 매핑되지 않은 경우: fallback
-            digest = hashlib.md5(image_bytes).hexdigest()
-            idx = int(digest, 16) % len(self.fallback_creatures)
-            creature, category, rarity = self.fallback_creatures[idx]
-            return {
-                "suggested_creature": creature,
-                "category": category,
-                "confidence": 0.5,
-                "rarity": rarity,
-                "is_confident": False,
-            }
+            # 모델 출력에서 나온 결과만 캐시 (예외 fallback은 다음 요청에서 재시도)
+            await result_cache.set(cache_namespace, digest, result)
+            return result
 
+        except HTTPException:
+            # 이미지 작업 풀 과부하는 fallback 대신 그대로 알림
+            raise
         except Exception as e:
             logger.error(f"Classification error: {e}")
             digest = hashlib.md5(image_bytes).hexdigest()
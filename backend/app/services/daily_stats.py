@@ -0,0 +1,188 @@
+"""
+유저 일별 활동 집계 (user_daily_stats)
+- (유저, UTC 날짜)마다 한 행: 승인된 수거 수, 도감 등록 수, 얻은 포인트
+  - 수거는 기록 날짜, 도감은 발견 날짜의 행에 더함
+  - 포인트는 승인된 목격/수거의 지급 포인트를 그 기록 날짜의 행에 더함
+    - 실시간 갱신과 rebuild(마이그레이션 포함)가 같은 규칙 (지급 시각은 따로 저장하지 않으므로)
+    - 얻은 것만 더함 (상점에서 쓴 포인트는 기간 랭킹에서 빼지 않음)
+- user_stats와 같이 ORM flush 직전에 같은 트랜잭션에서 갱신 (행이 없으면 upsert)
+- 주간/월간/시즌 랭킹은 기간 안의 행만 합산 (유저당 최대 92행)
+"""
+from collections import Counter
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import event, inspect, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.user import User
+from app.models.user_creature import UserCollection
+from app.models.user_daily_stats import UserDailyStats
+from app.services.count_service import pending_value
+
+BUCKET_COLUMNS = ("cleanup_count", "creature_count", "points")
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _day(value: datetime | None) -> date:
+    """기록 시각의 UTC 날짜 (flush 전이라 비어 있으면 오늘)"""
+    return (value or datetime.utcnow()).date()
+
+
+def _earned(status: Any, points: Any) -> int:
+    """기간 랭킹에 더할 지급 포인트 (승인된 기록만)"""
+    return points if status == "approved" and points and points > 0 else 0
+
+
+def _before_after(obj, column: str) -> tuple[Any, Any]:
+    """flush될 변경 전/후 값"""
+    history = inspect(obj).attrs[column].history
+    if not history.added and not history.deleted:
+        value = getattr(obj, column)
+        return value, value
+    before = history.deleted[0] if history.deleted else None
+    after = history.added[0] if history.added else None
+    return before, after
+
+
+def _empty_bucket(user_id: Any, day: date, now: datetime) -> dict:
+    return {"user_id": user_id, "day": day, "updated_at": now, **{column: 0 for column in BUCKET_COLUMNS}}
+
+
+class DailyStatsService:
+    def rebuild(self, db: Session) -> int:
+        """원본 테이블로 다시 계산 (track_flush와 같은 규칙)"""
+        db.query(UserDailyStats).delete()
+        buckets: dict[tuple[Any, date], dict] = {}
+        now = datetime.utcnow()
+
+        def add(rows, column: str) -> None:
+            for user_id, created_at, value in rows:
+                key = (user_id, _day(created_at))
+                bucket = buckets.setdefault(key, _empty_bucket(*key, now))
+                bucket[column] += value or 0
+
+        add(db.execute(
+            select(Cleanup.user_id, Cleanup.created_at, literal(1)).where(Cleanup.status == "approved")
+        ), "cleanup_count")
+        add(db.execute(
+            select(UserCollection.user_id, UserCollection.discovered_at, literal(1))
+        ), "creature_count")
+        for model in (Sighting, Cleanup):
+            add(db.execute(
+                select(model.user_id, model.created_at, model.points_earned)
+                .where(model.status == "approved", model.points_earned > 0)
+            ), "points")
+
+        if buckets:
+            db.execute(UserDailyStats.__table__.insert(), list(buckets.values()))
+        db.commit()
+        return len(buckets)
+
+    def initialize(self, db: Session) -> int:
+        """집계 행이 하나도 없는데 활동 기록이 있으면 채움 (마이그레이션 없이 create_all로 만든 DB)"""
+        if db.query(UserDailyStats).first() is not None:
+            return 0
+        if db.query(Cleanup).first() is None and db.query(UserCollection).first() is None:
+            return 0
+        return self.rebuild(db)
+
+    def _upsert(self, session: Session, user_id: Any, day: date, values: dict, now: datetime) -> None:
+        insert = UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            # ON CONFLICT가 없는 DB: 갱신해 보고 행이 없으면 추가
+            result = session.execute(
+                update(UserDailyStats)
+                .where(UserDailyStats.user_id == user_id, UserDailyStats.day == day)
+                .values({
+                    **{column: getattr(UserDailyStats, column) + delta for column, delta in values.items()},
+                    "updated_at": now,
+                })
+            )
+            if not result.rowcount:
+                session.execute(
+                    UserDailyStats.__table__.insert().values({**_empty_bucket(user_id, day, now), **values})
+                )
+            return
+        stmt = insert(UserDailyStats).values({**_empty_bucket(user_id, day, now), **values})
+        table = UserDailyStats.__table__
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day],
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in values},
+                "updated_at": now,
+            },
+        ))
+
+    def track_flush(self, session: Session) -> None:
+        """flush될 변경을 일별 행에 반영"""
+        deltas: Counter = Counter()
+        for obj in session.new:
+            if isinstance(obj, (Sighting, Cleanup)):
+                status = pending_value(obj, "status")
+                deltas[(obj.user_id, _day(obj.created_at), "points")] += _earned(status, obj.points_earned)
+                if isinstance(obj, Cleanup) and status == "approved":
+                    deltas[(obj.user_id, _day(obj.created_at), "cleanup_count")] += 1
+            elif isinstance(obj, UserCollection):
+                deltas[(obj.user_id, _day(obj.discovered_at), "creature_count")] += 1
+        for obj in session.deleted:
+            # 지운 기록은 그 날짜의 행에서 뺌 (rebuild 결과와 같도록 포인트도)
+            if isinstance(obj, (Sighting, Cleanup)):
+                deltas[(obj.user_id, _day(obj.created_at), "points")] -= _earned(obj.status, obj.points_earned)
+                if isinstance(obj, Cleanup) and obj.status == "approved":
+                    deltas[(obj.user_id, _day(obj.created_at), "cleanup_count")] -= 1
+            elif isinstance(obj, UserCollection):
+                deltas[(obj.user_id, _day(obj.discovered_at), "creature_count")] -= 1
+        for obj in session.dirty:
+            if isinstance(obj, (Sighting, Cleanup)):
+                status_before, status_after = _before_after(obj, "status")
+                points_before, points_after = _before_after(obj, "points_earned")
+                day = _day(obj.created_at)
+                deltas[(obj.user_id, day, "points")] += (
+                    _earned(status_after, points_after) - _earned(status_before, points_before)
+                )
+                if isinstance(obj, Cleanup):
+                    before, after = status_before == "approved", status_after == "approved"
+                    if before != after:
+                        deltas[(obj.user_id, day, "cleanup_count")] += 1 if after else -1
+
+        buckets: dict[tuple[Any, date], dict] = {}
+        for (user_id, day, column), delta in deltas.items():
+            if delta:
+                buckets.setdefault((user_id, day), {})[column] = delta
+        if not buckets:
+            return
+
+        now = datetime.utcnow()
+        new_users = {obj.id for obj in session.new if isinstance(obj, User)}
+        # 같은 행을 건드리는 트랜잭션끼리 잠금 순서를 맞춤
+        for (user_id, day), values in sorted(buckets.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+            if user_id in new_users:
+                # 아직 INSERT 전인 유저는 upsert가 외래 키에 걸리므로 ORM 객체로 같이 넣음
+                session.add(UserDailyStats(**{**_empty_bucket(user_id, day, now), **values}))
+            else:
+                self._upsert(session, user_id, day, values, now)
+
+
+# 싱글톤 인스턴스
+daily_stats_service = DailyStatsService()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_daily_stats(session: Session, flush_context, instances) -> None:
+    daily_stats_service.track_flush(session)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator) -> None:
+    """active_history를 켜기 위한 리스너 (하는 일 없음)"""
+
+
+# 커밋 후 만료된 기록의 지급 포인트를 바꿔도 이전 값을 알 수 있도록 읽어 둠 (status는 count_service에서)
+for _model in (Sighting, Cleanup):
+    event.listen(_model.points_earned, "set", _keep_previous_value, active_history=True)
@@ -0,0 +1,124 @@
+"""
+클라이언트 직접 업로드 (서명 URL)
+- API가 uploads/{user_id}/ 아래 임시 키로 서명 업로드 URL과 업로드 토큰을 발급
+- 클라이언트는 사진을 Storage에 바로 PUT하고, finalize 요청에는 토큰만 보냄
+- finalize 시 Storage에서 파일을 읽어 기존 업로드와 같은 검사/정규화를 거친 뒤 임시 파일 삭제
+- 발급한 임시 키는 stored_objects에 토큰 만료까지 보호해 두고, finalize되지 않으면 정리 작업이 삭제
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.storage import EXTENSIONS, StorageService, storage_service
+from app.services.upload_reader import UploadedImage, uploaded_image_from_bytes
+
+logger = logging.getLogger(__name__)
+
+STAGING_FOLDER = "uploads"
+# 액세스 토큰으로 쓰이지 않도록 aud를 붙임 (aud가 있는 토큰은 get_current_user에서 거절됨)
+TOKEN_AUDIENCE = "upload"
+
+
+class DirectUploadService:
+    def __init__(self, storage: StorageService = storage_service):
+        self.storage = storage
+
+    async def issue(self, user_id: uuid.UUID, content_type: str, db: Optional[AsyncSession] = None) -> dict:
+        """
+        서명 업로드 URL + 업로드 토큰 발급
+        - db: 요청 세션 (보호 시간 기록을 그 세션에서 커밋)
+        """
+        extension = EXTENSIONS.get(content_type)
+        if extension is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="지원하지 않는 이미지 형식입니다 (JPEG, PNG, WebP)"
+            )
+
+        object_key = f"{STAGING_FOLDER}/{user_id}/{uuid.uuid4().hex}.{extension}"
+        # finalize 없이 버려진 업로드는 토큰이 만료된 뒤 정리 작업이 지움
+        await self.storage.protect(
+            object_key,
+            settings.DIRECT_UPLOAD_URL_TTL_SECONDS + settings.DIRECT_UPLOAD_TOKEN_TTL_SECONDS,
+            db,
+        )
+        upload_url = await self.storage.backend.create_signed_upload_url(
+            object_key, settings.DIRECT_UPLOAD_URL_TTL_SECONDS
+        )
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=settings.DIRECT_UPLOAD_URL_TTL_SECONDS)
+        upload_token = jwt.encode(
+            {
+                "sub": str(user_id),
+                "key": object_key,
+                "aud": TOKEN_AUDIENCE,
+                "exp": now + timedelta(seconds=settings.DIRECT_UPLOAD_TOKEN_TTL_SECONDS),
+            },
+            settings.JWT_SECRET,
+            algorithm=settings.JWT_ALGORITHM,
+        )
+        return {
+            "object_key": object_key,
+            "upload_url": upload_url,
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+            "upload_token": upload_token,
+            "expires_at": expires_at,
+        }
+
+    def verify_token(self, upload_token: str, user_id: uuid.UUID) -> str:
+        """업로드 토큰 검증 → 임시 키 (다른 유저에게 발급된 토큰이면 403)"""
+        try:
+            payload = jwt.decode(
+                upload_token,
+                settings.JWT_SECRET,
+                algorithms=[settings.JWT_ALGORITHM],
+                audience=TOKEN_AUDIENCE,
+            )
+        except JWTError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="업로드 토큰이 유효하지 않거나 만료되었습니다"
+            )
+        if payload.get("sub") != str(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="다른 사용자의 업로드입니다"
+            )
+        return payload["key"]
+
+    async def fetch(self, object_key: str) -> UploadedImage:
+        """올라온 파일 읽기 + 크기/형식 확인"""
+        data = await self.storage.backend.get(object_key, settings.UPLOAD_MAX_BYTES)
+        if data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="업로드된 사진을 찾을 수 없습니다. 업로드가 끝난 뒤 다시 시도해 주세요."
+            )
+        return uploaded_image_from_bytes(data)
+
+    async def discard(self, object_keys: list[str]) -> None:
+        """처리가 끝난 임시 파일 삭제 (실패는 기록만, 남은 파일은 정리 작업이 만료 후 삭제)"""
+        deleted = []
+        for object_key in object_keys:
+            try:
+                await self.storage.backend.delete(object_key)
+            except Exception as e:
+                logger.warning(f"Failed to delete staged upload {object_key}: {e}")
+                continue
+            deleted.append(object_key)
+        try:
+            # 보호 행은 한 트랜잭션으로 삭제
+            await self.storage.release(deleted)
+        except Exception as e:
+            logger.warning(f"Failed to release staged uploads {deleted}: {e}")
+
+
+# 싱글톤 인스턴스
+direct_upload_service = DirectUploadService()
@@ -0,0 +1,154 @@
+"""
+Perceptual Hash 근접 검색 인덱스
+- 64비트 정수 해시를 연속된 uint64 NumPy 배열로 보관
+- 다중 인덱스 해싱으로 후보를 먼저 좁힘 (64비트를 16비트 4구간으로 나눠 구간 값별 버킷)
+  - 거리 d 이하인 해시는 적어도 한 구간이 d // 4 비트 이하로만 다름 (비둘기집 원리)
+  - 각 구간에서 그만큼 비트를 뒤집은 값의 버킷만 모으면 빠지는 해시가 없음
+- 후보에 대해서만 XOR + popcount 벡터 연산으로 해밍 거리를 계산
+"""
+import threading
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Optional
+
+import numpy as np
+
+UINT64_MASK = (1 << 64) - 1
+INT64_SIGN_BIT = 1 << 63
+BAND_COUNT = 4
+BAND_BITS = 64 // BAND_COUNT
+BAND_MASK = (1 << BAND_BITS) - 1
+# 구간마다 뒤집어 볼 최대 비트 수 (3비트부터는 구간당 수백 개 버킷이라 전체 탐색이 나음)
+MAX_BAND_RADIUS = 2
+
+
+@dataclass(frozen=True)
+class IndexedImage:
+    """인덱스에 등록된 이미지 참조"""
+    kind: str  # sighting, cleanup_before, cleanup_after
+    record_id: str
+    user_id: str
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 정수 해시 간의 해밍 거리"""
+    return ((a ^ b) & UINT64_MASK).bit_count()
+
+
+def hex_to_int64(hex_hash: str) -> int:
+    """hex 해시 → BIGINT 컬럼에 저장 가능한 부호 있는 64비트 정수"""
+    value = int(hex_hash, 16)
+    if value > UINT64_MASK:
+        raise ValueError(f"hash wider than 64 bits: {hex_hash}")
+    return value - (1 << 64) if value & INT64_SIGN_BIT else value
+
+
+def int64_to_hex(value: int) -> str:
+    """BIGINT 해시 → imagehash와 같은 16자리 hex 문자열"""
+    return f"{value & UINT64_MASK:016x}"
+
+
+def _bands(hash_value: int) -> list[int]:
+    """64비트 해시 → 16비트 구간 값 4개"""
+    return [(hash_value >> (band * BAND_BITS)) & BAND_MASK for band in range(BAND_COUNT)]
+
+
+def _neighbors(value: int, radius: int) -> list[int]:
+    """구간 값에서 radius 비트 이하를 뒤집은 값 전부"""
+    found = [value]
+    for flips in range(1, radius + 1):
+        for bits in combinations(range(BAND_BITS), flips):
+            flipped = value
+            for bit in bits:
+                flipped ^= 1 << bit
+            found.append(flipped)
+    return found
+
+
+class HashIndex:
+    """
+    NumPy 기반 해밍 거리 인덱스
+    - 해시는 용량을 두 배씩 늘리는 uint64 배열에 이어 붙임
+    - 구간 버킷(구간 값 → 배열 위치)으로 후보를 고른 뒤 후보에 대해서만 벡터 연산
+      - 후보가 많거나 거리가 커서 버킷 수가 많으면 배열 전체에 대한 벡터 연산
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self._hashes = np.zeros(self.INITIAL_CAPACITY, dtype=np.uint64)
+        self._size = 0
+        self._entries: list[IndexedImage] = []
+        self._known: set[IndexedImage] = set()
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(BAND_COUNT)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, entry: IndexedImage) -> bool:
+        return entry in self._known
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hashes = np.zeros(self.INITIAL_CAPACITY, dtype=np.uint64)
+            self._size = 0
+            self._entries = []
+            self._known = set()
+            self._buckets = [{} for _ in range(BAND_COUNT)]
+
+    def add(self, hash_value: int, entry: IndexedImage) -> bool:
+        """해시 등록 (이미 등록된 참조면 무시)"""
+        with self._lock:
+            if entry in self._known:
+                return False
+            if self._size == len(self._hashes):
+                grown = np.zeros(len(self._hashes) * 2, dtype=np.uint64)
+                grown[:self._size] = self._hashes[:self._size]
+                self._hashes = grown
+
+            hash_value &= UINT64_MASK
+            self._hashes[self._size] = hash_value
+            for buckets, band in zip(self._buckets, _bands(hash_value)):
+                buckets.setdefault(band, []).append(self._size)
+            self._size += 1
+            self._entries.append(entry)
+            self._known.add(entry)
+            return True
+
+    def _candidates(self, hash_value: int, max_distance: int) -> np.ndarray:
+        """거리 max_distance 이하일 수 있는 배열 위치 (오름차순, 잠금 안에서 호출)"""
+        radius = max_distance // BAND_COUNT
+        if radius > MAX_BAND_RADIUS:
+            return np.arange(self._size)
+        positions: list[int] = []
+        for buckets, band in zip(self._buckets, _bands(hash_value)):
+            for key in _neighbors(band, radius):
+                positions.extend(buckets.get(key, ()))
+            if len(positions) >= self._size:
+                return np.arange(self._size)
+        return np.unique(np.array(positions, dtype=np.intp))
+
+    def search(self, hash_value: int, max_distance: int) -> list[tuple[int, IndexedImage]]:
+        """거리 max_distance 이하의 (거리, 참조) 목록을 가까운 순으로 반환"""
+        hash_value &= UINT64_MASK
+        with self._lock:
+            candidates = self._candidates(hash_value, max_distance)
+            distances = np.bitwise_count(self._hashes[candidates] ^ np.uint64(hash_value))
+            matched = np.flatnonzero(distances <= max_distance)
+            order = matched[np.argsort(distances[matched], kind="stable")]
+            return [(int(distances[i]), self._entries[candidates[i]]) for i in order]
+
+    def nearest(self, hash_value: int, max_distance: int) -> Optional[tuple[int, IndexedImage]]:
+        """가장 가까운 (거리, 참조) 하나 (없으면 None)"""
+        hash_value &= UINT64_MASK
+        with self._lock:
+            candidates = self._candidates(hash_value, max_distance)
+            if len(candidates) == 0:
+                return None
+            distances = np.bitwise_count(self._hashes[candidates] ^ np.uint64(hash_value))
+            position = int(np.argmin(distances))
+            distance = int(distances[position])
+            if distance > max_distance:
+                return None
+            return distance, self._entries[candidates[position]]
@@ -0,0 +1,62 @@
+"""
+외부 HTTP 호출용 공유 클라이언트
+- 앱 수명 동안 하나의 httpx.AsyncClient를 재사용해 DNS/TCP/TLS 연결 비용을 줄임
+- lifespan에서 시작/종료, 커넥션 풀 크기와 HTTP/2는 설정으로 조정
+- Supabase Storage, Google OAuth 호출이 사용
+"""
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClientPool:
+    def __init__(self, **client_options):
+        # 테스트/벤치마크용 추가 옵션 (transport, verify 등)
+        self.client_options = client_options
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> httpx.AsyncClient:
+        """클라이언트 생성 (이미 있으면 그대로 사용)"""
+        if self._client is None or self._client.is_closed:
+            http2 = settings.HTTP_CLIENT_HTTP2
+            if http2 and not _http2_available():
+                logger.warning("HTTP/2 requested but h2 is not installed, falling back to HTTP/1.1")
+                http2 = False
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+                ),
+                timeout=settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+                **self.client_options,
+            )
+        return self._client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """공유 클라이언트 (lifespan 밖에서 쓰이면 지연 생성)"""
+        return self.start()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 싱글톤 인스턴스
+http_client = HttpClientPool()
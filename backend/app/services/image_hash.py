@@ -2,98 +2,257 @@
 이미지 중복/악용 방지
 - Perceptual Hash로 유사 이미지 탐지
 - 인터넷 다운로드 이미지 필터링
+- 기존 해시는 64비트 정수로 저장하고 프로세스 내 NumPy 인덱스로 검색
 """
-import io
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Union
 import imagehash
-from PIL import Image, UnidentifiedImageError
+from PIL import Image
 from fastapi import HTTPException, status
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.sighting import Sighting
 from app.models.cleanup import Cleanup
+from app.config import settings
+from app.services.image_loader import draft_to_dimension, open_image, PHASH_INPUT_SIZE
+from app.services.image_worker import image_worker
+from app.services.result_cache import image_digest, result_cache
+from app.services.hash_index import HashIndex, IndexedImage, hamming_distance, hex_to_int64
+
+logger = logging.getLogger(__name__)
+
+# 해시 알고리즘/입력 크기/디코딩 배율이 바뀌면 캐시 키도 바뀌도록 네임스페이스에 포함
+PHASH_CACHE_NAMESPACE = f"phash:{PHASH_INPUT_SIZE}:{settings.IMAGE_MAX_DIMENSION}"
+
+# 다른 워커가 커밋한 해시를 따라잡을 때 겹쳐 읽는 구간 (커밋 지연 대비)
+INDEX_SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def phash_hex(
+    image_bytes: bytes,
+    opened: Optional[Image.Image] = None,
+    max_dimension: Optional[int] = None,
+) -> str:
+    """
+    pHash (워커 프로세스에서 실행되는 모듈 수준 함수)
+    - 저장되는 해시와 중복 검사 해시가 같도록 pHash는 이 함수로만 계산
+    - 회전 전(EXIF 무시) 이미지를 업로드 정규화와 같은 배율로 디코딩 → PHASH_INPUT_SIZE 이상으로 reduce → 흑백
+      (JPEG 축소 디코딩 배율에 따라 픽셀이 달라지므로 배율을 정규화와 맞춰 디코딩 한 번을 공유)
+    - opened: 업로드 정규화에서 이미 연 이미지 (draft_to_dimension 적용 후, 디코딩 전)
+    - max_dimension: 정규화 긴 변 상한 (없으면 IMAGE_MAX_DIMENSION)
+    """
+    image = opened
+    if image is None:
+        image = open_image(image_bytes)
+        draft_to_dimension(image, max_dimension or settings.IMAGE_MAX_DIMENSION)
+    factor = min(image.size) // PHASH_INPUT_SIZE
+    if factor >= 2:
+        image = image.reduce(factor)
+    if image.mode != "L":
+        image = image.convert("L")
+    return str(imagehash.phash(image))
 
 
 class ImageHashService:
     SIMILARITY_THRESHOLD = 5  # hamming distance < 5 → 유사 이미지
 
+    def __init__(self):
+        self.index = HashIndex()
+        self._index_synced_at: Optional[datetime] = None
+
     def compute_hash(self, image_bytes: bytes) -> str:
         """이미지 해시 계산"""
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-        except UnidentifiedImageError:
-            # HEIC 등 지원되지 않는 포맷을 위해 pillow-heif가 있으면 시도
-            try:
-                from pillow_heif import register_heif_opener
+            return phash_hex(image_bytes)
+        except (OSError, Image.DecompressionBombError) as e:
+            raise self.invalid_image_error(e)
+
+    async def compute_hash_async(self, image_bytes: bytes, digest: Optional[str] = None) -> str:
+        """
+        이미지 해시 계산 (워커 풀에서 실행해 이벤트 루프를 막지 않음)
+        - digest: 업로드를 읽으며 계산한 SHA-256 (없으면 계산)
+        """
+        digest = digest or image_digest(image_bytes)
+        cached = await result_cache.get(PHASH_CACHE_NAMESPACE, digest)
+        if cached is not None:
+            return cached
+
+        try:
+            image_hash = await image_worker.run(phash_hex, image_bytes, None, settings.IMAGE_MAX_DIMENSION)
+        except (OSError, Image.DecompressionBombError) as e:
+            raise self.invalid_image_error(e)
+        await result_cache.set(PHASH_CACHE_NAMESPACE, digest, image_hash)
+        return image_hash
 
-                register_heif_opener()
-                image = Image.open(io.BytesIO(image_bytes))
-            except Exception:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="유효하지 않은 이미지 파일입니다. JPEG/PNG 또는 HEIC 지원 패키지(pillow-heif)가 필요합니다."
-                )
-        return str(imagehash.phash(image))
+    def invalid_image_error(self, error: Exception) -> HTTPException:
+        if isinstance(error, Image.DecompressionBombError):
+            return HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="이미지 해상도가 너무 큽니다."
+            )
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="유효하지 않은 이미지 파일입니다. JPEG/PNG 또는 HEIC 지원 패키지(pillow-heif)가 필요합니다."
+        )
 
     def _hamming_distance(self, hash1: str, hash2: str) -> int:
-        """두 해시 간의 해밍 거리 계산"""
-        try:
-            h1 = imagehash.hex_to_hash(hash1)
-            h2 = imagehash.hex_to_hash(hash2)
-            return h1 - h2
-        except Exception:
-            return 100  # 비교 불가 시 큰 값 반환
+        """두 hex 해시 간의 해밍 거리 계산"""
+        return hamming_distance(int(hash1, 16), int(hash2, 16))
+
+    def hash_to_int(self, hex_hash: Optional[str]) -> Optional[int]:
+        """hex 해시 → BIGINT 컬럼 값"""
+        return hex_to_int64(hex_hash) if hex_hash else None
+
+    def _index_hash(
+        self,
+        kind: str,
+        record_id,
+        user_id,
+        hash_int: Optional[int],
+        hex_hash: Optional[str] = None,
+    ) -> None:
+        """해시 하나를 인덱스에 등록 (정수 컬럼이 비어 있으면 hex로 대체)"""
+        if hash_int is None and hex_hash:
+            try:
+                hash_int = hex_to_int64(hex_hash)
+            except ValueError:
+                logger.warning(f"Skipping malformed image hash for {kind} {record_id}")
+                return
+        if hash_int is None:
+            return
+        self.index.add(hash_int, IndexedImage(kind, str(record_id), str(user_id)))
+
+    def _load_hashes(self, db: Session, since: Optional[datetime] = None) -> None:
+        """DB의 이미지 해시를 인덱스에 적재 (since 이후 생성분만 선택적으로)"""
+        sightings = db.query(
+            Sighting.id, Sighting.image_hash_int, Sighting.image_hash, Sighting.user_id
+        ).filter(
+            Sighting.image_hash.isnot(None)
+        )
+        cleanups = db.query(
+            Cleanup.id,
+            Cleanup.before_image_hash_int, Cleanup.before_image_hash,
+            Cleanup.after_image_hash_int, Cleanup.after_image_hash,
+            Cleanup.user_id,
+        )
+        if since is not None:
+            sightings = sightings.filter(Sighting.created_at >= since)
+            cleanups = cleanups.filter(Cleanup.created_at >= since)
+
+        for sighting_id, hash_int, image_hash, user_id in sightings.all():
+            self._index_hash("sighting", sighting_id, user_id, hash_int, image_hash)
+
+        for cleanup_id, before_int, before_hash, after_int, after_hash, user_id in cleanups.all():
+            self._index_hash("cleanup_before", cleanup_id, user_id, before_int, before_hash)
+            self._index_hash("cleanup_after", cleanup_id, user_id, after_int, after_hash)
+
+    def backfill_hash_ints(self, db: Session, batch_size: int = 1000) -> int:
+        """hex 해시만 있는 기존 행의 BIGINT 컬럼 채우기"""
+        updated = 0
+        targets = [
+            (Sighting, "image_hash", "image_hash_int"),
+            (Cleanup, "before_image_hash", "before_image_hash_int"),
+            (Cleanup, "after_image_hash", "after_image_hash_int"),
+        ]
+        for model, hex_column, int_column in targets:
+            while True:
+                rows = db.query(model).filter(
+                    getattr(model, hex_column).isnot(None),
+                    getattr(model, int_column).is_(None),
+                ).limit(batch_size).all()
+                if not rows:
+                    break
+
+                for row in rows:
+                    try:
+                        setattr(row, int_column, hex_to_int64(getattr(row, hex_column)))
+                    except ValueError:
+                        # 해석 불가한 값은 지워서 다음 배치에서 다시 잡히지 않게 함
+                        logger.warning(f"Clearing malformed image hash on {model.__tablename__} {row.id}")
+                        setattr(row, hex_column, None)
+                    updated += 1
+                db.commit()
+        return updated
+
+    def build_index(self, db: Session) -> int:
+        """전체 해시로 인덱스 구성 (앱 시작 시 1회)"""
+        synced_at = datetime.utcnow()
+        self.index.clear()
+        self._load_hashes(db)
+        self._index_synced_at = synced_at
+        return len(self.index)
+
+    def sync_index(self, db: Session) -> None:
+        """
+        인덱스 최신화
+        - 아직 구성되지 않았으면 전체 적재
+        - 이후에는 다른 워커 프로세스가 커밋한 최근 해시만 추가로 읽음
+        """
+        if self._index_synced_at is None:
+            self.build_index(db)
+            return
+
+        synced_at = datetime.utcnow()
+        self._load_hashes(db, since=self._index_synced_at - INDEX_SYNC_OVERLAP)
+        self._index_synced_at = synced_at
+
+    def register_sighting(self, sighting: Sighting) -> None:
+        """커밋된 목격 기록의 해시를 인덱스에 반영"""
+        self._index_hash(
+            "sighting", sighting.id, sighting.user_id,
+            sighting.image_hash_int, sighting.image_hash,
+        )
+
+    def register_cleanup(self, cleanup: Cleanup) -> None:
+        """커밋된 수거 기록의 Before/After 해시를 인덱스에 반영"""
+        self._index_hash(
+            "cleanup_before", cleanup.id, cleanup.user_id,
+            cleanup.before_image_hash_int, cleanup.before_image_hash,
+        )
+        self._index_hash(
+            "cleanup_after", cleanup.id, cleanup.user_id,
+            cleanup.after_image_hash_int, cleanup.after_image_hash,
+        )
 
     async def check_duplicate(
         self,
-        db: Session,
-        image_bytes: bytes,
-        user_id: UUID
+        db: Union[Session, AsyncSession],
+        image_bytes: Optional[bytes],
+        user_id: UUID,
+        image_hash: Optional[str] = None,
+        sync: bool = True,
     ) -> dict:
         """
         중복 검사
         - 같은 유저가 같은 사진 재업로드
         - 다른 유저의 사진 도용
+        - 이미 계산한 image_hash를 넘기면 이미지를 다시 디코딩하지 않음
+        - sync=False: 같은 요청에서 방금 인덱스를 최신화했으면 DB를 다시 읽지 않음
+        - API에서는 AsyncSession, 백그라운드 작업/테스트에서는 동기 Session
         """
-        new_hash = self.compute_hash(image_bytes)
+        new_hash = image_hash or await self.compute_hash_async(image_bytes)
 
-        # DB에서 모든 이미지 해시 조회
-        sighting_hashes = db.query(Sighting.id, Sighting.image_hash, Sighting.user_id).filter(
-            Sighting.image_hash.isnot(None)
-        ).all()
-
-        cleanup_before_hashes = db.query(Cleanup.id, Cleanup.before_image_hash, Cleanup.user_id).filter(
-            Cleanup.before_image_hash.isnot(None)
-        ).all()
-
-        cleanup_after_hashes = db.query(Cleanup.id, Cleanup.after_image_hash, Cleanup.user_id).filter(
-            Cleanup.after_image_hash.isnot(None)
-        ).all()
-
-        # 유사 이미지 검색
-        for sighting_id, existing_hash, existing_user_id in sighting_hashes:
-            if existing_hash:
-                distance = self._hamming_distance(new_hash, existing_hash)
-                if distance < self.SIMILARITY_THRESHOLD:
-                    return {
-                        "is_duplicate": True,
-                        "similar_image_id": str(sighting_id),
-                        "hash": new_hash,
-                        "is_same_user": str(existing_user_id) == str(user_id),
-                        "distance": distance,
-                    }
-
-        for cleanup_id, existing_hash, existing_user_id in cleanup_before_hashes + cleanup_after_hashes:
-            if existing_hash:
-                distance = self._hamming_distance(new_hash, existing_hash)
-                if distance < self.SIMILARITY_THRESHOLD:
-                    return {
-                        "is_duplicate": True,
-                        "similar_image_id": str(cleanup_id),
-                        "hash": new_hash,
-                        "is_same_user": str(existing_user_id) == str(user_id),
-                        "distance": distance,
-                    }
+        if sync:
+            if isinstance(db, AsyncSession):
+                await db.run_sync(self.sync_index)
+            else:
+                self.sync_index(db)
+
+        # 가장 가까운 이미지 탐색: 16비트 구간 버킷으로 후보를 고른 뒤 후보만 벡터 연산
+        # (구간당 뒤집어 볼 비트가 많거나 후보가 전체만큼 많을 때만 전체 배열 탐색)
+        nearest = self.index.nearest(int(new_hash, 16), self.SIMILARITY_THRESHOLD - 1)
+        if nearest:
+            distance, match = nearest
+            return {
+                "is_duplicate": True,
+                "similar_image_id": match.record_id,
+                "hash": new_hash,
+                "is_same_user": match.user_id == str(user_id),
+                "distance": distance,
+            }
 
         return {
             "is_duplicate": False,
@@ -0,0 +1,75 @@
+"""
+이미지 로딩 공통 헬퍼
+- HEIF 오프너는 import 시 한 번만 등록 (pillow-heif가 있을 때)
+- JPEG는 draft()로 필요한 크기에 가까운 배율로 바로 디코딩
+- 업로드 정규화와 pHash는 같은 배율(draft_to_dimension)로 한 번만 디코딩해 결과를 공유
+- 그 외 포맷은 reduce()로 정수 배 축소 후 사용처에 전달
+- 픽셀 수 상한으로 압축 폭탄 이미지 차단
+"""
+import io
+import math
+
+from PIL import Image
+
+from app.config import settings
+
+try:
+    from pillow_heif import register_heif_opener
+
+    register_heif_opener()
+    HEIF_SUPPORTED = True
+except ImportError:
+    HEIF_SUPPORTED = False
+
+# pHash의 DCT 입력은 32px이지만, 32px로 바로 디코딩하면 전체 해상도에서 계산해 저장된
+# 기존 해시와 최대 8비트까지 달라진다. 256px 이상에서 줄이면 차이가 2비트 이내로
+# 유사도 기준(5)보다 충분히 작다.
+PHASH_INPUT_SIZE = 256
+VIT_INPUT_SIZE = 224    # ViT 계열 분류기 입력 크기
+
+
+def open_image(image_bytes: bytes) -> Image.Image:
+    """
+    헤더만 읽고 크기 검사 (픽셀 데이터 디코딩 전)
+    - 픽셀 수가 IMAGE_MAX_PIXELS를 넘으면 Image.DecompressionBombError
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    width, height = image.size
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise Image.DecompressionBombError(
+            f"Image size ({width * height} pixels) exceeds limit of {settings.IMAGE_MAX_PIXELS} pixels"
+        )
+    return image
+
+
+def draft_to_dimension(image: Image.Image, max_dimension: int, mode: str = "RGB") -> None:
+    """
+    JPEG면 긴 변이 max_dimension 이상을 유지하는 가장 작은 배율로 디코딩하도록 설정
+    - 디코딩 전(open_image 직후)에만 효과가 있고, 그 외 포맷이나 이미 작은 이미지는 그대로
+    """
+    width, height = image.size
+    scale = max_dimension / max(width, height)
+    if image.format == "JPEG" and scale < 1:
+        image.draft(mode, (math.ceil(width * scale), math.ceil(height * scale)))
+
+
+def load_image(image_bytes: bytes, min_size: int, mode: str = "RGB") -> Image.Image:
+    """
+    이미지 디코딩
+    - 결과 이미지의 가로/세로는 min_size 이상을 유지하는 가장 작은 크기
+    - 해석할 수 없는 이미지는 OSError(UnidentifiedImageError)
+    - 픽셀 수가 IMAGE_MAX_PIXELS를 넘으면 Image.DecompressionBombError
+    """
+    image = open_image(image_bytes)
+
+    if image.format == "JPEG":
+        # DCT 단계에서 1/2, 1/4, 1/8로 축소 디코딩
+        image.draft(mode, (min_size, min_size))
+
+    factor = min(image.size) // min_size
+    if factor >= 2:
+        image = image.reduce(factor)
+
+    if image.mode != mode:
+        image = image.convert(mode)
+    return image
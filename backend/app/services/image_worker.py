@@ -0,0 +1,81 @@
+"""
+이미지 처리 워커 풀
+- 디코딩/해시 같은 CPU 작업을 이벤트 루프 밖(프로세스 또는 스레드 풀)에서 실행
+- 대기 작업 수를 제한하고 가득 차면 503으로 거절 (백프레셔)
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+class ImageWorker:
+    def __init__(self, mode: str, max_workers: int, max_pending: int):
+        self.mode = mode  # process, thread
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        """실행기 지연 생성"""
+        if self._executor is None:
+            if self.mode == "process":
+                # 포크 시 부모의 스레드/모델 상태를 물려받지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="image-worker",
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        작업 실행
+        - fn은 프로세스 모드에서 피클 가능한 모듈 수준 함수여야 함
+        """
+        # 카운터는 이벤트 루프 스레드에서만 변경되므로 잠금이 필요 없다
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="이미지 처리 요청이 많습니다. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), functools.partial(fn, *args)
+            )
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# 싱글톤 인스턴스
+image_worker = ImageWorker(
+    mode=settings.IMAGE_WORKER_MODE,
+    max_workers=settings.IMAGE_WORKER_MAX_WORKERS,
+    max_pending=settings.IMAGE_WORKER_MAX_PENDING,
+)
@@ -0,0 +1,60 @@
+"""
+분류 모델 추론 백엔드
+- torch: transformers 기본 파이프라인 (fp32 PyTorch)
+- int8: Linear 레이어 동적 int8 양자화 (PyTorch)
+- onnx: ONNX Runtime (optimum, 최초 1회 export 후 디스크 캐시)
+"""
+import logging
+import os
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_BACKENDS = ("torch", "int8", "onnx")
+
+
+def _onnx_model_dir(model_name: str) -> str:
+    return os.path.join(settings.AI_ONNX_CACHE_DIR, model_name.replace("/", "__"))
+
+
+def _load_onnx_model(model_name: str):
+    """ONNX 모델 로드 (캐시가 없으면 export 후 저장)"""
+    from optimum.onnxruntime import ORTModelForImageClassification
+
+    model_dir = _onnx_model_dir(model_name)
+    if os.path.isdir(model_dir):
+        return ORTModelForImageClassification.from_pretrained(model_dir)
+
+    logger.info(f"Exporting {model_name} to ONNX at {model_dir}")
+    model = ORTModelForImageClassification.from_pretrained(model_name, export=True)
+    model.save_pretrained(model_dir)
+    return model
+
+
+def build_pipeline(model_name: str, backend: str | None = None):
+    """설정된 백엔드로 image-classification 파이프라인 생성"""
+    from transformers import pipeline
+
+    backend = backend or settings.AI_INFERENCE_BACKEND
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    if backend == "onnx":
+        from transformers import AutoImageProcessor
+
+        return pipeline(
+            "image-classification",
+            model=_load_onnx_model(model_name),
+            image_processor=AutoImageProcessor.from_pretrained(model_name),
+        )
+
+    classifier = pipeline("image-classification", model=model_name)
+    if backend == "int8":
+        import torch
+
+        # ViT 연산 대부분이 Linear이므로 가중치만 int8로 바꿔도 메모리/지연이 크게 준다
+        classifier.model = torch.ao.quantization.quantize_dynamic(
+            classifier.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return classifier
@@ -0,0 +1,110 @@
+"""
+분류 모델 마이크로 배칭
+- 요청별로 디코딩된 이미지를 큐에 넣고 Future로 결과를 기다림
+- 백그라운드 워커가 최대 N장 또는 T밀리초까지 모아 한 번의 forward로 처리
+- 배치 크기 분포를 기록해 처리량/지연 튜닝에 사용
+"""
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[list], list],
+        max_batch_size: int,
+        max_wait_ms: int,
+    ):
+        self.name = name
+        self.run_batch = run_batch  # 입력 리스트 → 같은 순서의 결과 리스트 (스레드에서 실행)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.batch_size_histogram: Counter = Counter()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> None:
+        """현재 이벤트 루프에 묶인 큐/워커 준비 (루프가 바뀌면 다시 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker_task is not None and not self._worker_task.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker_task = loop.create_task(self._worker(self._queue))
+
+    async def submit(self, item: Any) -> Any:
+        """입력 하나를 배치 큐에 넣고 결과를 기다림"""
+        return (await self.submit_many([item]))[0]
+
+    async def submit_many(self, items: list) -> list:
+        """여러 입력을 연달아 넣어 같은 배치로 묶이게 함"""
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self._queue.put_nowait((item, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batch_size_histogram[len(batch)] += 1
+            inputs = [item for item, _ in batch]
+            try:
+                # forward는 CPU 작업이므로 이벤트 루프 밖에서 실행
+                results = await asyncio.to_thread(self.run_batch, inputs)
+            except Exception as e:
+                logger.error(f"{self.name} batch inference failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        """배치 크기 분포"""
+        batches = sum(self.batch_size_histogram.values())
+        items = sum(size * count for size, count in self.batch_size_histogram.items())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": int(self.max_wait * 1000),
+            "batches": batches,
+            "items": items,
+            "avg_batch_size": round(items / batches, 2) if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items())),
+        }
+
+    async def close(self) -> None:
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            if self._loop is asyncio.get_running_loop():
+                try:
+                    await self._worker_task
+                except asyncio.CancelledError:
+                    pass
+            self._worker_task = None
@@ -0,0 +1,241 @@
+"""
+랭킹 (리더보드)
+- 지표별 점수: 도감 수/승인된 수거 수는 user_stats, 포인트는 users.points (쓰기 시점에 이미 갱신됨)
+- 기간별 점수 (week/month/season): user_daily_stats에서 기간 시작일 이후 행만 합산
+  - 기간은 UTC 기준 이번 주(월요일부터), 이번 달, 이번 분기(시즌)이고 점수가 0인 유저는 빠짐
+- 프로세스마다 (지표, 기간)별 정렬 리스트를 메모리에 두고 bisect로 순위 조회 (O(log n))
+  - 같은 점수는 같은 순위 (1, 2, 2, 4 ...)
+  - 표시 순서는 점수 내림차순 → (기간 랭킹) 기간 안의 마지막 활동이 이른 유저 → user_id
+  - 기간이 바뀌면 (새 주/달/분기) 새로 로드하고 지난 기간 리스트는 버림
+- 갱신
+  - 이 프로세스의 커밋: 바뀐 유저만 표시해 두었다가 다음 조회 때 그 유저들 점수만 다시 읽음
+  - 다른 워커의 커밋: LEADERBOARD_REFRESH_SECONDS마다 전체 다시 로드
+    - (지표, 기간)마다 잠금을 두어 한 요청만 로드하고, 새 리스트는 따로 만든 뒤 한 번에 교체
+    - 로드하는 동안 같은 (지표, 기간)의 다른 요청은 기존 리스트로 응답 (처음 로드할 때만 기다림)
+"""
+import asyncio
+import time
+import uuid
+from bisect import bisect_left, insort
+from datetime import date, datetime
+from itertools import chain
+from typing import Iterable, Literal, Optional, get_args
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.user import User
+from app.models.user_creature import UserCollection
+from app.models.user_daily_stats import UserDailyStats
+from app.models.user_stats import UserStats
+from app.services import daily_stats  # noqa: F401  (일별 집계 갱신 리스너 등록)
+
+# 지표 → 점수 컬럼 (유저마다 한 행, 통계 행이 없으면 0)
+METRIC_COLUMNS = {
+    "collection": func.coalesce(UserStats.creature_count, 0),
+    "cleanup": func.coalesce(UserStats.cleanup_count, 0),
+    "points": func.coalesce(User.points, 0),
+}
+# 지표 → 기간 랭킹에서 합산할 일별 컬럼
+BUCKET_COLUMNS = {
+    "collection": UserDailyStats.creature_count,
+    "cleanup": UserDailyStats.cleanup_count,
+    "points": UserDailyStats.points,
+}
+# 라우터에서 쿼리 파라미터 타입으로 검증 (다른 값은 422)
+Period = Literal["week", "month", "season", "all"]
+PERIODS = get_args(Period)
+DIRTY_USERS_KEY = "leaderboard_dirty_users"
+# 동점 순서를 따지지 않는 점수 (전체 기간)
+NO_TIEBREAK = datetime.min
+
+
+def period_start(period: str, today: date) -> Optional[date]:
+    """기간 시작일 (전체 기간은 None)"""
+    if period == "week":
+        return date.fromordinal(today.toordinal() - today.weekday())
+    if period == "month":
+        return today.replace(day=1)
+    if period == "season":
+        return today.replace(month=(today.month - 1) // 3 * 3 + 1, day=1)
+    return None
+
+
+class Leaderboard:
+    """점수 정렬 리스트 (키: (-점수, 동점 순서용 시각, user_id))"""
+
+    def __init__(self, scores: Iterable[tuple] = ()):
+        # (user_id, 점수) 또는 (user_id, 점수, 동점일 때 이른 쪽이 앞서는 시각)
+        self._scores: dict[uuid.UUID, tuple[int, datetime]] = {
+            user_id: (value, rest[0] if rest else NO_TIEBREAK) for user_id, value, *rest in scores
+        }
+        self._keys = sorted(
+            (-value, reached_at, user_id) for user_id, (value, reached_at) in self._scores.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def set(self, user_id: uuid.UUID, value: int, reached_at: datetime = NO_TIEBREAK) -> None:
+        old = self._scores.get(user_id)
+        if old == (value, reached_at):
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old[0], old[1], user_id))]
+        self._scores[user_id] = (value, reached_at)
+        insort(self._keys, (-value, reached_at, user_id))
+
+    def remove(self, user_id: uuid.UUID) -> None:
+        old = self._scores.pop(user_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old[0], old[1], user_id))]
+
+    def score(self, user_id: uuid.UUID) -> Optional[int]:
+        entry = self._scores.get(user_id)
+        return None if entry is None else entry[0]
+
+    def rank_of_value(self, value: int) -> int:
+        """이 점수의 순위 = 점수가 더 높은 유저 수 + 1"""
+        return bisect_left(self._keys, (-value,)) + 1
+
+    def rank(self, user_id: uuid.UUID) -> Optional[int]:
+        value = self.score(user_id)
+        return None if value is None else self.rank_of_value(value)
+
+    def top(self, limit: int) -> list[tuple[int, uuid.UUID, int]]:
+        """상위 limit명 → (순위, user_id, 점수)"""
+        entries = []
+        for index, (negative, _, user_id) in enumerate(self._keys[:limit]):
+            value = -negative
+            # 같은 점수면 앞사람과 같은 순위
+            rank = entries[-1][0] if entries and entries[-1][2] == value else index + 1
+            entries.append((rank, user_id, value))
+        return entries
+
+
+class LeaderboardService:
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        # (지표, 기간, 기간 시작일) → (다시 로드할 시각, 리더보드)
+        self._boards: dict[tuple, tuple[float, Leaderboard]] = {}
+        self._dirty: dict[tuple, set[uuid.UUID]] = {}
+        # (지표, 기간) → 전체 로드 잠금 (다른 지표/기간의 조회는 기다리지 않음)
+        self._locks: dict[tuple, asyncio.Lock] = {}
+
+    def clear(self) -> None:
+        self._boards.clear()
+        self._dirty.clear()
+
+    def mark_dirty(self, user_ids: Iterable[uuid.UUID]) -> None:
+        """커밋된 변경 반영 예약 (다음 조회 때 해당 유저 점수만 다시 읽음)"""
+        user_ids = set(user_ids)
+        for dirty in self._dirty.values():
+            dirty.update(user_ids)
+
+    def _scores_query(self, metric: str, start: Optional[date], user_ids: Optional[set] = None):
+        if start is None:
+            query = select(User.id, METRIC_COLUMNS[metric]).outerjoin(
+                UserStats, UserStats.user_id == User.id
+            )
+            return query if user_ids is None else query.where(User.id.in_(user_ids))
+
+        # 기간 안의 일별 행만 합산 (동점이면 마지막으로 점수가 오른 시각이 이른 유저가 앞)
+        column = BUCKET_COLUMNS[metric]
+        query = select(
+            UserDailyStats.user_id, func.sum(column), func.max(UserDailyStats.updated_at)
+        ).where(UserDailyStats.day >= start, column != 0)
+        if user_ids is not None:
+            query = query.where(UserDailyStats.user_id.in_(user_ids))
+        return query.group_by(UserDailyStats.user_id).having(func.sum(column) > 0)
+
+    async def _reload(self, db: AsyncSession, key: tuple) -> Leaderboard:
+        """전체 로드 → 새 리스트로 교체 (조회 중인 기존 리스트는 건드리지 않음)"""
+        metric, _, start = key
+        # 로드 중 커밋된 변경도 놓치지 않도록 표시를 먼저 비워 둠 (다음 조회 때 반영)
+        pending = self._dirty.get(key, set())
+        self._dirty[key] = set()
+        try:
+            rows = (await db.execute(self._scores_query(metric, start))).all()
+        except BaseException:
+            if key in self._dirty:
+                self._dirty[key] |= pending
+            raise
+        board = Leaderboard(rows)
+
+        # 지난 기간 리스트는 버림
+        for stale in [other for other in self._boards if other[:2] == key[:2] and other != key]:
+            del self._boards[stale]
+            self._dirty.pop(stale, None)
+        self._boards[key] = (time.monotonic() + self.refresh_seconds, board)
+        return board
+
+    async def _apply_dirty(self, db: AsyncSession, key: tuple, board: Leaderboard) -> Leaderboard:
+        """바뀐 유저 점수만 다시 읽어 반영"""
+        dirty = self._dirty.get(key)
+        if not dirty:
+            return board
+        self._dirty[key] = set()
+        metric, _, start = key
+        rows = (await db.execute(self._scores_query(metric, start, dirty))).all()
+
+        loaded = self._boards.get(key)
+        if loaded is None or loaded[1] is not board:
+            # 읽는 동안 새 리스트로 교체됨: 새 리스트에는 다음 조회 때 반영
+            if key in self._dirty:
+                self._dirty[key] |= dirty
+            return board
+        for user_id, value, *reached_at in rows:
+            board.set(user_id, value, *reached_at)
+        # 삭제된 유저, 기간 점수가 0이 된 유저
+        for user_id in dirty - {row[0] for row in rows}:
+            board.remove(user_id)
+        return board
+
+    async def get(self, db: AsyncSession, metric: str, period: str = "all") -> Leaderboard:
+        """(지표, 기간)별 리더보드 (오래됐으면 전체 로드, 바뀐 유저가 있으면 그 유저만 갱신)"""
+        if period not in PERIODS:
+            raise ValueError(f"period는 {', '.join(PERIODS)} 중 하나여야 합니다: {period}")
+        start = period_start(period, datetime.utcnow().date())
+        key = (metric, period, start)
+
+        loaded = self._boards.get(key)
+        if loaded is None or loaded[0] <= time.monotonic():
+            lock = self._locks.setdefault(key[:2], asyncio.Lock())
+            # 다른 요청이 다시 로드하는 중이면 기존 리스트로 응답
+            if loaded is None or not lock.locked():
+                async with lock:
+                    loaded = self._boards.get(key)
+                    if loaded is None or loaded[0] <= time.monotonic():
+                        return await self._reload(db, key)
+        return await self._apply_dirty(db, key, loaded[1])
+
+
+# 싱글톤 인스턴스
+leaderboard_service = LeaderboardService(refresh_seconds=settings.LEADERBOARD_REFRESH_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    """점수에 영향을 주는 변경의 유저 기록 (커밋되면 리더보드에 반영)"""
+    changed = session.info.setdefault(DIRTY_USERS_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.id)
+        elif isinstance(obj, (Sighting, Cleanup, UserCollection, UserStats, UserDailyStats)):
+            changed.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changed_users(session: Session) -> None:
+    changed = session.info.pop(DIRTY_USERS_KEY, None)
+    if changed:
+        leaderboard_service.mark_dirty(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(DIRTY_USERS_KEY, None)
@@ -0,0 +1,63 @@
+"""
+피드 커서(keyset) 페이지네이션
+- 정렬 키 (created_at DESC, id DESC), 커서는 마지막 항목의 (created_at, id)
+- 다음 페이지는 (created_at, id) < 커서 조건으로 인덱스에서 바로 이어 읽음 (OFFSET처럼 앞 페이지를 건너뛰며 읽지 않음)
+- 커서는 클라이언트가 해석하지 않는 불투명 문자열 (base64url)
+"""
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, desc, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(created_at: datetime, item_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{item_id.hex}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """커서 → (created_at, id) (형식이 잘못되면 400)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, item_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(item_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 페이지 커서입니다"
+        )
+
+
+async def fetch_feed_page(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    cursor: Optional[str],
+    limit: int,
+    offset: int = 0,
+) -> tuple[list, Optional[str]]:
+    """
+    커서 다음 페이지 조회 → (항목, 다음 커서)
+    - limit + 1개를 읽어 다음 페이지가 있는지 확인 (마지막 페이지면 다음 커서 None)
+    - offset은 page를 보내는 이전 클라이언트용 (cursor가 있으면 무시)
+    """
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, item_id))
+    elif offset:
+        query = query.offset(offset)
+
+    rows = (await db.scalars(
+        query.order_by(desc(model.created_at), desc(model.id)).limit(limit + 1)
+    )).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if items and len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
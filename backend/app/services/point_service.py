@@ -1,10 +1,10 @@
 """포인트 계산 서비스"""
+from uuid import UUID
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.models.sighting import Sighting
-from app.models.cleanup import Cleanup
 from app.models.user_creature import UserCollection
 from app.services.static_creatures import RARITY_BY_ID
+from app.services.user_stats import user_stats_service
 
 
 SIGHTING_POINTS = {
@@ -89,28 +89,16 @@ class PointService:
         return 0
 
     def get_user_stats(self, db: Session, user_id: str) -> dict:
-        """유저 통계 조회"""
-        sighting_count = db.query(Sighting).filter(
-            Sighting.user_id == user_id,
-            Sighting.status == "approved"
-        ).count()
-
-        cleanup_count = db.query(Cleanup).filter(
-            Cleanup.user_id == user_id,
-            Cleanup.status == "approved"
-        ).count()
-
-        creature_count = db.query(UserCollection).filter(
-            UserCollection.user_id == user_id
-        ).count()
-
-        user = db.query(User).filter(User.id == user_id).first()
+        """유저 통계 조회 (user_stats 한 행 + 유저)"""
+        user_id = UUID(str(user_id))
+        stats = user_stats_service.get_sync(db, user_id)
+        user = db.get(User, user_id)
 
         return {
             "total_points": user.points if user else 0,
-            "sighting_count": sighting_count,
-            "cleanup_count": cleanup_count,
-            "creature_count": creature_count
+            "sighting_count": stats["sighting_count"],
+            "cleanup_count": stats["cleanup_count"],
+            "creature_count": stats["creature_count"]
         }
 
 
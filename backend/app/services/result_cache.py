@@ -0,0 +1,129 @@
+"""
+이미지 내용 기반 결과 캐시
+- 키: 이미지 바이트의 SHA-256 + 모델/알고리즘 이름
+- 프로세스 내 LRU (개수/TTL 제한)
+- RESULT_CACHE_REDIS_URL이 있으면 Redis를 공유 백엔드로 함께 사용 (uvicorn 워커 간 공유)
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def image_digest(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, name: str, max_entries: int, ttl_seconds: int, redis_url: str = ""):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        # 네임스페이스(모델/알고리즘)별 적중 통계
+        self.hits: Counter = Counter()
+        self.shared_hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._redis = None
+
+    def _key(self, namespace: str, digest: str) -> str:
+        return f"{self.name}:{namespace}:{digest}"
+
+    def _get_redis(self):
+        if self._redis is None and self.redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(self.redis_url)
+        return self._redis
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, namespace: str, digest: str) -> Optional[Any]:
+        """캐시 조회 (로컬 → 공유 백엔드 순)"""
+        key = self._key(namespace, digest)
+        value = self._get_local(key)
+        if value is not None:
+            self.hits[namespace] += 1
+            return value
+
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(key)
+            except Exception as e:
+                logger.warning(f"Result cache backend error: {e}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._set_local(key, value)
+                self.hits[namespace] += 1
+                self.shared_hits[namespace] += 1
+                return value
+
+        self.misses[namespace] += 1
+        return None
+
+    async def set(self, namespace: str, digest: str, value: Any) -> None:
+        """캐시 저장 (값은 JSON 직렬화 가능해야 함)"""
+        key = self._key(namespace, digest)
+        self._set_local(key, value)
+
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                await redis.set(key, json.dumps(value), ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Result cache backend error: {e}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        namespaces = {}
+        for namespace in sorted(set(self.hits) | set(self.misses)):
+            hits = self.hits[namespace]
+            lookups = hits + self.misses[namespace]
+            namespaces[namespace] = {
+                "hits": hits,
+                "shared_hits": self.shared_hits[namespace],
+                "misses": self.misses[namespace],
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "shared_backend": bool(self.redis_url),
+            "namespaces": namespaces,
+        }
+
+
+# 싱글톤 인스턴스 (분류 결과, 이미지 해시 공용)
+result_cache = ResultCache(
+    "results",
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+    redis_url=settings.RESULT_CACHE_REDIS_URL,
+)
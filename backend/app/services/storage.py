@@ -1,16 +1,100 @@
-"""Supabase Storage 연동"""
-import uuid
-from datetime import datetime
+"""
+이미지 저장소
+- STORAGE_BACKEND로 백엔드 선택
+  - supabase: Supabase Storage REST API
+  - local: 로컬 파일시스템 (/api/media로 서빙, 오프라인 부하 테스트/자체 호스팅용)
+- 키는 이미지 바이트의 SHA-256 (같은 사진은 한 번만 저장, 이미 있으면 업로드 생략)
+- 여러 기록이 같은 파일을 가리킬 수 있으므로 삭제는 참조하는 기록이 없을 때만
+  - 참조 수는 stored_objects에 기록 변경과 같은 트랜잭션으로 유지 (URL 컬럼을 COUNT하지 않음)
+  - 업로드 직후에는 보호 시간을 두어, 같은 내용을 올리고 아직 커밋하지 않은 요청의 파일을 지우지 않음
+  - 보상 삭제에서 남겨 둔 파일은 주기적인 정리 작업이 보호 시간 뒤에 삭제
+- 클라이언트 직접 업로드용 서명 URL 발급 + 올라온 파일 읽기
+"""
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import logging
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import AsyncIterator, BinaryIO, Optional, Union
+from urllib.parse import urlencode
 import httpx
 from fastapi import HTTPException, status
+from sqlalchemy import case, delete, event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.config import settings
+from app.database import SessionLocal
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.stored_object import StoredObject
+from app.services.http_client import HttpClientPool, http_client
+from app.services.result_cache import image_digest
+from app.services.upload_reader import upload_too_large_error
 
+logger = logging.getLogger(__name__)
 
-class StorageService:
-    def __init__(self):
-        self.supabase_url = settings.SUPABASE_URL
-        self.supabase_key = settings.SUPABASE_SERVICE_KEY
-        self.bucket_name = "images"
+MEDIA_URL_PATH = "/api/media"
+EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+
+
+class StorageBackend(ABC):
+    """저장소 백엔드 인터페이스 (file_path는 버킷/루트 기준 상대 경로)"""
+
+    @abstractmethod
+    async def put(self, file_path: str, data: bytes, content_type: str) -> None:
+        ...
+
+    @abstractmethod
+    async def exists(self, file_path: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete(self, file_path: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def get(self, file_path: str, max_bytes: int) -> Optional[bytes]:
+        """파일 내용 (없으면 None, max_bytes를 넘으면 413)"""
+
+    @abstractmethod
+    async def create_signed_upload_url(self, file_path: str, expires_in: int) -> str:
+        """클라이언트가 PUT으로 직접 올릴 수 있는 서명 URL"""
+
+    @abstractmethod
+    def public_url(self, file_path: str) -> str:
+        ...
+
+    def path_from_url(self, public_url: str) -> Optional[str]:
+        """공개 URL → 파일 경로 (이 백엔드의 URL이 아니면 None)"""
+        prefix = self.public_url("")
+        if not public_url.startswith(prefix):
+            return None
+        return public_url[len(prefix):]
+
+
+class SupabaseStorageBackend(StorageBackend):
+    def __init__(
+        self,
+        http: HttpClientPool = http_client,
+        supabase_url: str = settings.SUPABASE_URL,
+        service_key: str = settings.SUPABASE_SERVICE_KEY,
+        bucket_name: str = "images",
+    ):
+        self.http = http
+        self.supabase_url = supabase_url
+        self.supabase_key = service_key
+        self.bucket_name = bucket_name
 
     def _get_headers(self) -> dict:
         return {
@@ -18,67 +102,473 @@ class StorageService:
             "apikey": self.supabase_key,
         }
 
+    async def put(self, file_path: str, data: bytes, content_type: str) -> None:
+        # 개발 모드에서는 실제 업로드를 생략 (URL만 반환)
+        if settings.DEBUG:
+            return
+
+        url = f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/{file_path}"
+
+        try:
+            response = await self.http.client.post(
+                url,
+                headers={
+                    **self._get_headers(),
+                    "Content-Type": content_type,
+                },
+                content=data,
+                timeout=10.0,
+            )
+        except httpx.TimeoutException:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="이미지 업로드 타임아웃"
+            )
+
+        # 409: 같은 키가 먼저 올라간 경우 (내용이 같으므로 성공으로 처리)
+        if response.status_code not in [200, 201, 409]:
+            raise Exception(f"Upload failed: {response.text}")
+
+    async def exists(self, file_path: str) -> bool:
+        if settings.DEBUG:
+            return False
+
+        response = await self.http.client.head(self.public_url(file_path))
+        return response.status_code == 200
+
+    async def delete(self, file_path: str) -> bool:
+        if settings.DEBUG:
+            return True
+
+        url = f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/{file_path}"
+
+        response = await self.http.client.delete(
+            url,
+            headers=self._get_headers()
+        )
+        return response.status_code == 200
+
+    async def get(self, file_path: str, max_bytes: int) -> Optional[bytes]:
+        url = f"{self.supabase_url}/storage/v1/object/authenticated/{self.bucket_name}/{file_path}"
+        async with self.http.client.stream("GET", url, headers=self._get_headers()) as response:
+            if response.status_code in (400, 404):
+                return None
+            if response.status_code != 200:
+                raise Exception(f"Download failed: {response.status_code}")
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise upload_too_large_error()
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def create_signed_upload_url(self, file_path: str, expires_in: int) -> str:
+        # Supabase 서명 업로드 URL은 자체 만료(2시간)를 가지므로 짧은 유효 시간은 업로드 토큰으로 제한
+        url = f"{self.supabase_url}/storage/v1/object/upload/sign/{self.bucket_name}/{file_path}"
+        response = await self.http.client.post(url, headers=self._get_headers())
+        if response.status_code != 200:
+            raise Exception(f"Signing upload URL failed: {response.text}")
+        return f"{self.supabase_url}/storage/v1{response.json()['url']}"
+
+    def public_url(self, file_path: str) -> str:
+        return f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/{file_path}"
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: str, base_url: str = ""):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def resolve(self, file_path: str) -> Optional[str]:
+        """상대 경로 → 디스크 경로 (루트 밖을 가리키면 None)"""
+        path = os.path.abspath(os.path.join(self.root, file_path))
+        if os.path.commonpath([self.root, path]) != self.root:
+            return None
+        return path
+
+    @staticmethod
+    def _create_temp(path: str) -> tuple[BinaryIO, str]:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # 같은 키를 동시에 올려도 서로의 임시 파일을 건드리지 않도록 요청마다 다른 이름
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".tmp")
+        return os.fdopen(fd, "wb"), tmp_path
+
+    @staticmethod
+    def _finish_temp(f: BinaryIO, tmp_path: str, path: str) -> None:
+        f.close()
+        os.chmod(tmp_path, 0o644)
+        # 읽는 쪽이 쓰다 만 파일을 보지 않도록 rename으로 교체
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _discard_temp(f: BinaryIO, tmp_path: str) -> None:
+        f.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+
+    def _write(self, path: str, data: bytes) -> None:
+        f, tmp_path = self._create_temp(path)
+        try:
+            f.write(data)
+            self._finish_temp(f, tmp_path, path)
+        except BaseException:
+            self._discard_temp(f, tmp_path)
+            raise
+
+    async def write_stream(self, path: str, chunks: AsyncIterator[bytes]) -> None:
+        """
+        청크 단위로 받은 본문 저장 (서명 URL 업로드)
+        - _write와 같은 고유 임시 파일 → 교체, 디스크 작업은 스레드에서
+        - chunks에서 예외가 나면 (크기 초과 등) 임시 파일을 지우고 그대로 던짐
+        """
+        f, tmp_path = await asyncio.to_thread(self._create_temp, path)
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+            await asyncio.to_thread(self._finish_temp, f, tmp_path, path)
+        except BaseException:
+            await asyncio.to_thread(self._discard_temp, f, tmp_path)
+            raise
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _read(self, path: str, max_bytes: int) -> Optional[bytes]:
+        try:
+            if os.path.getsize(path) > max_bytes:
+                raise upload_too_large_error()
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def sign_upload(self, file_path: str, expires: int) -> str:
+        message = f"{file_path}:{expires}".encode()
+        return hmac.new(settings.JWT_SECRET.encode(), message, hashlib.sha256).hexdigest()
+
+    def verify_upload_signature(self, file_path: str, expires: int, signature: str) -> bool:
+        """서명 업로드 URL 검증 (만료 또는 위조면 False)"""
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self.sign_upload(file_path, expires), signature)
+
+    async def put(self, file_path: str, data: bytes, content_type: str) -> None:
+        path = self.resolve(file_path)
+        if path is None:
+            raise ValueError(f"Invalid storage path: {file_path}")
+        await asyncio.to_thread(self._write, path, data)
+
+    async def exists(self, file_path: str) -> bool:
+        path = self.resolve(file_path)
+        return path is not None and await asyncio.to_thread(os.path.isfile, path)
+
+    async def delete(self, file_path: str) -> bool:
+        path = self.resolve(file_path)
+        if path is None:
+            return False
+        return await asyncio.to_thread(self._remove, path)
+
+    async def get(self, file_path: str, max_bytes: int) -> Optional[bytes]:
+        path = self.resolve(file_path)
+        if path is None:
+            return None
+        return await asyncio.to_thread(self._read, path, max_bytes)
+
+    async def create_signed_upload_url(self, file_path: str, expires_in: int) -> str:
+        expires = int(time.time()) + expires_in
+        query = urlencode({"expires": expires, "signature": self.sign_upload(file_path, expires)})
+        return f"{self.base_url}{MEDIA_URL_PATH}/upload/{file_path}?{query}"
+
+    def public_url(self, file_path: str) -> str:
+        return f"{self.base_url}{MEDIA_URL_PATH}/{file_path}"
+
+
+def create_storage_backend(name: Optional[str] = None) -> StorageBackend:
+    """설정값으로 백엔드 생성"""
+    name = name or settings.STORAGE_BACKEND
+    if name == "supabase":
+        return SupabaseStorageBackend()
+    if name == "local":
+        return LocalStorageBackend(settings.LOCAL_STORAGE_DIR, settings.MEDIA_BASE_URL)
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+# 목격/수거 기록에서 저장소 파일을 가리키는 컬럼 (참조 수 집계 대상)
+URL_COLUMNS = {
+    "sightings": ("photo_url", "thumbnail_url"),
+    "cleanups": ("before_photo_url", "after_photo_url", "before_thumbnail_url", "after_thumbnail_url"),
+}
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+SWEEP_BATCH_SIZE = 100
+
+
+class StorageService:
+    def __init__(self, backend: Optional[StorageBackend] = None, session_factory=SessionLocal):
+        self.backend = backend or create_storage_backend()
+        self.session_factory = session_factory
+
     async def upload_image(
         self,
         image_bytes: bytes,
         folder: str = "sightings",
-        content_type: str = "image/jpeg"
+        content_type: str = "image/jpeg",
+        digest: Optional[str] = None,
+        protected: bool = False,
     ) -> str:
         """
-        이미지를 Supabase Storage에 업로드
+        이미지 업로드
+        - digest: 이미 계산한 SHA-256 hex (없으면 계산)
+        - protected: 호출한 쪽이 object_path 경로에 보호 시간을 이미 커밋했으면 True
         Returns: 공개 URL
         """
-        # 개발 모드에서는 실제 업로드를 생략하고 더미 URL 반환
-        if settings.DEBUG:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"{folder}/{timestamp}_{uuid.uuid4().hex[:8]}.jpg"
-            return f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/{filename}"
+        if digest is None:
+            digest = await asyncio.to_thread(image_digest, image_bytes)
+        filename = self.object_path(folder, content_type, digest)
 
-        # 고유 파일명 생성
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"{folder}/{timestamp}_{uuid.uuid4().hex[:8]}.jpg"
+        # 이 요청이 기록을 커밋하기 전에 다른 요청의 보상 삭제로 지워지지 않도록 먼저 보호 시간을 커밋
+        if not protected:
+            await self.protect(filename, settings.STORAGE_DELETE_GRACE_SECONDS)
+        # 재시도 등으로 이미 올라간 내용이면 다시 보내지 않음
+        if not await self.backend.exists(filename):
+            await self.backend.put(filename, image_bytes, content_type)
+        return self.backend.public_url(filename)
 
-        url = f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/{filename}"
+    @staticmethod
+    def object_path(folder: str, content_type: str, digest: str) -> str:
+        """내용 해시 기준 저장 경로 (같은 내용은 같은 경로)"""
+        return f"{folder}/{digest}.{EXTENSIONS.get(content_type, 'jpg')}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    url,
-                    headers={
-                        **self._get_headers(),
-                        "Content-Type": content_type,
-                    },
-                    content=image_bytes,
-                    timeout=10.0,
-                )
-            except httpx.TimeoutException:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="이미지 업로드 타임아웃"
-                )
-
-            if response.status_code in [200, 201]:
-                # 공개 URL 반환
-                public_url = f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/{filename}"
-                return public_url
-            else:
-                raise Exception(f"Upload failed: {response.text}")
-
-    async def delete_image(self, file_path: str) -> bool:
-        """이미지 삭제"""
-        url = f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/{file_path}"
+    def _upsert(self, dialect: str, path: str, ref_delta: int, protected_until: datetime):
+        insert = UPSERT_INSERTS[dialect]
+        table = StoredObject.__table__
+        stmt = insert(StoredObject).values(path=path, ref_count=ref_delta, protected_until=protected_until)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.path],
+            set_={
+                "ref_count": table.c.ref_count + stmt.excluded.ref_count,
+                # 보호 시간은 늘리기만 함
+                "protected_until": case(
+                    (table.c.protected_until < stmt.excluded.protected_until, stmt.excluded.protected_until),
+                    else_=table.c.protected_until,
+                ),
+            },
+        )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                url,
-                headers=self._get_headers()
+    def _protect_in_new_session(self, file_paths: list[str], protected_until: datetime) -> None:
+        with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            for path in file_paths:
+                session.execute(self._upsert(dialect, path, 0, protected_until))
+            session.commit()
+
+    async def protect(
+        self, file_paths: Union[str, list[str]], seconds: int, db: Optional[AsyncSession] = None
+    ) -> None:
+        """
+        지금부터 seconds 동안은 참조가 없어도 지우지 않음 (바로 커밋)
+        - db: 아직 쓴 내용이 없는 요청 세션 (그 세션에서 커밋, 없으면 동기 풀의 별도 세션)
+        """
+        file_paths = sorted({file_paths} if isinstance(file_paths, str) else set(file_paths))
+        protected_until = datetime.utcnow() + timedelta(seconds=seconds)
+        if db is None:
+            await asyncio.to_thread(self._protect_in_new_session, file_paths, protected_until)
+            return
+        dialect = db.bind.dialect.name
+        for path in file_paths:
+            await db.execute(self._upsert(dialect, path, 0, protected_until))
+        await db.commit()
+
+    def _release_in_new_session(self, file_paths: list[str]) -> None:
+        with self.session_factory() as session:
+            session.execute(
+                delete(StoredObject).where(StoredObject.path.in_(file_paths), StoredObject.ref_count <= 0)
+            )
+            session.commit()
+
+    async def release(self, file_paths: list[str]) -> None:
+        """직접 지운 파일들의 보호 행 삭제 (참조가 있으면 남김, 트랜잭션 한 번)"""
+        if file_paths:
+            await asyncio.to_thread(self._release_in_new_session, file_paths)
+
+    def reference_count(self, db: Session, file_path: str) -> int:
+        """이 파일을 사진/썸네일로 쓰는 목격/수거 기록 수 (커밋된 것 기준)"""
+        return db.scalar(select(StoredObject.ref_count).where(StoredObject.path == file_path)) or 0
+
+    def claim_delete(self, db: Session, file_path: str) -> bool:
+        """
+        참조가 없고 보호 시간이 지났으면 참조 행을 지우고 True (파일 삭제 권한)
+        - 조건부 DELETE 한 번이라 같은 순간 참조를 추가하는 트랜잭션과 겹쳐도 한쪽만 이김
+        - 행이 없는 파일은 참조 여부를 모르므로 지우지 않음
+        """
+        result = db.execute(
+            delete(StoredObject).where(
+                StoredObject.path == file_path,
+                StoredObject.ref_count <= 0,
+                StoredObject.protected_until <= datetime.utcnow(),
             )
-            return response.status_code == 200
+        )
+        return bool(result.rowcount)
+
+    def _claim_delete_in_new_session(self, file_path: str) -> bool:
+        with self.session_factory() as session:
+            claimed = self.claim_delete(session, file_path)
+            session.commit()
+            return claimed
+
+    async def delete_image(self, file_path: str, db: Optional[Session] = None) -> bool:
+        """
+        이미지 삭제
+        - 다른 기록이 아직 참조하거나 업로드 직후(보호 시간 안)면 지우지 않음 (False, 나중에 정리 작업이 처리)
+        - db를 넘기면 참조 행 삭제는 호출한 쪽이 커밋
+        """
+        if db is None:
+            # 비동기 라우터에서 호출되므로 동기 조회는 스레드에서 (이벤트 루프를 막지 않음)
+            claimed = await asyncio.to_thread(self._claim_delete_in_new_session, file_path)
+        else:
+            claimed = self.claim_delete(db, file_path)
+        if not claimed:
+            logger.info(f"Keeping {file_path}: still referenced or recently uploaded")
+            return False
+        return await self.backend.delete(file_path)
+
+    async def discard_uploads(self, public_urls: list[str], db: Optional[Session] = None) -> None:
+        """
+        요청 실패 시 이미 올린 이미지 정리 (보상 삭제)
+        - 같은 내용을 쓰는 다른 기록이 있거나 보호 시간 안이면 남겨 둠 (정리 작업이 나중에 삭제)
+        - 실패는 기록만 하고 원래 에러를 가리지 않도록 예외를 던지지 않음
+        """
+        file_paths = [path for path in map(self.path_from_url, public_urls) if path]
+        results = await asyncio.gather(
+            *(self.delete_image(path, db) for path in file_paths),
+            return_exceptions=True,
+        )
+        for path, result in zip(file_paths, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to discard orphaned upload {path}: {result}")
+
+    def _unreferenced_paths(self, limit: int) -> list[str]:
+        with self.session_factory() as session:
+            return session.scalars(
+                select(StoredObject.path)
+                .where(StoredObject.ref_count <= 0, StoredObject.protected_until <= datetime.utcnow())
+                .order_by(StoredObject.protected_until)
+                .limit(limit)
+            ).all()
+
+    async def sweep(self, limit: int = SWEEP_BATCH_SIZE) -> int:
+        """참조 없이 보호 시간이 지난 파일 삭제, 지운 파일 수 반환"""
+        paths = await asyncio.to_thread(self._unreferenced_paths, limit)
+        deleted = 0
+        for path in paths:
+            try:
+                if await self.delete_image(path):
+                    deleted += 1
+            except Exception as e:
+                logger.warning(f"Failed to sweep unreferenced upload {path}: {e}")
+        return deleted
+
+    async def run_sweeper(self) -> None:
+        """정리 작업 루프 (lifespan에서 시작, 종료 시 취소)"""
+        while True:
+            try:
+                while await self.sweep() == SWEEP_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                logger.error(f"Storage sweep error: {e}")
+            await asyncio.sleep(settings.STORAGE_SWEEP_INTERVAL_SECONDS)
+
+    def rebuild_references(self, db: Session) -> int:
+        """목격/수거 기록으로 참조 수를 다시 계산"""
+        counts: Counter = Counter()
+        for model in (Sighting, Cleanup):
+            columns = [getattr(model, column) for column in URL_COLUMNS[model.__tablename__]]
+            for row in db.execute(select(*columns)):
+                for url in row:
+                    path = self.path_from_url(url) if url else None
+                    if path:
+                        counts[path] += 1
+        db.query(StoredObject).delete()
+        now = datetime.utcnow()
+        if counts:
+            db.execute(StoredObject.__table__.insert(), [
+                {"path": path, "ref_count": count, "protected_until": now} for path, count in counts.items()
+            ])
+        db.commit()
+        return len(counts)
+
+    def initialize_references(self, db: Session) -> int:
+        """참조 행이 하나도 없는데 기록이 있으면 채움 (마이그레이션 직후, create_all로 만든 DB)"""
+        if db.query(StoredObject).first() is not None:
+            return 0
+        if db.query(Sighting).first() is None and db.query(Cleanup).first() is None:
+            return 0
+        return self.rebuild_references(db)
+
+    def track_flush(self, session: Session) -> None:
+        """flush될 기록 변경으로 참조 수 갱신 (기록과 같은 트랜잭션)"""
+        deltas: Counter = Counter()
+
+        def add(url: Optional[str], delta: int) -> None:
+            path = self.path_from_url(url) if url else None
+            if path:
+                deltas[path] += delta
+
+        for obj in session.new:
+            for column in URL_COLUMNS.get(getattr(obj, "__tablename__", None), ()):
+                add(getattr(obj, column), 1)
+        for obj in session.deleted:
+            for column in URL_COLUMNS.get(getattr(obj, "__tablename__", None), ()):
+                add(getattr(obj, column), -1)
+        for obj in session.dirty:
+            for column in URL_COLUMNS.get(getattr(obj, "__tablename__", None), ()):
+                history = inspect(obj).attrs[column].history
+                if history.added or history.deleted:
+                    for url in history.added:
+                        add(url, 1)
+                    for url in history.deleted:
+                        add(url, -1)
+
+        now = datetime.utcnow()
+        dialect = session.get_bind().dialect.name
+        # 같은 행을 건드리는 트랜잭션끼리 잠금 순서를 맞춤
+        for path, delta in sorted(deltas.items()):
+            if delta:
+                session.execute(self._upsert(dialect, path, delta, now))
+
+    def path_from_url(self, public_url: str) -> Optional[str]:
+        """공개 URL → 저장소 내 파일 경로 (이 저장소의 URL이 아니면 None)"""
+        return self.backend.path_from_url(public_url)
 
     def get_public_url(self, file_path: str) -> str:
         """파일의 공개 URL 반환"""
-        return f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/{file_path}"
+        return self.backend.public_url(file_path)
 
 
 # 싱글톤 인스턴스
 storage_service = StorageService()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_references(session: Session, flush_context, instances) -> None:
+    storage_service.track_flush(session)
+
+
+def _keep_previous_value(target, value, oldvalue, initiator) -> None:
+    """active_history를 켜기 위한 리스너 (하는 일 없음)"""
+
+
+# 커밋 후 만료된 기록의 URL을 바꿔도 이전 URL의 참조를 뺄 수 있도록 기존 값을 읽어 둠
+for _model in (Sighting, Cleanup):
+    for _column in URL_COLUMNS[_model.__tablename__]:
+        event.listen(getattr(_model, _column), "set", _keep_previous_value, active_history=True)
@@ -3,9 +3,21 @@
 - 쓰레기 종류 자동 분류
 - Before/After 변화 감지
 """
-from PIL import Image
-import io
+import asyncio
 import logging
+import threading
+import time
+from typing import Optional
+
+from PIL import Image
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services.image_loader import load_image, VIT_INPUT_SIZE
+from app.services.image_worker import image_worker
+from app.services.inference_backend import build_pipeline
+from app.services.inference_batcher import InferenceBatcher
+from app.services.result_cache import image_digest, result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -30,89 +42,177 @@ TRASH_KEYWORDS = {
 class TrashClassifier:
     def __init__(self):
         self.classifier = None
+        self.model_name = "google/vit-base-patch16-224"
+        self.load_failed_at: Optional[float] = None
+        self._load_lock = threading.Lock()
+        self.batcher = InferenceBatcher(
+            "trash",
+            self._predict_batch,
+            max_batch_size=settings.AI_BATCH_MAX_SIZE,
+            max_wait_ms=settings.AI_BATCH_MAX_WAIT_MS,
+        )
 
     def _load_model(self):
-        """모델 지연 로딩"""
-        if self.classifier is None:
+        """
+        모델 지연 로딩
+        - 실패하면 AI_MODEL_RETRY_BACKOFF_SECONDS 동안 재시도하지 않음
+        """
+        if self.classifier is not None:
+            return
+        with self._load_lock:
+            if self.classifier is not None:
+                return
+            if (
+                self.load_failed_at is not None
+                and time.monotonic() - self.load_failed_at < settings.AI_MODEL_RETRY_BACKOFF_SECONDS
+            ):
+                return
             try:
-                from transformers import pipeline
-                self.classifier = pipeline(
-                    "image-classification",
-                    model="google/vit-base-patch16-224"
-                )
+                self.classifier = build_pipeline(self.model_name)
+                self.load_failed_at = None
             except Exception as e:
-                logger.warning(f"Failed to load HuggingFace model: {e}")
-                self.classifier = None
-
-    async def classify_trash(self, image_bytes: bytes) -> dict:
-        """쓰레기 종류 분류"""
+                logger.warning(f"Failed to load HuggingFace model ({settings.AI_INFERENCE_BACKEND}): {e}")
+                self.load_failed_at = time.monotonic()
+
+    @property
+    def status(self) -> str:
+        """모델 상태: ready, loading, failed, not_loaded"""
+        if self.classifier is not None:
+            return "ready"
+        if self._load_lock.locked():
+            return "loading"
+        if self.load_failed_at is not None:
+            return "failed"
+        return "not_loaded"
+
+    @property
+    def cache_namespace(self) -> str:
+        """결과 캐시 네임스페이스 (모델/백엔드가 바뀌면 이전 결과를 쓰지 않음)"""
+        return f"trash:{self.model_name}:{settings.AI_INFERENCE_BACKEND}"
+
+    def warmup(self) -> bool:
+        """모델 로드 후 더미 이미지로 forward 1회 (첫 요청 지연 제거)"""
         self._load_model()
-
         if self.classifier is None:
-            return {
-                "trash_type": "other",
-                "confidence": 0.0,
-                "has_trash": True
-            }
-
-        try:
-            image = Image.open(io.BytesIO(image_bytes))
-            if image.mode != "RGB":
-                image = image.convert("RGB")
-
-            results = self.classifier(image)
-
-            # 결과에서 쓰레기 관련 라벨 찾기
-            for result in results:
-                label = result["label"].lower().replace(" ", "_")
-                score = result["score"]
-
-                for trash_type, keywords in TRASH_KEYWORDS.items():
-                    if any(kw in label for kw in keywords):
-                        return {
-                            "trash_type": trash_type,
-                            "confidence": round(score, 2),
-                            "has_trash": True
-                        }
-
-            # 쓰레기로 인식되지 않은 경우
-            # 해변/자연 관련 라벨이면 쓰레기 없음으로 판단
-            nature_keywords = ["beach", "seashore", "coast", "sand", "ocean", "sea"]
-            for result in results:
-                label = result["label"].lower()
-                if any(kw in label for kw in nature_keywords):
+            return False
+        self._predict_batch([Image.new("RGB", (VIT_INPUT_SIZE, VIT_INPUT_SIZE))])
+        return True
+
+    def _predict_batch(self, images: list) -> list:
+        """디코딩된 이미지 배치 → 이미지별 top-5 결과 (배처 워커 스레드에서 실행)"""
+        return self.classifier(images, batch_size=len(images))
+
+    def _interpret(self, results: list) -> dict:
+        """모델 top-k 결과 → 쓰레기 분류 결과"""
+        # 결과에서 쓰레기 관련 라벨 찾기
+        for result in results:
+            label = result["label"].lower().replace(" ", "_")
+            score = result["score"]
+
+            for trash_type, keywords in TRASH_KEYWORDS.items():
+                if any(kw in label for kw in keywords):
                     return {
-                        "trash_type": "other",
-                        "confidence": round(result["score"], 2),
-                        "has_trash": False
+                        "trash_type": trash_type,
+                        "confidence": round(score, 2),
+                        "has_trash": True
                     }
 
-            return {
-                "trash_type": "other",
-                "confidence": results[0]["score"] if results else 0.0,
-                "has_trash": True
-            }
+        # 쓰레기로 인식되지 않은 경우
+        # 해변/자연 관련 라벨이면 쓰레기 없음으로 판단
+        nature_keywords = ["beach", "seashore", "coast", "sand", "ocean", "sea"]
+        for result in results:
+            label = result["label"].lower()
+            if any(kw in label for kw in nature_keywords):
+                return {
+                    "trash_type": "other",
+                    "confidence": round(result["score"], 2),
+                    "has_trash": False
+                }
+
+        return {
+            "trash_type": "other",
+            "confidence": results[0]["score"] if results else 0.0,
+            "has_trash": True
+        }
+
+    async def classify_trash(self, image_bytes: bytes, digest: Optional[str] = None) -> dict:
+        """쓰레기 종류 분류"""
+        digests = [digest] if digest else None
+        return (await self.classify_trash_many([image_bytes], digests))[0]
+
+    async def classify_trash_many(
+        self, images_bytes: list[bytes], digests: Optional[list[str]] = None
+    ) -> list[dict]:
+        """
+        여러 장 쓰레기 분류
+        - 캐시에 있는 이미지는 재사용 (/classify/trash에서 이미 분류한 사진 등)
+        - 나머지는 동시에 디코딩한 뒤 한 번의 forward로 처리
+        - digests: 업로드를 읽으며 계산한 SHA-256 (없으면 계산)
+        """
+        if self.classifier is None:
+            await asyncio.to_thread(self._load_model)
+
+        if self.classifier is None:
+            return [self._fallback_result() for _ in images_bytes]
+
+        cache_namespace = self.cache_namespace
+        digests = digests or [image_digest(image_bytes) for image_bytes in images_bytes]
+        results: dict[str, dict] = {}
+        missing: dict[str, bytes] = {}
+        for digest, image_bytes in zip(digests, images_bytes):
+            if digest in results or digest in missing:
+                continue
+            cached = await result_cache.get(cache_namespace, digest)
+            if cached is not None:
+                results[digest] = cached
+            else:
+                missing[digest] = image_bytes
+
+        if missing:
+            try:
+                # 디코딩은 이미지 작업 풀로 (대기 작업이 많으면 503 + Retry-After)
+                images = await asyncio.gather(*(
+                    image_worker.run(load_image, image_bytes, VIT_INPUT_SIZE)
+                    for image_bytes in missing.values()
+                ))
+                raw_results = await self.batcher.submit_many(list(images))
+                for digest, raw in zip(missing, raw_results):
+                    result = self._interpret(raw)
+                    # 모델 출력에서 나온 결과만 캐시 (예외 fallback은 다음 요청에서 재시도)
+                    await result_cache.set(cache_namespace, digest, result)
+                    results[digest] = result
+
+            except HTTPException:
+                # 이미지 작업 풀 과부하는 fallback 대신 그대로 알림
+                raise
+            except Exception as e:
+                logger.error(f"Trash classification error: {e}")
+                for digest in missing:
+                    results[digest] = self._fallback_result()
 
-        except Exception as e:
-            logger.error(f"Trash classification error: {e}")
-            return {
-                "trash_type": "other",
-                "confidence": 0.0,
-                "has_trash": True
-            }
+        return [results[digest] for digest in digests]
+
+    def _fallback_result(self) -> dict:
+        return {
+            "trash_type": "other",
+            "confidence": 0.0,
+            "has_trash": True
+        }
 
     async def verify_cleanup(
         self,
         before_bytes: bytes,
-        after_bytes: bytes
+        after_bytes: bytes,
+        digests: Optional[list[str]] = None,
     ) -> dict:
         """
         Before/After 비교 검증
         - 둘 다 같은 장소인지
         - 실제로 청소가 되었는지
         """
-        before_result = await self.classify_trash(before_bytes)
-        after_result = await self.classify_trash(after_bytes)
+        before_result, after_result = await self.classify_trash_many(
+            [before_bytes, after_bytes], digests
+        )
 
         is_valid = (
             before_result["has_trash"] is True and
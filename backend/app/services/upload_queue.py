@@ -0,0 +1,265 @@
+"""
+지연 업로드 큐 (UPLOAD_MODE=deferred)
+- 요청은 이미지를 로컬 스풀 파일에 쓰고, 기록과 upload_jobs 행을 함께 커밋한 뒤 바로 응답
+- 백그라운드 워커가 Storage로 업로드하고 URL을 채움 (실패 시 지수 백오프로 재시도)
+- 작업은 DB, 이미지는 디스크에 남으므로 워커가 재시작돼도 이어서 처리
+- 여러 uvicorn 워커가 같은 큐를 돌리므로 locked_until 임대로 한 워커만 작업을 가져감
+- 워커는 이벤트 루프에서 돌므로 동기 DB 작업은 모두 asyncio.to_thread로 실행
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import exists, or_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.upload_job import UploadJob
+from app.services.image_pipeline import ImageVariant
+from app.services.storage import StorageService, storage_service
+
+logger = logging.getLogger(__name__)
+
+TARGET_MODELS = {
+    "sighting": Sighting,
+    "cleanup": Cleanup,
+}
+# 워커 한 번의 처리에서 다룰 최대 작업 수 (임대는 작업마다 따로)
+CLAIM_BATCH_SIZE = 10
+# 업로드 타임아웃(10초)보다 충분히 길게 잡아 처리 중인 작업을 다른 워커가 가져가지 않게 함
+JOB_LEASE = timedelta(seconds=60)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class UploadQueue:
+    def __init__(
+        self,
+        spool_dir: str,
+        storage: StorageService = storage_service,
+        session_factory=SessionLocal,
+    ):
+        self.spool_dir = spool_dir
+        self.storage = storage
+        self.session_factory = session_factory
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def spool(self, image_bytes: bytes) -> str:
+        """이미지를 스풀 디렉터리에 저장 (fsync 후 rename으로 온전한 파일만 남김)"""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        path = os.path.join(self.spool_dir, f"{uuid.uuid4().hex}.img")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(image_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    def spool_variants(self, variants: list[ImageVariant]) -> list[str]:
+        """본 이미지/썸네일을 각각 스풀 (중간에 실패하면 먼저 쓴 파일 정리)"""
+        paths = []
+        try:
+            for variant in variants:
+                paths.append(self.spool(variant.data))
+        except Exception:
+            self.discard_spool(paths)
+            raise
+        return paths
+
+    def discard_spool(self, paths: list[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def enqueue(
+        self,
+        db: Session,
+        target_type: str,
+        target_id: uuid.UUID,
+        target_field: str,
+        folder: str,
+        spool_path: str,
+        content_type: str = "image/jpeg",
+    ) -> UploadJob:
+        """업로드 작업 추가 (기록과 같은 트랜잭션에서 커밋되도록 커밋하지 않음)"""
+        job = UploadJob(
+            target_type=target_type,
+            target_id=target_id,
+            target_field=target_field,
+            folder=folder,
+            spool_path=spool_path,
+            content_type=content_type,
+        )
+        db.add(job)
+        return job
+
+    def enqueue_variants(
+        self,
+        db: Session,
+        target_type: str,
+        target_id: uuid.UUID,
+        variants: list[ImageVariant],
+        spool_paths: list[str],
+    ) -> list[UploadJob]:
+        """스풀한 파일마다 업로드 작업 추가"""
+        return [
+            self.enqueue(
+                db, target_type, target_id, variant.field, variant.folder, path, variant.content_type
+            )
+            for variant, path in zip(variants, spool_paths)
+        ]
+
+    def notify(self) -> None:
+        """새 작업이 커밋됐음을 워커에 알림 (폴링 주기를 기다리지 않음)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def retry_delay(self, attempts: int) -> float:
+        """재시도 대기 시간 (초): base * 2^(n-1), 최대 UPLOAD_RETRY_MAX_SECONDS"""
+        return min(
+            settings.UPLOAD_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+            settings.UPLOAD_RETRY_MAX_SECONDS,
+        )
+
+    def _claim(self, db: Session, now: datetime) -> Optional[UploadJob]:
+        """실행할 때가 된 작업 하나를 임대해서 가져옴"""
+        available = or_(UploadJob.locked_until.is_(None), UploadJob.locked_until < now)
+        candidate_ids = [
+            job_id for (job_id,) in db.query(UploadJob.id)
+            .filter(UploadJob.status == "pending", UploadJob.next_attempt_at <= now, available)
+            .order_by(UploadJob.next_attempt_at)
+            .limit(CLAIM_BATCH_SIZE)
+            .all()
+        ]
+
+        for job_id in candidate_ids:
+            # 조건부 UPDATE로 다른 워커와 경쟁 (먼저 갱신한 쪽만 rowcount 1, 지면 다음 후보)
+            result = db.execute(
+                update(UploadJob)
+                .where(UploadJob.id == job_id, available)
+                .values(locked_until=now + JOB_LEASE)
+            )
+            if result.rowcount == 1:
+                db.commit()
+                return db.get(UploadJob, job_id)
+        db.commit()
+        return None
+
+    def _claim_in_new_session(self, now: datetime) -> Optional[UploadJob]:
+        with self.session_factory() as db:
+            job = self._claim(db, now)
+            # 세션을 닫은 뒤에도 읽을 수 있도록 분리 (이후 갱신은 작업마다 새 세션에서)
+            db.expunge_all()
+            return job
+
+    async def process_due(self, now: Optional[datetime] = None) -> int:
+        """
+        실행할 때가 된 작업 처리 (한 번에 최대 CLAIM_BATCH_SIZE개), 처리한 작업 수 반환
+        - 작업은 처리 직전에 하나씩 임대: 여러 개를 한꺼번에 임대하면 앞 작업을 올리는 동안
+          뒤 작업의 임대가 만료돼 다른 워커가 다시 가져가 중복 업로드됨
+        - 임대 시각은 now에 경과 시간을 더해 계산 (재시도 시각은 기존처럼 now 기준)
+        - DB 작업은 스레드에서 짧은 세션으로 (이벤트 루프를 막지 않고, 업로드 중에 연결을 붙잡지 않음)
+        """
+        now = now or datetime.utcnow()
+        started = time.monotonic()
+        processed = 0
+        while processed < CLAIM_BATCH_SIZE:
+            claimed_at = now + timedelta(seconds=time.monotonic() - started)
+            job = await asyncio.to_thread(self._claim_in_new_session, claimed_at)
+            if job is None:
+                break
+            await self._process(job, now)
+            processed += 1
+        return processed
+
+    def _record_failure(self, job_id: uuid.UUID, error: Exception, now: datetime) -> None:
+        with self.session_factory() as db:
+            job = db.get(UploadJob, job_id)
+            model = TARGET_MODELS[job.target_type]
+            job.attempts += 1
+            job.last_error = str(error)[:1000]
+            job.locked_until = None
+            # 스풀 파일이 없으면 재시도해도 소용없음
+            if isinstance(error, FileNotFoundError) or job.attempts >= settings.UPLOAD_MAX_ATTEMPTS:
+                job.status = "failed"
+                db.execute(
+                    update(model).where(model.id == job.target_id).values(upload_status="failed")
+                )
+                logger.error(f"Upload job {job.id} failed after {job.attempts} attempts: {error}")
+            else:
+                job.next_attempt_at = now + timedelta(seconds=self.retry_delay(job.attempts))
+                logger.warning(f"Upload job {job.id} attempt {job.attempts} failed, retrying: {error}")
+            db.commit()
+
+    def _record_success(self, job_id: uuid.UUID, url: str) -> bool:
+        """URL 기록 + 작업 완료 처리, 대상 기록이 남아 있으면 True"""
+        with self.session_factory() as db:
+            job = db.get(UploadJob, job_id)
+            model = TARGET_MODELS[job.target_type]
+            target = db.get(model, job.target_id)
+            if target is not None:
+                setattr(target, job.target_field, url)
+            job.status = "done"
+            job.locked_until = None
+            db.commit()
+
+            # 같은 기록의 작업이 모두 끝났으면 업로드 완료 (다른 워커와 겹쳐도 마지막 커밋 쪽이 반영)
+            pending_jobs = exists().where(
+                UploadJob.target_id == job.target_id, UploadJob.status == "pending"
+            )
+            db.execute(
+                update(model)
+                .where(model.id == job.target_id, model.upload_status == "processing", ~pending_jobs)
+                .values(upload_status="uploaded")
+            )
+            db.commit()
+            return target is not None
+
+    async def _process(self, job: UploadJob, now: datetime) -> None:
+        try:
+            image_bytes = await asyncio.to_thread(_read_file, job.spool_path)
+            url = await self.storage.upload_image(
+                image_bytes, folder=job.folder, content_type=job.content_type
+            )
+        except Exception as e:
+            await asyncio.to_thread(self._record_failure, job.id, e, now)
+            return
+
+        if not await asyncio.to_thread(self._record_success, job.id, url):
+            # 업로드 중 기록이 삭제됨: 올린 파일 정리
+            await self.storage.discard_uploads([url])
+        self.discard_spool([job.spool_path])
+
+    async def run(self) -> None:
+        """백그라운드 워커 루프 (lifespan에서 시작, 종료 시 취소)"""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                processed = await self.process_due()
+            except Exception as e:
+                logger.error(f"Upload queue error: {e}")
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.UPLOAD_WORKER_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+# 싱글톤 인스턴스
+upload_queue = UploadQueue(spool_dir=settings.UPLOAD_SPOOL_DIR)
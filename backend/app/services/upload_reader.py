@@ -0,0 +1,131 @@
+"""
+업로드 수신
+- 요청 본문 크기 제한 (Content-Length가 크면 multipart 파싱 전에 413)
+- 업로드 파일을 청크 단위로 읽으며 SHA-256 계산 + 크기 제한
+- 첫 청크의 매직 바이트로 이미지 형식 확인 (이미지가 아니면 나머지를 읽지 않고 400)
+- 읽은 bytes는 PIL/Storage에 그대로 넘기고, 계산한 digest는 결과 캐시/저장 키에 재사용
+"""
+import hashlib
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadedImage(NamedTuple):
+    data: bytes
+    digest: str  # SHA-256 hex
+    content_type: str  # 매직 바이트로 확인한 형식
+
+
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """파일 앞부분으로 이미지 형식 판별 (JPEG, PNG, WebP만 허용)"""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def require_image_type(header: bytes) -> str:
+    """이미지 형식 확인 (지원하지 않으면 400)"""
+    content_type = sniff_image_type(header)
+    if content_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="지원하지 않는 이미지 형식입니다 (JPEG, PNG, WebP)"
+        )
+    return content_type
+
+
+def upload_too_large_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"사진은 {settings.UPLOAD_MAX_BYTES // (1024 * 1024)}MB 이하만 업로드할 수 있습니다"
+    )
+
+
+async def read_image_upload(upload: UploadFile, max_bytes: Optional[int] = None) -> UploadedImage:
+    """
+    업로드 이미지 읽기
+    - 크기 초과: 413, 이미지가 아님: 400
+    - 청크는 마지막에 한 번만 이어 붙임 (파일이 한 청크 이하면 복사 없음)
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    # multipart 파서가 이미 센 크기로 먼저 거절
+    if upload.size is not None and upload.size > max_bytes:
+        raise upload_too_large_error()
+
+    await upload.seek(0)
+    head = await upload.read(CHUNK_SIZE)
+    content_type = require_image_type(head)
+
+    hasher = hashlib.sha256(head)
+    chunks = [head]
+    size = len(head)
+    while chunk := await upload.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise upload_too_large_error()
+        hasher.update(chunk)
+        chunks.append(chunk)
+
+    data = head if len(chunks) == 1 else b"".join(chunks)
+    return UploadedImage(data=data, digest=hasher.hexdigest(), content_type=content_type)
+
+
+def uploaded_image_from_bytes(data: bytes) -> UploadedImage:
+    """이미 받은 bytes 확인 (Storage에 직접 올라온 파일 등)"""
+    if len(data) > settings.UPLOAD_MAX_BYTES:
+        raise upload_too_large_error()
+    content_type = require_image_type(data[:16])
+    return UploadedImage(data=data, digest=hashlib.sha256(data).hexdigest(), content_type=content_type)
+
+
+class RequestSizeLimitMiddleware:
+    """
+    요청 본문 크기 제한 (ASGI 미들웨어)
+    - Content-Length가 상한을 넘으면 본문을 읽지 않고 바로 413
+    - chunked 요청은 받은 바이트를 세다가 넘으면 413 (multipart 스풀 전에 중단)
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": "요청 본문이 너무 큽니다"},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # 라우트의 본문 파싱 중에 발생하므로 예외 핸들러가 413 응답으로 변환
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="요청 본문이 너무 큽니다"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
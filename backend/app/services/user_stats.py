@@ -0,0 +1,140 @@
+"""
+유저 프로필 통계 (user_stats)
+- 승인된 목격/수거 수, 도감 생물 수, 뱃지 수를 유저당 한 행에 유지
+- ORM flush 직전에 변경을 보고 같은 트랜잭션에서 갱신 (목격/수거 승인·취소, 도감 등록, 뱃지 획득, 삭제)
+- 프로필 조회는 한 행만 읽음 (행이 없으면 스칼라 서브쿼리 한 번으로 집계)
+"""
+import uuid
+from collections import Counter
+from typing import Any
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.badge import UserBadge
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.user import User
+from app.models.user_creature import UserCollection
+from app.models.user_stats import UserStats
+from app.services.count_service import pending_value
+
+# 테이블 → user_stats 컬럼
+STAT_COLUMNS = {
+    "sightings": "sighting_count",
+    "cleanups": "cleanup_count",
+    "user_collections": "creature_count",
+    "user_badges": "badge_count",
+}
+# 승인된 기록만 세는 테이블
+APPROVAL_TABLES = {"sightings", "cleanups"}
+
+
+def _counts(obj) -> bool:
+    """이 행이 통계에 들어가는지 (목격/수거는 승인된 것만)"""
+    return obj.__tablename__ not in APPROVAL_TABLES or pending_value(obj, "status") == "approved"
+
+
+class UserStatsService:
+    def aggregate_query(self, user_id: uuid.UUID):
+        """user_stats 행이 없을 때 원본 테이블에서 한 번에 집계"""
+        def count(model, *conditions):
+            return (
+                select(func.count()).select_from(model)
+                .where(model.user_id == user_id, *conditions)
+                .scalar_subquery()
+            )
+
+        return select(
+            count(Sighting, Sighting.status == "approved").label("sighting_count"),
+            count(Cleanup, Cleanup.status == "approved").label("cleanup_count"),
+            count(UserCollection).label("creature_count"),
+            count(UserBadge).label("badge_count"),
+        )
+
+    async def get(self, db: AsyncSession, user_id: uuid.UUID) -> dict:
+        """프로필 통계 (쿼리 1번)"""
+        stats = await db.get(UserStats, user_id)
+        if stats is not None:
+            return stats.as_dict()
+        return dict((await db.execute(self.aggregate_query(user_id))).one()._mapping)
+
+    def get_sync(self, db: Session, user_id: uuid.UUID) -> dict:
+        stats = db.get(UserStats, user_id)
+        if stats is not None:
+            return stats.as_dict()
+        return dict(db.execute(self.aggregate_query(user_id)).one()._mapping)
+
+    def rebuild(self, db: Session) -> int:
+        """모든 유저의 통계를 원본 테이블로 다시 계산"""
+        db.query(UserStats).delete()
+        user_ids = db.scalars(select(User.id)).all()
+        for user_id in user_ids:
+            db.add(UserStats(user_id=user_id, **db.execute(self.aggregate_query(user_id)).one()._mapping))
+        db.commit()
+        return len(user_ids)
+
+    def initialize(self, db: Session) -> int:
+        """통계 행이 하나도 없는데 유저가 있으면 채움 (마이그레이션 없이 create_all로 만든 DB)"""
+        if db.query(UserStats).first() is not None or db.query(User).first() is None:
+            return 0
+        return self.rebuild(db)
+
+    def track_flush(self, session: Session) -> None:
+        """flush될 변경을 user_stats에 반영"""
+        # 새 유저는 통계 행을 같이 만들고, 같은 flush의 변경은 그 행에 바로 더함
+        pending: dict[Any, UserStats] = {
+            obj.user_id: obj for obj in session.new if isinstance(obj, UserStats)
+        }
+        for obj in list(session.new):
+            if isinstance(obj, User):
+                if obj.id is None:
+                    obj.id = uuid.uuid4()
+                if obj.id not in pending:
+                    pending[obj.id] = UserStats(
+                        user_id=obj.id, sighting_count=0, cleanup_count=0, creature_count=0, badge_count=0
+                    )
+                    session.add(pending[obj.id])
+
+        deltas: Counter = Counter()
+        for obj in session.new:
+            table = getattr(obj, "__tablename__", None)
+            if table in STAT_COLUMNS and _counts(obj):
+                deltas[(obj.user_id, STAT_COLUMNS[table])] += 1
+        for obj in session.deleted:
+            table = getattr(obj, "__tablename__", None)
+            if table in STAT_COLUMNS and _counts(obj):
+                deltas[(obj.user_id, STAT_COLUMNS[table])] -= 1
+        for obj in session.dirty:
+            table = getattr(obj, "__tablename__", None)
+            if table not in APPROVAL_TABLES:
+                continue
+            history = inspect(obj).attrs.status.history
+            if history.added and history.deleted:
+                before = "approved" in history.deleted
+                after = "approved" in history.added
+                if before != after:
+                    deltas[(obj.user_id, STAT_COLUMNS[table])] += 1 if after else -1
+
+        # 행이 없는 유저(초기화 전)는 갱신되지 않고 조회 시 원본에서 집계
+        for (user_id, column), delta in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+            if not delta:
+                continue
+            if user_id in pending:
+                setattr(pending[user_id], column, getattr(pending[user_id], column) + delta)
+            else:
+                session.execute(
+                    update(UserStats)
+                    .where(UserStats.user_id == user_id)
+                    .values({column: getattr(UserStats, column) + delta})
+                )
+
+
+# 싱글톤 인스턴스
+user_stats_service = UserStatsService()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_user_stats(session: Session, flush_context, instances) -> None:
+    user_stats_service.track_flush(session)
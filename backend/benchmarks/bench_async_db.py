@@ -0,0 +1,114 @@
+"""
+DB 세션 동시성 벤치마크
+- 느린 쿼리(pg_sleep) N건을 동시에 보내면서, 그 사이 가벼운 요청(ping)이 얼마나 밀리는지 측정
+  - sync: async 핸들러 안에서 동기 Session 사용 (쿼리 동안 이벤트 루프가 멈춤)
+  - async: AsyncSession 사용 (쿼리를 기다리는 동안 다른 요청 처리)
+- 두 엔진 모두 app.database의 풀 설정(POOL_OPTIONS)과 API 풀 크기(DB_POOL_SIZE)로 같은 조건에서 비교
+- 기본은 임시 SQLite 파일 (pg_sleep을 사용자 함수로 등록), --database-url로 Postgres 지정 가능
+- backend 디렉터리에서 실행 (.env 필요)
+
+    python benchmarks/bench_async_db.py --requests 50 --query-ms 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_engines(database_url: str):
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.config import settings
+    from app.database import POOL_OPTIONS, async_database_url
+
+    engine = create_engine(database_url, pool_size=settings.DB_POOL_SIZE, **POOL_OPTIONS)
+    async_engine = create_async_engine(
+        async_database_url(database_url), pool_size=settings.DB_POOL_SIZE, **POOL_OPTIONS
+    )
+
+    if database_url.startswith("sqlite"):
+        # Postgres와 같은 SQL을 쓰도록 pg_sleep(초)을 SQLite 함수로 등록
+        for sync_engine in (engine, async_engine.sync_engine):
+            event.listen(
+                sync_engine,
+                "connect",
+                lambda conn, _: conn.create_function("pg_sleep", 1, time.sleep),
+            )
+    return engine, async_engine
+
+
+async def run(mode: str, engine, async_engine, requests: int, query_ms: int, pings: int) -> dict:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from sqlalchemy.orm import sessionmaker
+
+    SessionLocal = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine)
+    slow_query = text("SELECT pg_sleep(:seconds)")
+    seconds = query_ms / 1000
+
+    async def slow_request() -> None:
+        if mode == "sync":
+            with SessionLocal() as db:
+                db.execute(slow_query, {"seconds": seconds})
+        else:
+            async with AsyncSessionLocal() as db:
+                await db.execute(slow_query, {"seconds": seconds})
+        await asyncio.sleep(0)
+
+    async def ping_latencies() -> list[float]:
+        """DB를 쓰지 않는 요청의 응답 지연 (이벤트 루프가 막히면 늘어남)"""
+        latencies = []
+        for _ in range(pings):
+            started = time.perf_counter()
+            await asyncio.sleep(0)
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(query_ms / 1000 / 4)
+        return latencies
+
+    started = time.perf_counter()
+    ping_task = asyncio.create_task(ping_latencies())
+    await asyncio.gather(*(slow_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = await ping_task
+    return {
+        "elapsed": elapsed,
+        "throughput": requests / elapsed,
+        "ping_p50": statistics.median(latencies),
+        "ping_max": max(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--query-ms", type=int, default=100)
+    parser.add_argument("--pings", type=int, default=20)
+    parser.add_argument("--database-url", default=None, help="기본: 임시 SQLite 파일")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine, async_engine = build_engines(database_url)
+
+    async def bench() -> None:
+        print(f"{args.requests} requests x {args.query_ms}ms query ({engine.dialect.name})")
+        for mode in ("sync", "async"):
+            result = await run(mode, engine, async_engine, args.requests, args.query_ms, args.pings)
+            print(
+                f"{mode:<6} total={result['elapsed']:6.2f}s "
+                f"throughput={result['throughput']:6.1f} req/s "
+                f"ping p50={result['ping_p50'] * 1000:7.1f}ms max={result['ping_max'] * 1000:7.1f}ms"
+            )
+        await async_engine.dispose()
+
+    asyncio.run(bench())
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
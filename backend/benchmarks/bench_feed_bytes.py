@@ -0,0 +1,87 @@
+"""
+피드 페이지 전송량 벤치마크
+- 휴대폰 카메라 크기(기본 4032x3024) JPEG를 만들어 정규화 파이프라인에 통과시킴
+- 피드 한 페이지(기본 20장)를 그릴 때 내려받는 바이트를 비교
+  - original: 업로드 원본 그대로
+  - normalized: 긴 변 IMAGE_MAX_DIMENSION + 재인코딩
+  - thumbnail: 피드/지도 마커용 썸네일
+- backend 디렉터리에서 실행 (.env 필요)
+
+    python benchmarks/bench_feed_bytes.py --page-size 20 --format webp
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_photo(seed: int, width: int, height: int) -> bytes:
+    """그라데이션 + 노이즈로 실제 사진과 비슷한 압축률의 JPEG 생성 (EXIF 포함)"""
+    from PIL import Image
+
+    gradient = Image.linear_gradient("L").rotate(seed * 37).resize((width, height))
+    noise = Image.effect_noise((width // 8, height // 8), 30 + seed % 20).resize((width, height))
+    image = Image.merge("RGB", (
+        gradient,
+        Image.blend(gradient, noise, 0.4),
+        noise,
+    ))
+    exif = Image.Exif()
+    exif[0x0112] = 1
+    exif[0x010F] = "bench-camera"
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=92, exif=exif)
+    return buffer.getvalue()
+
+
+def main() -> None:
+    from app.config import settings
+    from app.services.image_pipeline import prepare_image
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--format", default=settings.IMAGE_FORMAT, help="webp 또는 jpeg")
+    args = parser.parse_args()
+
+    originals = [make_photo(i, args.width, args.height) for i in range(args.page_size)]
+    prepared = []
+    durations = []
+    for image_bytes in originals:
+        started = time.perf_counter()
+        prepared.append(prepare_image(
+            image_bytes,
+            settings.IMAGE_MAX_DIMENSION,
+            settings.IMAGE_THUMBNAIL_SIZE,
+            args.format,
+            settings.IMAGE_QUALITY,
+            settings.IMAGE_THUMBNAIL_QUALITY,
+        ))
+        durations.append(time.perf_counter() - started)
+
+    series = {
+        "original": [len(b) for b in originals],
+        "normalized": [len(p.data) for p in prepared],
+        "thumbnail": [len(p.thumbnail) for p in prepared],
+    }
+    base = sum(series["original"])
+    print(
+        f"{args.page_size} photos {args.width}x{args.height}, format={args.format}, "
+        f"max={settings.IMAGE_MAX_DIMENSION}px thumb={settings.IMAGE_THUMBNAIL_SIZE}px"
+    )
+    for name, sizes in series.items():
+        total = sum(sizes)
+        print(
+            f"{name:<11} page={total / 1024:9.1f}KB per-photo={statistics.mean(sizes) / 1024:8.1f}KB "
+            f"({total / base * 100:5.1f}% of original)"
+        )
+    print(f"prepare     mean={statistics.mean(durations) * 1000:.1f}ms per photo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+피드 페이지네이션 벤치마크
+- 임시 SQLite 파일에 합성 목격 기록(기본 100만 건)을 넣고 피드 조회 지연을 비교
+  - offset: ORDER BY created_at DESC OFFSET (page-1)*limit (기존 방식)
+  - keyset: fetch_feed_page (커서 다음부터 인덱스로 이어 읽음)
+  - count: 기존에 매 요청마다 실행하던 전체 개수 집계
+- 인덱스는 모델 정의(create_all)를 그대로 사용
+- --database-url로 Postgres 지정 가능 (sightings 테이블을 새로 만들고 지움)
+- backend 디렉터리에서 실행 (.env 필요)
+
+    python benchmarks/bench_feed_pagination.py --rows 1000000 --page 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(engine, rows: int, batch_size: int = 50_000) -> None:
+    """유저 1명 + 목격 기록 rows건 (1초 간격, 일부는 같은 시각)"""
+    from app.models.sighting import Sighting
+    from app.models.user import User
+
+    user_id = uuid.uuid4()
+    base = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{
+            "id": user_id, "email": "bench@test.com", "nickname": "bench", "points": 0,
+        }])
+        for start in range(0, rows, batch_size):
+            conn.execute(Sighting.__table__.insert(), [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "latitude": 35.0,
+                    "longitude": 129.0,
+                    "status": "approved",
+                    "points_earned": 0,
+                    "created_at": base + timedelta(seconds=i - i % 4),
+                }
+                for i in range(start, min(start + batch_size, rows))
+            ])
+
+
+async def measure(fn, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+async def bench(async_engine, page: int, limit: int, repeat: int) -> None:
+    from sqlalchemy import desc, func, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from app.models.sighting import Sighting
+    from app.services.pagination import encode_cursor, fetch_feed_page
+
+    SessionLocal = async_sessionmaker(async_engine)
+    query = select(Sighting)
+
+    async with SessionLocal() as db:
+        # page번째 페이지 직전 항목의 커서 (클라이언트가 앞 페이지를 넘기며 받았을 값)
+        before = (await db.execute(
+            select(Sighting.created_at, Sighting.id)
+            .order_by(desc(Sighting.created_at), desc(Sighting.id))
+            .offset((page - 1) * limit - 1).limit(1)
+        )).one()
+        deep_cursor = encode_cursor(before.created_at, before.id)
+
+        async def offset_page(n: int):
+            return (await db.scalars(
+                query.order_by(desc(Sighting.created_at), desc(Sighting.id))
+                .offset((n - 1) * limit).limit(limit)
+            )).all()
+
+        async def count():
+            return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+        # 두 방식이 같은 페이지를 돌려주는지 확인
+        keyset_items, _ = await fetch_feed_page(db, query, Sighting, deep_cursor, limit)
+        assert [s.id for s in keyset_items] == [s.id for s in await offset_page(page)]
+
+        results = {
+            "offset page 1": await measure(lambda: offset_page(1), repeat),
+            f"offset page {page}": await measure(lambda: offset_page(page), repeat),
+            "keyset page 1": await measure(lambda: fetch_feed_page(db, query, Sighting, None, limit), repeat),
+            f"keyset page {page}": await measure(
+                lambda: fetch_feed_page(db, query, Sighting, deep_cursor, limit), repeat
+            ),
+            "count(*)": await measure(count, repeat),
+        }
+    for name, seconds in results.items():
+        print(f"{name:<18} {seconds * 1000:9.2f}ms")
+
+
+def main() -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.database import Base, async_database_url
+    from app.models.sighting import Sighting
+    from app.models.user import User
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None, help="기본: 임시 SQLite 파일")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(database_url)
+    tables = [User.__table__, Sighting.__table__]
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+
+    started = time.perf_counter()
+    seed(engine, args.rows)
+    print(f"seeded {args.rows} sightings in {time.perf_counter() - started:.1f}s ({engine.dialect.name})")
+
+    async_engine = create_async_engine(async_database_url(database_url))
+
+    async def run() -> None:
+        await bench(async_engine, args.page, args.limit, args.repeat)
+        await async_engine.dispose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        Base.metadata.drop_all(engine, tables=tables)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+분류 모델 추론 백엔드 벤치마크
+- 백엔드별로 별도 프로세스를 띄워 처리량(images/sec)과 최대 RSS를 측정
+- backend 디렉터리에서 실행 (.env 필요)
+
+    python benchmarks/bench_inference_backends.py --model trash --backends torch,int8,onnx
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODELS = {
+    "creature": "jasasuster/sea-animals",
+    "trash": "google/vit-base-patch16-224",
+}
+
+
+def run_child(model_name: str, backend: str, images: int, batch_size: int) -> dict:
+    """현재 프로세스에서 한 백엔드만 로드해 측정"""
+    from PIL import Image
+
+    from app.services.inference_backend import build_pipeline
+
+    classifier = build_pipeline(model_name, backend)
+    inputs = [Image.effect_noise((224, 224), 40 + i % 20).convert("RGB") for i in range(batch_size)]
+    classifier(inputs, batch_size=batch_size)  # 워밍업
+
+    started = time.perf_counter()
+    done = 0
+    while done < images:
+        classifier(inputs, batch_size=batch_size)
+        done += batch_size
+    elapsed = time.perf_counter() - started
+
+    return {
+        "backend": backend,
+        "images_per_sec": round(done / elapsed, 2),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="trash", help="creature, trash 또는 HuggingFace 모델 이름")
+    parser.add_argument("--backends", default="torch,int8,onnx")
+    parser.add_argument("--images", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    model_name = MODELS.get(args.model, args.model)
+
+    if args.child:
+        print(json.dumps(run_child(model_name, args.backends, args.images, args.batch_size)))
+        return
+
+    print(f"model={model_name} images={args.images} batch_size={args.batch_size}")
+    print(f"{'backend':<8} {'images/sec':>12} {'max RSS (MB)':>14}")
+    for backend in args.backends.split(","):
+        completed = subprocess.run(
+            [
+                sys.executable, os.path.abspath(__file__), "--child",
+                "--model", model_name, "--backends", backend,
+                "--images", str(args.images), "--batch-size", str(args.batch_size),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            print(f"{backend:<8} failed: {completed.stderr.strip().splitlines()[-1:]}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{backend:<8} {result['images_per_sec']:>12} {result['max_rss_mb']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+랭킹 벤치마크
+- 임시 SQLite 파일에 합성 유저(기본 10만 명)와 승인된 수거 기록을 넣고 수거왕 랭킹 비교
+  - group-by: 기존 방식 (요청마다 cleanups를 GROUP BY, 상위 limit 안에 있어야 내 순위를 알 수 있음)
+  - group-by + rank: 기존 방식에 내 순위(나보다 많은 유저 수)까지 SQL로 구함
+  - leaderboard: LeaderboardService (전체 로드 1번 후 메모리에서 상위/순위 조회, 점수 변경 반영)
+- --database-url로 Postgres 지정 가능 (관련 테이블을 새로 만들고 지움)
+- backend 디렉터리에서 실행 (.env 필요)
+
+    python benchmarks/bench_leaderboard.py --users 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(engine, users: int, cleanups_per_user: float, batch_size: int = 20_000) -> list[uuid.UUID]:
+    """유저 + 승인된 수거 기록 (수거 수는 지수 분포) + user_stats"""
+    from app.models.cleanup import Cleanup
+    from app.models.user import User
+    from app.models.user_stats import UserStats
+
+    rng = random.Random(42)
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    counts = [int(rng.expovariate(1 / cleanups_per_user)) for _ in range(users)]
+    with engine.begin() as conn:
+        for start in range(0, users, batch_size):
+            batch = range(start, min(start + batch_size, users))
+            conn.execute(User.__table__.insert(), [
+                {"id": user_ids[i], "email": f"user{i}@bench", "nickname": f"user{i}", "points": counts[i] * 30}
+                for i in batch
+            ])
+            conn.execute(UserStats.__table__.insert(), [
+                {
+                    "user_id": user_ids[i], "sighting_count": 0, "cleanup_count": counts[i],
+                    "creature_count": 0, "badge_count": 0,
+                }
+                for i in batch
+            ])
+            cleanups = [
+                {
+                    "id": uuid.uuid4(), "user_id": user_ids[i], "latitude": 35.0, "longitude": 129.0,
+                    "trash_type": "plastic", "amount": "handful", "status": "approved",
+                }
+                for i in batch for _ in range(counts[i])
+            ]
+            if cleanups:
+                conn.execute(Cleanup.__table__.insert(), cleanups)
+    return user_ids
+
+
+async def timed(fn, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+async def bench(async_engine, user_ids: list[uuid.UUID], limit: int, repeat: int) -> None:
+    from sqlalchemy import desc, func, select, update
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from app.models.cleanup import Cleanup
+    from app.models.user import User
+    from app.models.user_stats import UserStats
+    from app.services.leaderboard import LeaderboardService
+
+    SessionLocal = async_sessionmaker(async_engine)
+    me = user_ids[len(user_ids) // 2]
+    service = LeaderboardService(refresh_seconds=3600)
+
+    async with SessionLocal() as db:
+        counts = select(
+            Cleanup.user_id, func.count(Cleanup.id).label("count")
+        ).where(Cleanup.status == "approved").group_by(Cleanup.user_id).subquery()
+
+        async def group_by():
+            return (await db.execute(
+                select(User.id, User.nickname, counts.c.count)
+                .outerjoin(counts, User.id == counts.c.user_id)
+                .order_by(desc(counts.c.count)).limit(limit)
+            )).all()
+
+        async def group_by_with_rank():
+            await group_by()
+            mine = select(func.count()).select_from(Cleanup).where(
+                Cleanup.user_id == me, Cleanup.status == "approved"
+            ).scalar_subquery()
+            return await db.scalar(select(func.count()).select_from(counts).where(counts.c.count > mine))
+
+        async def full_load():
+            service.clear()
+            return await service.get(db, "cleanup")
+
+        board = await full_load()
+        probes = random.Random(7).sample(user_ids, 10_000)
+
+        async def lookup():
+            return [board.rank(user_id) for user_id in probes]
+
+        async def cached_request():
+            board = await service.get(db, "cleanup")
+            return board.top(limit), board.rank(me)
+
+        async def update_and_request():
+            # 커밋 후 한 유저의 점수가 바뀐 경우 (그 유저만 다시 읽음)
+            await db.execute(
+                update(UserStats).where(UserStats.user_id == me)
+                .values(cleanup_count=UserStats.cleanup_count + 1)
+            )
+            service.mark_dirty([me])
+            return await cached_request()
+
+        results = [
+            (f"group-by top {limit}", await timed(group_by, repeat)),
+            (f"group-by top {limit} + my rank", await timed(group_by_with_rank, repeat)),
+            ("leaderboard full load", await timed(full_load, repeat)),
+            (f"leaderboard top {limit} + my rank", await timed(cached_request, repeat)),
+            ("leaderboard after 1 user change", await timed(update_and_request, repeat)),
+        ]
+        per_lookup = await timed(lookup, repeat) / len(probes)
+        await db.rollback()
+
+    for name, seconds in results:
+        print(f"{name:<34} {seconds * 1000:9.2f}ms")
+    print(f"{'leaderboard rank lookup':<34} {per_lookup * 1_000_000:9.2f}us")
+
+
+def main() -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.database import Base, async_database_url
+    from app.models.cleanup import Cleanup
+    from app.models.user import User
+    from app.models.user_stats import UserStats
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--cleanups-per-user", type=float, default=3.0)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None, help="기본: 임시 SQLite 파일")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(database_url)
+    tables = [User.__table__, UserStats.__table__, Cleanup.__table__]
+    Base.metadata.drop_all(engine, tables=tables)
+    Base.metadata.create_all(engine, tables=tables)
+
+    started = time.perf_counter()
+    user_ids = seed(engine, args.users, args.cleanups_per_user)
+    print(f"seeded {args.users} users in {time.perf_counter() - started:.1f}s ({engine.dialect.name})")
+
+    async_engine = create_async_engine(async_database_url(database_url))
+
+    async def run() -> None:
+        await bench(async_engine, user_ids, args.limit, args.repeat)
+        await async_engine.dispose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        Base.metadata.drop_all(engine, tables=tables)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
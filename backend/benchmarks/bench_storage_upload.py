@@ -0,0 +1,177 @@
+"""
+Storage 업로드 벤치마크
+- 로컬 대역 서버(uvicorn + 자체 서명 TLS)를 띄우고 업로드 1건당 지연을 측정
+- per-call: 업로드마다 httpx.AsyncClient 생성 (기존 방식, 매번 TCP/TLS 핸드셰이크)
+- shared: StorageService + 공유 커넥션 풀 (keep-alive 재사용)
+- local: STORAGE_BACKEND=local (네트워크 없이 디스크에 저장)
+- backend 디렉터리에서 실행 (.env 필요)
+
+    python benchmarks/bench_storage_upload.py --uploads 200 --latency-ms 20
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import socket
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_self_signed_cert(directory: str) -> tuple[str, str]:
+    """localhost용 자체 서명 인증서 생성"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+def start_stand_in_server(cert_path: str, key_path: str, latency_ms: float) -> int:
+    """Supabase Storage 대역 서버 (요청 본문을 읽고 200 반환)"""
+    import uvicorn
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get("more_body", False)
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if scope["method"] == "HEAD":
+            # 존재 확인: 매번 새 내용이므로 항상 없음
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"Key":"ok"}'})
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    config = uvicorn.Config(
+        app, log_level="warning", ssl_certfile=cert_path, ssl_keyfile=key_path,
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return port
+
+
+async def bench_per_call(url: str, ssl_context: ssl.SSLContext, payloads: list[bytes]) -> list[float]:
+    import httpx
+
+    latencies = []
+    for payload in payloads:
+        started = time.perf_counter()
+        async with httpx.AsyncClient(verify=ssl_context) as client:
+            response = await client.post(url, content=payload, timeout=10.0)
+            response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def bench_shared(base_url: str, ssl_context: ssl.SSLContext, payloads: list[bytes]) -> list[float]:
+    from app.config import settings
+    from app.services.http_client import HttpClientPool
+    from app.services.storage import StorageService, SupabaseStorageBackend
+
+    settings.DEBUG = False  # 더미 URL 대신 실제 업로드 경로 사용
+    pool = HttpClientPool(verify=ssl_context)
+    storage = StorageService(SupabaseStorageBackend(http=pool, supabase_url=base_url))
+
+    latencies = []
+    try:
+        for payload in payloads:
+            started = time.perf_counter()
+            await storage.upload_image(payload, folder="bench")
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await pool.close()
+    return latencies
+
+
+async def bench_local(root: str, payloads: list[bytes]) -> list[float]:
+    from app.services.storage import LocalStorageBackend, StorageService
+
+    storage = StorageService(LocalStorageBackend(root))
+    latencies = []
+    for payload in payloads:
+        started = time.perf_counter()
+        await storage.upload_image(payload, folder="bench")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def summarize(name: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<10} mean={statistics.mean(ordered) * 1000:7.2f}ms "
+        f"p50={statistics.median(ordered) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--payload-kb", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="대역 서버 응답 지연")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_path, key_path = write_self_signed_cert(tmp)
+        port = start_stand_in_server(cert_path, key_path, args.latency_ms)
+        ssl_context = ssl.create_default_context(cafile=cert_path)
+        base_url = f"https://localhost:{port}"
+        # 저장 키가 내용 해시이므로 업로드마다 다른 내용 사용
+        payloads = [os.urandom(args.payload_kb * 1024) for _ in range(args.uploads)]
+
+        per_call = asyncio.run(bench_per_call(
+            f"{base_url}/storage/v1/object/images/bench/x.jpg", ssl_context, payloads
+        ))
+        shared = asyncio.run(bench_shared(base_url, ssl_context, payloads))
+        local = asyncio.run(bench_local(os.path.join(tmp, "media"), payloads))
+
+    print(f"{args.uploads} uploads, {args.payload_kb}KB payload, server latency {args.latency_ms}ms")
+    summarize("per-call", per_call)
+    summarize("shared", shared)
+    summarize("local", local)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,47 @@
 """테스트 설정"""
+import os
+
+# 디코딩 횟수 등을 같은 프로세스에서 관찰할 수 있도록 스레드 풀 사용
+os.environ.setdefault("IMAGE_WORKER_MODE", "thread")
+
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from app.main import app
 from app.database import Base, get_db
+from app.api import deps
+from app.api.auth import create_access_token
+from app.models.user import User
+from app.services.count_service import count_service
+from app.services.leaderboard import leaderboard_service
+from app.services.result_cache import result_cache
+from app.services.storage import storage_service
 
-# 테스트용 인메모리 SQLite
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+# 테스트용 SQLite 파일 (API는 aiosqlite, 테스트 준비/검증은 동기 세션으로 같은 파일을 사용)
+SQLITE_PATH = os.path.join(tempfile.mkdtemp(prefix="heamon-test-"), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{SQLITE_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# TestClient마다 이벤트 루프가 달라서 커넥션을 풀에 두지 않음
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{SQLITE_PATH}", poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# 업로드 보호 시간/참조 행도 테스트 DB에 기록
+storage_service.session_factory = TestingSessionLocal
+# 없는 카운터 행 생성도 테스트 DB에
+count_service.session_factory = TestingSessionLocal
+
 
 def override_get_db():
     try:
@@ -27,10 +51,42 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """테스트 간 결과/개수/랭킹 캐시 공유 방지"""
+    result_cache.clear()
+    count_service.clear()
+    leaderboard_service.clear()
+    yield
+    result_cache.clear()
+    count_service.clear()
+    leaderboard_service.clear()
+
+
 @pytest.fixture
 def client():
     Base.metadata.create_all(bind=engine)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[deps.get_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
     Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def auth_headers(client):
+    """테스트 유저 생성 후 인증 헤더 반환"""
+    db = TestingSessionLocal()
+    try:
+        user = User(email="tester@test.com", nickname="tester")
+        db.add(user)
+        db.commit()
+        token = create_access_token(str(user.id))
+    finally:
+        db.close()
+    return {"Authorization": f"Bearer {token}"}
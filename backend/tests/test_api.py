@@ -1,4 +1,5 @@
 """API 기본 테스트"""
+from app.config import settings
 
 
 def test_root(client):
@@ -28,3 +29,15 @@ def test_badges_list(client):
     response = client.get("/api/badges")
     assert response.status_code == 200
     assert "badges" in response.json()
+
+
+def test_readiness_check(client, monkeypatch):
+    """모델 사전 로드가 켜져 있으면 로드 전에는 준비되지 않음"""
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+    monkeypatch.setattr(settings, "AI_PRELOAD_MODELS", True)
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "loading"
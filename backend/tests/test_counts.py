@@ -0,0 +1,131 @@
+"""목록/랭킹 전체 개수 카운터"""
+from sqlalchemy import update
+
+from app.models.cleanup import Cleanup
+from app.models.row_counter import RowCounter
+from app.models.sighting import Sighting
+from app.models.user import User
+from app.services.count_service import count_service
+from tests.conftest import TestingSessionLocal
+
+
+def counters() -> dict[str, int]:
+    with TestingSessionLocal() as db:
+        return {row.name: row.value for row in db.query(RowCounter).all()}
+
+
+def add_sighting(db, user, **kwargs) -> Sighting:
+    sighting = Sighting(user_id=user.id, latitude=35.0, longitude=129.0, **kwargs)
+    db.add(sighting)
+    return sighting
+
+
+def test_counters_follow_inserts_status_changes_and_deletes(client):
+    with TestingSessionLocal() as db:
+        user = User(email="count@test.com", nickname="count")
+        db.add(user)
+        db.commit()
+        add_sighting(db, user, status="approved")
+        db.commit()
+        count_service.initialize(db)
+
+    assert counters() == {
+        "sightings": 1,
+        "sightings:status=approved": 1,
+        "cleanups": 0,
+        "users": 1,
+    }
+
+    with TestingSessionLocal() as db:
+        user = db.query(User).one()
+        # status를 비워 두면 컬럼 기본값(pending)으로 집계
+        pending = add_sighting(db, user)
+        db.add(Cleanup(
+            user_id=user.id, latitude=35.0, longitude=129.0,
+            trash_type="plastic", amount="handful",
+        ))
+        db.commit()
+        # 처음 보는 값은 카운터가 없으므로 건너뜀 (조회 시 COUNT(*))
+        assert "sightings:status=pending" not in counters()
+
+        count_service.rebuild(db)
+        pending.status = "approved"
+        db.commit()
+        assert counters()["sightings:status=approved"] == 2
+        assert counters()["sightings:status=pending"] == 0
+
+        db.delete(pending)
+        db.commit()
+
+    assert counters() == {
+        "sightings": 1,
+        "sightings:status=approved": 1,
+        "sightings:status=pending": 0,
+        "cleanups": 1,
+        "cleanups:status=pending": 1,
+        "cleanups:trash_type=plastic": 1,
+        "users": 1,
+    }
+
+
+def test_list_totals_use_counters(client, auth_headers):
+    with TestingSessionLocal() as db:
+        user = db.query(User).one()
+        for _ in range(3):
+            add_sighting(db, user, status="approved")
+        add_sighting(db, user, status="pending")
+        db.commit()
+
+        # 카운터가 없으면 COUNT(*)로 세고 카운터 행을 만들어 둠
+        assert client.get("/api/sightings", params={"status": "approved"}).json()["total"] == 3
+        assert counters() == {"sightings:status=approved": 3}
+        count_service.initialize(db)
+        # 카운터 값을 바꿔서 COUNT(*) 대신 카운터를 읽는지 확인
+        db.execute(update(RowCounter).where(RowCounter.name == "sightings").values(value=100))
+        db.commit()
+
+    assert client.get("/api/sightings").json()["total"] == 100
+    assert client.get("/api/sightings", params={"status": "approved"}).json()["total"] == 3
+
+    # 같은 프로세스에서 목격을 추가하면 캐시가 비워져 바로 반영
+    with TestingSessionLocal() as db:
+        add_sighting(db, db.query(User).one(), status="approved")
+        db.commit()
+    assert client.get("/api/sightings").json()["total"] == 101
+    assert client.get("/api/sightings", params={"status": "approved"}).json()["total"] == 4
+
+
+def test_count_cache_cleared_after_commit(client, auth_headers):
+    """flush 후 커밋 전에 다시 캐시된 개수도 커밋되면 비워짐"""
+    with TestingSessionLocal() as db:
+        count_service.initialize(db)
+    assert client.get("/api/sightings").json()["total"] == 0
+
+    with TestingSessionLocal() as db:
+        add_sighting(db, db.query(User).one(), status="approved")
+        db.flush()
+        # 커밋 전 조회는 이전 값을 캐시
+        assert client.get("/api/sightings").json()["total"] == 0
+        db.commit()
+    assert client.get("/api/sightings").json()["total"] == 1
+
+    with TestingSessionLocal() as db:
+        add_sighting(db, db.query(User).one(), status="approved")
+        db.flush()
+        db.rollback()
+    assert client.get("/api/sightings").json()["total"] == 1
+
+
+def test_unknown_filter_values_do_not_create_counters(client):
+    """정해진 값이 아닌 필터는 카운터 행/잠금 없이 COUNT(*)"""
+    with TestingSessionLocal() as db:
+        count_service.initialize(db)
+    before = counters()
+
+    for params in ({"status": "junk"}, {"status": "x" * 200}, {"trash_type": "junk"}):
+        for path in ("/api/sightings", "/api/cleanups"):
+            response = client.get(path, params=params)
+            assert response.status_code == 200, response.text
+            assert response.json()["total"] == 0
+    assert counters() == before
+
@@ -0,0 +1,132 @@
+"""이미지 해시 인덱스 테스트"""
+import asyncio
+import io
+import random
+import uuid
+
+import pytest
+from PIL import Image
+
+from app.config import settings
+
+from app.models.user import User
+from app.models.sighting import Sighting
+from app.services.hash_index import HashIndex, IndexedImage, hamming_distance, hex_to_int64, int64_to_hex
+from app.services.image_hash import ImageHashService
+from app.services.image_loader import load_image, PHASH_INPUT_SIZE, VIT_INPUT_SIZE
+from tests.conftest import TestingSessionLocal
+
+
+def test_hash_index_matches_linear_scan():
+    """구간 버킷 + 벡터 검색 결과가 파이썬 선형 탐색과 일치 (전체 탐색으로 넘어가는 거리 포함)"""
+    rng = random.Random(42)
+    index = HashIndex()
+    hashes = []
+    for i in range(2000):
+        value = rng.getrandbits(64)
+        hashes.append(value)
+        index.add(value, IndexedImage("sighting", str(i), "user"))
+
+    # 기존 해시에서 몇 비트만 뒤집은 질의 포함
+    queries = [rng.getrandbits(64) for _ in range(20)]
+    queries += [hashes[i] ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for i in range(20)]
+
+    for max_distance in (0, 4, 8, 12):
+        for query in queries:
+            expected = sorted(
+                (hamming_distance(query, value), str(i))
+                for i, value in enumerate(hashes)
+                if hamming_distance(query, value) <= max_distance
+            )
+            found = sorted((d, entry.record_id) for d, entry in index.search(query, max_distance))
+            assert found == expected
+            nearest = index.nearest(query, max_distance)
+            assert (nearest[0] if nearest else None) == (expected[0][0] if expected else None)
+
+    # 중복 판정 거리에서는 일부 버킷만 후보로 봄
+    assert len(index._candidates(queries[0], 4)) < len(index) // 10
+
+
+def test_hex_int64_round_trip():
+    """부호 비트가 켜진 해시도 BIGINT 범위로 왕복 변환"""
+    for hex_hash in ["0000000000000000", "7fffffffffffffff", "8000000000000000", "ffffffffffffffff", "c3a1e0f01f0f3c78"]:
+        value = hex_to_int64(hex_hash)
+        assert -(1 << 63) <= value < (1 << 63)
+        assert int64_to_hex(value) == hex_hash
+
+
+def test_hash_index_ignores_duplicate_entries():
+    """같은 참조를 여러 번 등록해도 한 번만 저장"""
+    index = HashIndex()
+    entry = IndexedImage("cleanup_before", "c1", "u1")
+    assert index.add(0xFF, entry) is True
+    assert index.add(0xFF, entry) is False
+    assert len(index) == 1
+    assert index.search(0xFE, 1) == [(1, entry)]
+
+
+def test_check_duplicate_uses_committed_hashes(client):
+    """커밋 후 등록된 해시로 중복 판정"""
+    image = Image.linear_gradient("L").resize((64, 64))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    image_bytes = buffer.getvalue()
+
+    service = ImageHashService()
+    db = TestingSessionLocal()
+    try:
+        user = User(email="hash@test.com", nickname="hash")
+        db.add(user)
+        db.commit()
+
+        first = asyncio.run(service.check_duplicate(db, image_bytes, user.id))
+        assert first["is_duplicate"] is False
+
+        sighting = Sighting(
+            user_id=user.id,
+            photo_url="http://test/a.jpg",
+            latitude=35.0,
+            longitude=129.0,
+            image_hash=first["hash"],
+        )
+        db.add(sighting)
+        db.commit()
+
+        # hex만 있는 기존 행 → BIGINT 백필 후 인덱스에 반영
+        assert service.backfill_hash_ints(db) == 1
+        db.refresh(sighting)
+        assert sighting.image_hash_int == hex_to_int64(first["hash"])
+        service.register_sighting(sighting)
+
+        second = asyncio.run(service.check_duplicate(db, image_bytes, uuid.uuid4()))
+        assert second["is_duplicate"] is True
+        assert second["similar_image_id"] == str(sighting.id)
+        assert second["is_same_user"] is False
+        assert second["distance"] == 0
+    finally:
+        db.close()
+
+
+def test_load_image_decodes_jpeg_at_reduced_scale():
+    """큰 JPEG는 사용처가 필요한 크기에 가깝게 축소 디코딩"""
+    buffer = io.BytesIO()
+    Image.effect_noise((4000, 3000), 64).convert("RGB").save(buffer, format="JPEG")
+
+    image = load_image(buffer.getvalue(), PHASH_INPUT_SIZE, mode="L")
+    assert image.mode == "L"
+    assert min(image.size) >= PHASH_INPUT_SIZE
+    assert max(image.size) <= 4000 // 8
+
+    image = load_image(buffer.getvalue(), VIT_INPUT_SIZE)
+    assert image.mode == "RGB"
+    assert min(image.size) >= VIT_INPUT_SIZE
+
+
+def test_load_image_rejects_decompression_bomb(monkeypatch):
+    """픽셀 수 상한을 넘는 이미지는 디코딩 전에 거절"""
+    monkeypatch.setattr(settings, "IMAGE_MAX_PIXELS", 100 * 100)
+    buffer = io.BytesIO()
+    Image.new("RGB", (200, 200)).save(buffer, format="PNG")
+
+    with pytest.raises(Image.DecompressionBombError):
+        load_image(buffer.getvalue(), PHASH_INPUT_SIZE)
@@ -0,0 +1,141 @@
+"""AI 추론 서비스 테스트"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services import creature_ai, result_cache as result_cache_module, trash_ai
+from app.services.creature_ai import creature_classifier
+from app.services.image_worker import ImageWorker
+from app.services.inference_batcher import InferenceBatcher
+from app.services.result_cache import ResultCache, result_cache
+from app.services.trash_ai import trash_classifier
+from tests.test_uploads import make_image_bytes
+
+
+def test_batcher_groups_concurrent_requests():
+    """동시에 들어온 요청은 한 번의 배치로 처리되고 순서대로 결과가 돌아감"""
+    calls = []
+
+    def run_batch(items):
+        calls.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = InferenceBatcher("test", run_batch, max_batch_size=4, max_wait_ms=50)
+
+    async def scenario():
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(scenario()) == [0, 10, 20, 30, 40, 50]
+    assert calls == [[0, 1, 2, 3], [4, 5]]
+    assert batcher.stats()["batch_size_histogram"] == {4: 1, 2: 1}
+
+
+def test_batcher_propagates_errors():
+    """배치 추론 실패는 해당 배치의 모든 요청에 전달"""
+    def run_batch(items):
+        raise RuntimeError("model exploded")
+
+    batcher = InferenceBatcher("test", run_batch, max_batch_size=2, max_wait_ms=1)
+
+    async def scenario():
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+        await batcher.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_result_cache_lru_and_ttl(monkeypatch):
+    """개수 제한을 넘으면 가장 오래 안 쓴 항목부터, TTL이 지나면 만료"""
+    now = [1000.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultCache("test", max_entries=2, ttl_seconds=60)
+
+    async def scenario():
+        await cache.set("ns", "a", 1)
+        await cache.set("ns", "b", 2)
+        assert await cache.get("ns", "a") == 1  # a를 최근 사용으로
+        await cache.set("ns", "c", 3)           # b 축출
+        assert await cache.get("ns", "b") is None
+        now[0] += 61
+        assert await cache.get("ns", "a") is None
+
+    asyncio.run(scenario())
+    stats = cache.stats()["namespaces"]["ns"]
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_classify_reuses_cached_result(monkeypatch):
+    """같은 바이트는 모델을 다시 돌리지 않고, 모델/백엔드가 다르면 별도 캐시"""
+    calls = []
+
+    def fake_pipeline(images, **kwargs):
+        calls.append(len(images))
+        return [[{"label": "dolphin", "score": 0.9}] for _ in images]
+
+    monkeypatch.setattr(creature_classifier, "classifier", fake_pipeline)
+    image_bytes = make_image_bytes(seed=7)
+
+    async def scenario():
+        first = await creature_classifier.classify(image_bytes)
+        second = await creature_classifier.classify(image_bytes)
+        monkeypatch.setattr(settings, "AI_INFERENCE_BACKEND", "int8")
+        await creature_classifier.classify(image_bytes)
+        await creature_classifier.batcher.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert first["suggested_creature"] == "돌고래"
+    assert calls == [1, 1]
+    stats = result_cache.stats()["namespaces"]
+    assert stats[f"creature:{creature_classifier.model_name}:torch"]["hits"] == 1
+
+
+def test_verify_cleanup_single_forward(monkeypatch):
+    """Before/After는 한 번의 forward로 처리하고, 이미 분류한 사진은 캐시 재사용"""
+    calls = []
+
+    def fake_pipeline(images, **kwargs):
+        calls.append(len(images))
+        return [[{"label": "water_bottle", "score": 0.8}] for _ in images]
+
+    monkeypatch.setattr(trash_classifier, "classifier", fake_pipeline)
+    before, after, other_after = (make_image_bytes(seed=i) for i in (1, 2, 3))
+
+    async def scenario():
+        first = await trash_classifier.verify_cleanup(before, after)
+        second = await trash_classifier.verify_cleanup(before, other_after)
+        await trash_classifier.batcher.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert calls == [2, 1]
+    assert first["before_had_trash"] is True
+    assert first == second
+
+
+def test_classify_rejects_when_image_worker_saturated(monkeypatch):
+    """분류용 디코딩도 이미지 작업 풀을 거쳐 과부하면 fallback 대신 503"""
+    worker = ImageWorker(mode="thread", max_workers=1, max_pending=0)
+    monkeypatch.setattr(creature_ai, "image_worker", worker)
+    monkeypatch.setattr(trash_ai, "image_worker", worker)
+    monkeypatch.setattr(creature_classifier, "classifier", lambda images, **kwargs: [])
+    monkeypatch.setattr(trash_classifier, "classifier", lambda images, **kwargs: [])
+    before, after = (make_image_bytes(seed=i) for i in (11, 12))
+
+    try:
+        for call in (
+            lambda: creature_classifier.classify(before),
+            lambda: trash_classifier.verify_cleanup(before, after),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                asyncio.run(call())
+            assert exc_info.value.status_code == 503
+    finally:
+        worker.shutdown()
@@ -0,0 +1,94 @@
+"""
+추론 백엔드 동등성 테스트
+- torch/transformers가 설치되어 있을 때만 실행
+- int8/onnx 백엔드의 top-1 라벨이 PyTorch 백엔드와 같은지 확인
+- 기본은 시드 고정 소형 ViT, RUN_MODEL_PARITY=1이면 실제 서비스 모델도 비교 (다운로드 필요)
+"""
+import os
+
+import pytest
+from PIL import Image, ImageDraw
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from app.config import settings
+from app.services.creature_ai import creature_classifier
+from app.services.inference_backend import build_pipeline
+from app.services.trash_ai import trash_classifier
+
+MODEL_NAMES = ["tiny-vit"]
+if os.environ.get("RUN_MODEL_PARITY") == "1":
+    MODEL_NAMES += [creature_classifier.model_name, trash_classifier.model_name]
+
+# PyTorch 결과에서 1, 2위 점수 차가 이보다 작으면 양자화 오차로 순위가 바뀔 수 있어 비교 제외
+MIN_TOP1_MARGIN = 0.05
+
+
+def make_fixture_images() -> list[Image.Image]:
+    """바다/해변/물체 형태의 결정적 합성 이미지"""
+    images = []
+    for i in range(8):
+        image = Image.new("RGB", (224, 224), (90 + i * 10, 160, 220))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([0, 120 + i * 5, 224, 224], fill=(30, 80 + i * 15, 160))
+        draw.rectangle([0, 190, 224, 224], fill=(220, 200, 150))
+        if i % 2:
+            draw.ellipse([60, 80, 160 + i * 5, 140], fill=(120, 120, 130))
+        else:
+            draw.rectangle([100, 60, 124, 180], fill=(200, 230, 240), outline=(40, 60, 80))
+        images.append(image)
+    return images
+
+
+def save_tiny_vit(path) -> str:
+    """네트워크 없이 쓸 수 있는 소형 ViT 분류기 저장"""
+    torch.manual_seed(0)
+    labels = {i: label for i, label in enumerate(["beach", "bottle", "net", "can", "seashore"])}
+    config = transformers.ViTConfig(
+        image_size=224,
+        patch_size=32,
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=128,
+        initializer_range=0.2,  # 기본값(0.02)이면 모든 이미지가 거의 같은 점수로 나와 비교가 무의미
+        id2label=labels,
+        label2id={label: i for i, label in labels.items()},
+    )
+    transformers.ViTForImageClassification(config).save_pretrained(path)
+    transformers.ViTImageProcessor(size={"height": 224, "width": 224}).save_pretrained(path)
+    return str(path)
+
+
+@pytest.fixture(scope="module", params=MODEL_NAMES)
+def torch_reference(request, tmp_path_factory):
+    model_name = request.param
+    if model_name == "tiny-vit":
+        model_name = save_tiny_vit(tmp_path_factory.mktemp("tiny-vit"))
+    try:
+        classifier = build_pipeline(model_name, "torch")
+    except Exception as e:
+        pytest.skip(f"model unavailable: {e}")
+    images = make_fixture_images()
+    return model_name, images, classifier(images, top_k=2, batch_size=len(images))
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_backend_top1_matches_torch(torch_reference, backend, tmp_path, monkeypatch):
+    """양자화/ONNX 백엔드의 top-1 라벨이 PyTorch와 일치"""
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+        monkeypatch.setattr(settings, "AI_ONNX_CACHE_DIR", str(tmp_path))
+
+    model_name, images, reference = torch_reference
+    classifier = build_pipeline(model_name, backend)
+    results = classifier(images, top_k=1, batch_size=len(images))
+
+    compared = 0
+    for expected, actual in zip(reference, results):
+        if expected[0]["score"] - expected[1]["score"] < MIN_TOP1_MARGIN:
+            continue
+        assert actual[0]["label"] == expected[0]["label"]
+        compared += 1
+    assert compared > 0
@@ -0,0 +1,195 @@
+"""랭킹 (리더보드)"""
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.user import User
+from app.models.user_daily_stats import UserDailyStats
+from app.services.daily_stats import daily_stats_service
+from app.services.leaderboard import Leaderboard, LeaderboardService, period_start
+from tests.conftest import TestingSessionLocal
+
+
+def test_leaderboard_ranks_ties_and_updates():
+    a, b, c, d = (uuid.uuid4() for _ in range(4))
+    board = Leaderboard([(a, 5), (b, 3), (c, 3), (d, 0)])
+
+    # 같은 점수는 같은 순위, 다음 순위는 건너뜀
+    assert [(rank, value) for rank, _, value in board.top(10)] == [(1, 5), (2, 3), (2, 3), (4, 0)]
+    assert board.rank(c) == 2
+    assert board.rank(d) == 4
+
+    board.set(d, 4)
+    assert board.rank(d) == 2
+    assert board.rank(b) == 3
+    board.remove(a)
+    assert board.rank(d) == 1
+    assert len(board) == 3
+    assert board.rank(a) is None
+    # 없는 점수의 순위 = 더 높은 점수 수 + 1
+    assert board.rank_of_value(0) == 4
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """execute가 정해진 행을 돌려주는 세션 (gate를 주면 열릴 때까지 기다림)"""
+
+    def __init__(self, rows, gate: asyncio.Event | None = None):
+        self.rows = rows
+        self.gate = gate
+
+    async def execute(self, query):
+        if self.gate is not None:
+            await self.gate.wait()
+        return FakeResult(self.rows)
+
+
+def test_reload_does_not_block_other_boards():
+    """전체 로드 중에도 기존 리스트와 다른 (지표, 기간) 조회는 기다리지 않고, 새 리스트는 한 번에 교체"""
+    user_id = uuid.uuid4()
+    service = LeaderboardService(refresh_seconds=0)
+
+    async def scenario():
+        old = await service.get(FakeSession([(user_id, 3)]), "points")
+        gate = asyncio.Event()
+        reload = asyncio.create_task(service.get(FakeSession([(user_id, 5)], gate), "points"))
+        await asyncio.sleep(0)
+
+        # 로드 중인 리스트는 기존 것으로 응답, 다른 지표는 바로 로드
+        assert await asyncio.wait_for(service.get(FakeSession([]), "points"), 1) is old
+        other = await asyncio.wait_for(service.get(FakeSession([(user_id, 1)]), "cleanup"), 1)
+        assert other.score(user_id) == 1
+
+        gate.set()
+        new = await reload
+        assert new is not old
+        assert (old.score(user_id), new.score(user_id)) == (3, 5)
+
+    asyncio.run(scenario())
+
+
+def add_cleanups(db, user: User, count: int, **kwargs) -> None:
+    for _ in range(count):
+        db.add(Cleanup(
+            user_id=user.id, latitude=35.0, longitude=129.0,
+            trash_type="plastic", amount="handful", status="approved", **kwargs,
+        ))
+
+
+def test_ranking_returns_my_rank_outside_top(client, auth_headers):
+    with TestingSessionLocal() as db:
+        me = db.query(User).one()
+        others = [User(email=f"user{i}@test.com", nickname=f"user{i}") for i in range(3)]
+        db.add_all(others)
+        db.flush()
+        for user, count in zip(others, [5, 3, 3]):
+            add_cleanups(db, user, count)
+        add_cleanups(db, me, 1)
+        db.commit()
+
+    data = client.get("/api/rankings/cleanup", params={"limit": 1}, headers=auth_headers).json()
+    assert [(entry["nickname"], entry["rank"], entry["value"]) for entry in data["rankings"]] == [("user0", 1, 5)]
+    assert data["my_rank"] == 4
+    assert data["my_value"] == 1
+    assert data["total_users"] == 4
+
+    # 이 프로세스의 커밋은 다음 조회에 바로 반영
+    with TestingSessionLocal() as db:
+        add_cleanups(db, db.query(User).filter(User.email == "tester@test.com").one(), 3)
+        db.commit()
+    data = client.get("/api/rankings/cleanup", params={"limit": 1}, headers=auth_headers).json()
+    assert data["my_rank"] == 2
+    assert data["my_value"] == 4
+
+    # 로그인하지 않으면 내 순위 없음
+    data = client.get("/api/rankings/points").json()
+    assert data["my_rank"] is None
+    assert len(data["rankings"]) == 4
+
+
+def test_period_start():
+    today = date(2026, 10, 18)  # 일요일
+    assert period_start("week", today) == date(2026, 10, 12)
+    assert period_start("month", today) == date(2026, 10, 1)
+    assert period_start("season", today) == date(2026, 10, 1)
+    assert period_start("season", date(2026, 6, 30)) == date(2026, 4, 1)
+    assert period_start("all", today) is None
+    # 서비스는 ValueError (API에서는 쿼리 파라미터 검증으로 422)
+    with pytest.raises(ValueError):
+        asyncio.run(LeaderboardService(refresh_seconds=0).get(FakeSession([]), "points", "year"))
+
+
+def test_period_rankings_sum_daily_buckets(client, auth_headers):
+    old = datetime.utcnow() - timedelta(days=400)
+    with TestingSessionLocal() as db:
+        me = db.query(User).one()
+        first, second = User(email="first@test.com", nickname="first"), User(email="second@test.com", nickname="second")
+        db.add_all([first, second])
+        db.flush()
+        # 예전 기록은 전체 기간에만
+        add_cleanups(db, me, 3, created_at=old)
+        db.commit()
+        # 이번 주 같은 점수면 먼저 활동한 유저가 앞
+        add_cleanups(db, first, 2)
+        db.commit()
+        add_cleanups(db, second, 2)
+        db.commit()
+        # 승인된 기록의 지급 포인트를 기록 날짜에 더하고, 쓴 포인트는 빼지 않음
+        db.add(Sighting(user_id=me.id, latitude=35.1, longitude=129.0, status="approved",
+                        points_earned=10, created_at=old))
+        sighting = Sighting(user_id=me.id, latitude=35.1, longitude=129.0)
+        db.add(sighting)
+        db.commit()
+        sighting.status, sighting.points_earned = "approved", 50
+        me.points += 60
+        db.commit()
+        me.points -= 30
+        db.commit()
+
+    data = client.get("/api/rankings/cleanup", params={"period": "week"}, headers=auth_headers).json()
+    assert data["period"] == "week"
+    assert [(entry["nickname"], entry["rank"], entry["value"]) for entry in data["rankings"]] == [
+        ("first", 1, 2), ("second", 1, 2),
+    ]
+    # 기간 안에 활동이 없으면 0점, 순위는 점수가 있는 유저 다음
+    assert (data["my_rank"], data["my_value"]) == (3, 0)
+    assert data["total_users"] == 3
+
+    data = client.get("/api/rankings/cleanup", params={"period": "all"}, headers=auth_headers).json()
+    assert (data["my_rank"], data["my_value"]) == (1, 3)
+
+    data = client.get("/api/rankings/points", params={"period": "month"}, headers=auth_headers).json()
+    assert [(entry["nickname"], entry["value"]) for entry in data["rankings"]] == [("tester", 50)]
+    assert client.get("/api/rankings/points", headers=auth_headers).json()["my_value"] == 30
+
+    # 다시 계산해도 실시간 갱신과 같은 일별 행
+    with TestingSessionLocal() as db:
+        def buckets():
+            return sorted(
+                (str(row.user_id), row.day, row.cleanup_count, row.creature_count, row.points)
+                for row in db.query(UserDailyStats)
+            )
+        live = buckets()
+        daily_stats_service.rebuild(db)
+        assert buckets() == live
+
+    # 커밋된 변경은 기간 랭킹에도 바로 반영 (승인 취소 → 기간 점수 0이면 빠짐)
+    with TestingSessionLocal() as db:
+        for cleanup in db.query(Cleanup).join(User).filter(User.nickname == "first"):
+            cleanup.status = "rejected"
+        db.commit()
+    data = client.get("/api/rankings/cleanup", params={"period": "week"}).json()
+    assert [entry["nickname"] for entry in data["rankings"]] == ["second"]
+
+    assert client.get("/api/rankings/cleanup", params={"period": "year"}).status_code == 422
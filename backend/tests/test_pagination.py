@@ -0,0 +1,75 @@
+"""피드 커서 페이지네이션"""
+from datetime import datetime, timedelta
+
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+
+def seed_feed(count: int) -> None:
+    """같은 created_at이 여러 건 섞인 목격/수거 기록 생성"""
+    base = datetime(2026, 1, 1)
+    with TestingSessionLocal() as db:
+        user = User(email="feed@test.com", nickname="feed")
+        db.add(user)
+        db.flush()
+        for i in range(count):
+            created_at = base + timedelta(minutes=i // 3)  # 3건씩 같은 시각
+            db.add(Sighting(
+                user_id=user.id, latitude=35.0, longitude=129.0,
+                status="approved", created_at=created_at,
+            ))
+            db.add(Cleanup(
+                user_id=user.id, latitude=35.0, longitude=129.0,
+                trash_type="plastic", amount="handful",
+                status="approved", created_at=created_at,
+            ))
+        db.commit()
+
+
+def walk_feed(client, path: str, key: str, limit: int) -> tuple[list[dict], dict]:
+    first = client.get(path, params={"limit": limit}).json()
+    items = list(first[key])
+    cursor = first["next_cursor"]
+    while cursor:
+        page = client.get(path, params={"limit": limit, "cursor": cursor}).json()
+        # 다음 페이지부터는 전체 개수를 세지 않음
+        assert page["total"] is None
+        items += page[key]
+        cursor = page["next_cursor"]
+    return items, first
+
+
+def test_feed_cursor_pagination(client):
+    seed_feed(25)
+
+    for path, key in [("/api/sightings", "sightings"), ("/api/cleanups", "cleanups")]:
+        items, first = walk_feed(client, path, key, limit=4)
+
+        assert first["total"] == 25
+        # 같은 시각의 기록도 빠지거나 겹치지 않고 최신순으로 한 번씩
+        assert len(items) == 25
+        assert len({item["id"] for item in items}) == 25
+        order = [(item["created_at"], item["id"]) for item in items]
+        assert order == sorted(order, reverse=True)
+
+        # 이전 클라이언트의 page 요청도 같은 순서
+        legacy = client.get(path, params={"limit": 4, "page": 2}).json()
+        assert [item["id"] for item in legacy[key]] == [item["id"] for item in items[4:8]]
+        assert legacy["next_cursor"] is not None
+
+
+def test_feed_rejects_invalid_cursor(client):
+    response = client.get("/api/sightings", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_feed_rejects_out_of_range_limit_and_page(client):
+    seed_feed(3)
+    for path in ("/api/sightings", "/api/cleanups"):
+        for params in ({"limit": 0}, {"limit": -1}, {"limit": 101}, {"page": 0}, {"page": -1}):
+            assert client.get(path, params=params).status_code == 422, (path, params)
+        response = client.get(path, params={"limit": 100})
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
@@ -0,0 +1,81 @@
+"""자주 쓰는 조회가 인덱스를 타는지 EXPLAIN QUERY PLAN으로 확인 (SQLite)"""
+import uuid
+
+import pytest
+from datetime import datetime
+
+from sqlalchemy import desc, func, select, tuple_
+
+from app.database import Base
+from app.models.badge import UserBadge
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.user_creature import UserCollection
+from tests.conftest import engine
+
+USER_ID = uuid.uuid4()
+
+HOT_QUERIES = {
+    "sighting feed": select(Sighting).order_by(desc(Sighting.created_at)).limit(20),
+    "sighting feed next page": select(Sighting)
+    .where(tuple_(Sighting.created_at, Sighting.id) < tuple_(datetime(2026, 1, 1), USER_ID))
+    .order_by(desc(Sighting.created_at), desc(Sighting.id)).limit(21),
+    "sighting feed by status": select(Sighting).where(Sighting.status == "approved")
+    .order_by(desc(Sighting.created_at)).limit(20),
+    "sighting admin queue": select(Sighting).where(Sighting.status == "pending")
+    .order_by(Sighting.created_at).limit(20),
+    "sighting user feed": select(Sighting).where(Sighting.user_id == USER_ID)
+    .order_by(desc(Sighting.created_at)).limit(20),
+    "sighting map": select(Sighting).where(Sighting.status == "approved").limit(500),
+    "sighting profile count": select(func.count()).select_from(Sighting)
+    .where(Sighting.user_id == USER_ID, Sighting.status == "approved"),
+    "cleanup feed": select(Cleanup).order_by(desc(Cleanup.created_at)).limit(20),
+    "cleanup feed by status": select(Cleanup).where(Cleanup.status == "approved")
+    .order_by(desc(Cleanup.created_at)).limit(20),
+    "cleanup feed by trash type": select(Cleanup).where(Cleanup.trash_type == "plastic")
+    .order_by(desc(Cleanup.created_at)).limit(20),
+    "cleanup admin queue": select(Cleanup).where(Cleanup.status == "pending")
+    .order_by(Cleanup.created_at).limit(20),
+    "cleanup profile count": select(func.count()).select_from(Cleanup)
+    .where(Cleanup.user_id == USER_ID, Cleanup.status == "approved"),
+    "user collection": select(UserCollection).where(UserCollection.user_id == USER_ID),
+    "user badges": select(UserBadge).where(UserBadge.user_id == USER_ID),
+}
+
+
+# 테이블 전체가 대상인 피드는 정렬까지 인덱스로 처리해야 함 (유저별 결과는 작아서 정렬 허용)
+SORTED_BY_INDEX = {name for name in HOT_QUERIES if "feed" in name or "queue" in name} - {
+    "sighting user feed",
+}
+
+
+@pytest.fixture(scope="module")
+def tables():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def explain(statement) -> list[str]:
+    compiled = statement.compile(dialect=engine.dialect)
+    # 계획은 값과 무관하므로 UUID 등은 문자열로만 넘김
+    params = tuple(
+        str(value) if isinstance(value, uuid.UUID) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(tables, name):
+    plan = explain(HOT_QUERIES[name])
+    table_steps = [step for step in plan if step.startswith(("SCAN", "SEARCH"))]
+
+    assert table_steps, plan
+    # 인덱스 없이 테이블 전체를 읽으면 안 됨
+    for step in table_steps:
+        assert "INDEX" in step, f"{name}: {plan}"
+    if name in SORTED_BY_INDEX:
+        assert not any("TEMP B-TREE" in step for step in plan), f"{name}: {plan}"
@@ -0,0 +1,634 @@
+"""업로드 경로 테스트"""
+import asyncio
+import io
+import threading
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from PIL import Image
+
+from app.config import settings
+from app.models.sighting import Sighting
+from app.models.stored_object import StoredObject
+from app.models.upload_job import UploadJob
+from app.services.http_client import HttpClientPool
+from app.services.image_worker import ImageWorker
+from app.services.storage import (
+    LocalStorageBackend, StorageBackend, StorageService, SupabaseStorageBackend, storage_service,
+)
+from app.services.result_cache import image_digest
+from app.services import upload_queue as upload_queue_module
+from app.services.upload_queue import UploadQueue, upload_queue
+from tests.conftest import TestingSessionLocal
+
+
+def make_image_bytes(seed: int, image_format: str = "PNG") -> bytes:
+    """서로 해시가 다른 테스트용 이미지 생성 (기본 PNG)"""
+    image = Image.effect_noise((64, 64), 64 + seed * 10).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    """Supabase 업로드 대신 더미 URL 반환"""
+    uploaded = []
+
+    async def upload_image(image_bytes, folder="sightings", content_type="image/jpeg", digest=None, protected=False):
+        uploaded.append(folder)
+        return f"http://storage.test/{folder}/{len(uploaded)}.jpg"
+
+    monkeypatch.setattr(storage_service, "upload_image", upload_image)
+    return uploaded
+
+
+@pytest.fixture
+def decode_counter(monkeypatch):
+    """PIL 이미지 디코딩(Image.open) 호출 횟수 집계"""
+    calls = []
+    original_open = Image.open
+
+    def counting_open(*args, **kwargs):
+        calls.append(args)
+        return original_open(*args, **kwargs)
+
+    monkeypatch.setattr(Image, "open", counting_open)
+    return calls
+
+
+@pytest.mark.parametrize("image_format", ["PNG", "JPEG"])
+def test_create_sighting_decodes_once(client, auth_headers, fake_storage, decode_counter, image_format):
+    """목격 등록 시 사진은 한 번만 디코딩 (JPEG도 pHash와 정규화가 디코딩 결과를 공유)"""
+    response = client.post(
+        "/api/sightings",
+        data={"latitude": "35.1", "longitude": "129.0"},
+        files={"photo": ("a", make_image_bytes(1, image_format), f"image/{image_format.lower()}")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert len(decode_counter) == 1
+    assert fake_storage == ["sightings", "sightings/thumbs"]
+
+
+@pytest.mark.parametrize("image_format", ["PNG", "JPEG"])
+def test_create_cleanup_decodes_each_photo_once(client, auth_headers, fake_storage, decode_counter, image_format):
+    """수거 등록 시 Before/After 사진은 각각 한 번만 디코딩"""
+    content_type = f"image/{image_format.lower()}"
+    response = client.post(
+        "/api/cleanups",
+        data={"latitude": "35.1", "longitude": "129.0", "trash_type": "plastic", "amount": "one_bag"},
+        files={
+            "before_photo": ("before", make_image_bytes(2, image_format), content_type),
+            "after_photo": ("after", make_image_bytes(3, image_format), content_type),
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert len(decode_counter) == 2
+    assert sorted(fake_storage) == [
+        "cleanups/after", "cleanups/after/thumbs", "cleanups/before", "cleanups/before/thumbs",
+    ]
+
+
+def test_image_worker_rejects_when_saturated():
+    """대기 작업이 가득 차면 503으로 거절"""
+    worker = ImageWorker(mode="thread", max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.create_task(worker.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as exc_info:
+            await worker.run(sum, [1, 2])
+        release.set()
+        await first
+        return exc_info.value
+
+    try:
+        error = asyncio.run(scenario())
+    finally:
+        worker.shutdown()
+    assert error.status_code == 503
+    assert worker.pending == 0
+
+
+def test_invalid_image_rejected(client, auth_headers, fake_storage):
+    """이미지가 아닌 업로드는 400"""
+    response = client.post(
+        "/api/sightings",
+        data={"latitude": "35.1", "longitude": "129.0"},
+        files={"photo": ("a.png", b"not an image", "image/png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert fake_storage == []
+
+
+def test_oversized_uploads_rejected(client, auth_headers, fake_storage, decode_counter, monkeypatch):
+    """사진 크기 상한을 넘으면 디코딩 전에 413, 요청 본문 상한을 넘으면 파싱 전에 413"""
+    image_bytes = make_image_bytes(1)
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", len(image_bytes) - 1)
+    response = client.post(
+        "/api/sightings",
+        data={"latitude": "35.1", "longitude": "129.0"},
+        files={"photo": ("a.png", image_bytes, "image/png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 413
+    assert decode_counter == []
+    assert fake_storage == []
+
+    too_large = b"\xff\xd8\xff" + b"\0" * settings.UPLOAD_MAX_REQUEST_BYTES
+    response = client.post(
+        "/api/ai/classify/trash",
+        files={"photo": ("a.jpg", too_large, "image/jpeg")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 413
+
+
+def test_storage_reuses_shared_client(client, monkeypatch):
+    """업로드/삭제가 호출마다 새 클라이언트를 만들지 않고 주입된 풀을 재사용"""
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.url.path))
+        if request.method == "HEAD":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"Key": "ok"})
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    pool = HttpClientPool(transport=httpx.MockTransport(handler))
+    storage = StorageService(SupabaseStorageBackend(http=pool), session_factory=TestingSessionLocal)
+
+    async def scenario():
+        url = await storage.upload_image(make_image_bytes(seed=1), folder="sightings")
+        client = pool.client
+        expire_protection()
+        assert await storage.delete_image(storage.path_from_url(url))
+        assert pool.client is client
+        await pool.close()
+        return url
+
+    url = asyncio.run(scenario())
+    assert url.startswith(f"{settings.SUPABASE_URL}/storage/v1/object/public/images/sightings/")
+    assert [method for method, _ in requests] == ["HEAD", "POST", "DELETE"]
+
+
+def test_cleanup_upload_failure_discards_other_photo(client, auth_headers, monkeypatch):
+    """한쪽 업로드가 실패하면 이미 올라간 다른 사진은 지우고 기록을 만들지 않음"""
+    deleted = []
+
+    async def upload_image(image_bytes, folder="sightings", content_type="image/jpeg", digest=None, protected=False):
+        if folder == "cleanups/after":
+            raise RuntimeError("storage unavailable")
+        return storage_service.get_public_url(f"{folder}/1.jpg")
+
+    async def delete_image(file_path, db=None):
+        deleted.append(file_path)
+        return True
+
+    monkeypatch.setattr(storage_service, "upload_image", upload_image)
+    monkeypatch.setattr(storage_service, "delete_image", delete_image)
+
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/api/cleanups",
+            data={"latitude": "35.1", "longitude": "129.0", "trash_type": "plastic", "amount": "one_bag"},
+            files={
+                "before_photo": ("before.png", make_image_bytes(2), "image/png"),
+                "after_photo": ("after.png", make_image_bytes(3), "image/png"),
+            },
+            headers=auth_headers,
+        )
+    assert sorted(deleted) == [
+        "cleanups/after/thumbs/1.jpg", "cleanups/before/1.jpg", "cleanups/before/thumbs/1.jpg",
+    ]
+    assert client.get("/api/cleanups").json()["total"] == 0
+
+
+@pytest.fixture
+def deferred_uploads(monkeypatch, tmp_path):
+    """UPLOAD_MODE=deferred + 가짜 Storage 서버를 쓰는 업로드 큐"""
+    storage_requests = []
+    failures = {"remaining": 0}
+
+    def handler(request):
+        if request.method == "HEAD":
+            return httpx.Response(404)
+        storage_requests.append(request.url.path)
+        if failures["remaining"]:
+            failures["remaining"] -= 1
+            return httpx.Response(500, text="storage down")
+        return httpx.Response(200, json={"Key": request.url.path})
+
+    monkeypatch.setattr(settings, "UPLOAD_MODE", "deferred")
+    monkeypatch.setattr(upload_queue, "spool_dir", str(tmp_path))
+    pool = HttpClientPool(transport=httpx.MockTransport(handler))
+
+    def off_loop_session():
+        # 워커는 이벤트 루프에서 돌므로 DB 작업은 루프 스레드 밖에서만
+        assert threading.current_thread() is not threading.main_thread()
+        return TestingSessionLocal()
+
+    def make_queue():
+        # 재시작된 워커처럼 새 인스턴스가 DB/스풀에 남은 작업을 이어서 처리
+        return UploadQueue(
+            spool_dir=str(tmp_path),
+            storage=StorageService(
+                SupabaseStorageBackend(http=pool), session_factory=off_loop_session
+            ),
+            session_factory=off_loop_session,
+        )
+
+    yield make_queue, failures, storage_requests, tmp_path
+    asyncio.run(pool.close())
+
+
+def test_deferred_sighting_upload_retries_with_backoff(client, auth_headers, deferred_uploads, monkeypatch):
+    """요청은 업로드 없이 응답하고, 워커가 실패를 백오프로 재시도한 뒤 URL을 채움"""
+    make_queue, failures, storage_requests, spool_dir = deferred_uploads
+    monkeypatch.setattr(settings, "IMAGE_NORMALIZE", False)  # 썸네일 없이 작업 1개
+    response = client.post(
+        "/api/sightings",
+        data={"latitude": "35.1", "longitude": "129.0"},
+        files={"photo": ("a.png", make_image_bytes(1), "image/png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    sighting = response.json()
+    assert sighting["photo_url"] is None
+    assert sighting["upload_status"] == "processing"
+    assert len(list(spool_dir.iterdir())) == 1
+    assert storage_requests == []
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    failures["remaining"] = 1
+    now = datetime.utcnow()
+    assert asyncio.run(make_queue().process_due(now)) == 1
+    with TestingSessionLocal() as db:
+        job = db.query(UploadJob).one()
+        assert (job.status, job.attempts) == ("pending", 1)
+        assert job.next_attempt_at == now + timedelta(seconds=settings.UPLOAD_RETRY_BASE_SECONDS)
+
+    assert asyncio.run(make_queue().process_due(now)) == 0  # 백오프 대기 중
+    assert asyncio.run(make_queue().process_due(now + timedelta(seconds=3))) == 1
+
+    detail = client.get(f"/api/sightings/{sighting['id']}").json()
+    assert detail["upload_status"] == "uploaded"
+    assert detail["photo_url"].startswith(f"{settings.SUPABASE_URL}/storage/v1/object/public/images/sightings/")
+    assert len(storage_requests) == 2
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_deferred_cleanup_uploaded_after_both_jobs(client, auth_headers, deferred_uploads, monkeypatch):
+    """Before/After 작업이 모두 끝나야 업로드 완료"""
+    make_queue, _, storage_requests, spool_dir = deferred_uploads
+    response = client.post(
+        "/api/cleanups",
+        data={"latitude": "35.1", "longitude": "129.0", "trash_type": "plastic", "amount": "one_bag"},
+        files={
+            "before_photo": ("before.png", make_image_bytes(2), "image/png"),
+            "after_photo": ("after.png", make_image_bytes(3), "image/png"),
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    cleanup = response.json()
+    assert cleanup["upload_status"] == "processing"
+
+    monkeypatch.setattr(settings, "DEBUG", False)
+    assert asyncio.run(make_queue().process_due()) == 4  # 사진 2장 + 썸네일 2장
+
+    detail = client.get(f"/api/cleanups/{cleanup['id']}").json()
+    assert detail["upload_status"] == "uploaded"
+    assert "/cleanups/before/" in detail["before_photo_url"]
+    assert "/cleanups/after/" in detail["after_photo_url"]
+    assert "/cleanups/before/thumbs/" in detail["before_thumbnail_url"]
+    assert "/cleanups/after/thumbs/" in detail["after_thumbnail_url"]
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_deferred_jobs_leased_one_at_a_time(client, auth_headers, deferred_uploads, monkeypatch):
+    """업로드가 오래 걸려도 뒤 작업은 처리 직전에 임대 (앞 작업을 올리는 동안 임대가 만료되지 않음)"""
+    make_queue, _, _, _ = deferred_uploads
+    response = client.post(
+        "/api/cleanups",
+        data={"latitude": "35.1", "longitude": "129.0", "trash_type": "plastic", "amount": "one_bag"},
+        files={
+            "before_photo": ("before.png", make_image_bytes(2), "image/png"),
+            "after_photo": ("after.png", make_image_bytes(3), "image/png"),
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+
+    clock = {"seconds": 0.0}
+    monkeypatch.setattr(upload_queue_module.time, "monotonic", lambda: clock["seconds"])
+    queue = make_queue()
+    leases = []
+
+    async def slow_upload(image_bytes, folder="sightings", content_type="image/jpeg", digest=None, protected=False):
+        def snapshot():
+            with TestingSessionLocal() as db:
+                return [
+                    locked_until for (locked_until,) in db.query(UploadJob.locked_until)
+                    .filter(UploadJob.status == "pending", UploadJob.locked_until.isnot(None))
+                ]
+        leases.append((clock["seconds"], await asyncio.to_thread(snapshot)))
+        clock["seconds"] += upload_queue_module.JOB_LEASE.total_seconds()  # 업로드마다 임대 시간만큼 걸림
+        return f"https://storage.test/{folder}/{len(leases)}.jpg"
+
+    monkeypatch.setattr(queue.storage, "upload_image", slow_upload)
+    now = datetime.utcnow()
+    assert asyncio.run(queue.process_due(now)) == 4
+
+    for elapsed, locked in leases:
+        # 처리 중인 작업 하나만 임대돼 있고, 임대는 처리 시작 시점부터 JOB_LEASE만큼 유효
+        assert locked == [now + timedelta(seconds=elapsed) + upload_queue_module.JOB_LEASE]
+
+
+def expire_protection() -> None:
+    """업로드 보호 시간이 지난 것으로 만듦"""
+    with TestingSessionLocal() as db:
+        db.execute(update(StoredObject).values(protected_until=datetime.utcnow() - timedelta(seconds=1)))
+        db.commit()
+
+
+def test_cleanup_upload_protects_paths_in_request_session(client, auth_headers, tmp_path, monkeypatch):
+    """업로드 보호 시간은 요청 세션에서 한 번에 기록 (동기 풀 세션을 열지 않음)"""
+    backend = LocalStorageBackend(str(tmp_path / "media"), base_url="http://testserver")
+    monkeypatch.setattr(storage_service, "backend", backend)
+    opened = []
+
+    def counting_factory():
+        opened.append(threading.current_thread().name)
+        return TestingSessionLocal()
+
+    monkeypatch.setattr(storage_service, "session_factory", counting_factory)
+
+    response = client.post(
+        "/api/cleanups",
+        data={"latitude": "35.1", "longitude": "129.0", "trash_type": "plastic", "amount": "one_bag"},
+        files={
+            "before_photo": ("before.png", make_image_bytes(4), "image/png"),
+            "after_photo": ("after.png", make_image_bytes(5), "image/png"),
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert opened == []
+    with TestingSessionLocal() as db:
+        # 본 이미지 + 썸네일 두 장씩, 기록이 참조
+        rows = db.query(StoredObject).all()
+        assert len(rows) == 4
+        assert all(row.ref_count == 1 for row in rows)
+
+
+def test_local_storage_backend_serves_uploads(client, tmp_path, monkeypatch):
+    """local 백엔드는 디스크에 저장하고 /api/media로 서빙, 루트 밖 경로는 거부"""
+    backend = LocalStorageBackend(str(tmp_path / "media"), base_url="http://testserver")
+    monkeypatch.setattr(storage_service, "backend", backend)
+    image_bytes = make_image_bytes(1)
+
+    url = asyncio.run(storage_service.upload_image(image_bytes, folder="sightings"))
+    assert url.startswith("http://testserver/api/media/sightings/")
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == image_bytes
+
+    assert client.get("/api/media/..%2F..%2Fetc%2Fpasswd").status_code == 404
+    assert asyncio.run(storage_service.sweep()) == 0
+    expire_protection()
+    assert asyncio.run(storage_service.sweep()) == 1
+    assert client.get(url).status_code == 404
+
+
+def test_local_storage_concurrent_writes_same_key(tmp_path):
+    """같은 키를 동시에 써도 임시 파일이 겹치지 않고 완성된 파일만 남음"""
+    backend = LocalStorageBackend(str(tmp_path / "media"))
+    image_bytes = make_image_bytes(1)
+
+    async def write_many():
+        await asyncio.gather(*(backend.put("sightings/same.png", image_bytes, "image/png") for _ in range(20)))
+
+    asyncio.run(write_many())
+    assert (tmp_path / "media" / "sightings" / "same.png").read_bytes() == image_bytes
+    assert [path.name for path in (tmp_path / "media" / "sightings").iterdir()] == ["same.png"]
+
+
+def test_local_storage_stream_writes_same_key(tmp_path):
+    """서명 URL 업로드도 요청마다 다른 임시 파일, 중간에 실패하면 임시 파일을 지움"""
+    backend = LocalStorageBackend(str(tmp_path / "media"))
+    path = backend.resolve("uploads/u1/same.png")
+    image_bytes = make_image_bytes(1)
+
+    async def chunks(fail: bool = False):
+        for start in range(0, len(image_bytes), 1024):
+            await asyncio.sleep(0)
+            yield image_bytes[start:start + 1024]
+        if fail:
+            raise RuntimeError("too large")
+
+    async def scenario():
+        await asyncio.gather(*(backend.write_stream(path, chunks()) for _ in range(10)))
+        with pytest.raises(RuntimeError):
+            await backend.write_stream(path, chunks(fail=True))
+
+    asyncio.run(scenario())
+    folder = tmp_path / "media" / "uploads" / "u1"
+    assert (folder / "same.png").read_bytes() == image_bytes
+    assert [child.name for child in folder.iterdir()] == ["same.png"]
+
+
+def test_incomplete_storage_backend_rejected():
+    """구현하지 않은 메서드가 있는 백엔드는 만들 때 실패"""
+    class UploadOnlyBackend(StorageBackend):
+        async def put(self, file_path, data, content_type):
+            pass
+
+    with pytest.raises(TypeError):
+        UploadOnlyBackend()
+
+
+def test_storage_dedupes_identical_bytes(client, auth_headers, tmp_path, monkeypatch):
+    """같은 바이트는 같은 키로 한 번만 저장, 참조하는 기록이 있으면 삭제하지 않음"""
+    backend = LocalStorageBackend(str(tmp_path / "media"))
+    puts = []
+    original_put = backend.put
+
+    async def counting_put(file_path, data, content_type):
+        puts.append(file_path)
+        await original_put(file_path, data, content_type)
+
+    monkeypatch.setattr(backend, "put", counting_put)
+    monkeypatch.setattr(storage_service, "backend", backend)
+    monkeypatch.setattr(settings, "IMAGE_NORMALIZE", False)  # 원본 바이트 그대로 저장
+    image_bytes = make_image_bytes(1)
+
+    first = asyncio.run(storage_service.upload_image(image_bytes, folder="sightings", content_type="image/png"))
+    second = asyncio.run(storage_service.upload_image(image_bytes, folder="sightings", content_type="image/png"))
+    assert first == second
+    assert first.endswith(f"/sightings/{image_digest(image_bytes)}.png")
+    assert len(puts) == 1
+
+    response = client.post(
+        "/api/sightings",
+        data={"latitude": "35.1", "longitude": "129.0"},
+        files={"photo": ("a.png", image_bytes, "image/png")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["photo_url"] == first
+    assert len(puts) == 1
+
+    path = storage_service.path_from_url(first)
+    expire_protection()
+    with TestingSessionLocal() as db:
+        assert storage_service.reference_count(db, path) == 1
+        assert asyncio.run(storage_service.delete_image(path, db)) is False
+        # 기록의 URL로 다시 계산해도 같음
+        storage_service.rebuild_references(db)
+        assert storage_service.reference_count(db, path) == 1
+    assert asyncio.run(backend.exists(path))
+
+    # 다른 요청이 같은 내용을 올린 직후(커밋 전)면 보상 삭제가 지우지 않음
+    other = make_image_bytes(2)
+    url = asyncio.run(storage_service.upload_image(other, folder="sightings", content_type="image/png"))
+    asyncio.run(storage_service.discard_uploads([url]))
+    assert asyncio.run(backend.exists(storage_service.path_from_url(url)))
+
+    # 기록이 지워져 참조가 없어지면 정리 작업이 보호 시간 뒤에 삭제
+    with TestingSessionLocal() as db:
+        for sighting in db.query(Sighting).all():
+            db.delete(sighting)
+        db.commit()
+        assert storage_service.reference_count(db, path) == 0
+    expire_protection()
+    assert asyncio.run(storage_service.sweep()) >= 2
+    assert not asyncio.run(backend.exists(path))
+    assert not asyncio.run(backend.exists(storage_service.path_from_url(url)))
+
+
+def test_image_pipeline_normalizes_upload():
+    """EXIF 회전 적용 후 메타데이터 제거, 긴 변 제한, 썸네일 생성"""
+    from app.services.image_pipeline import prepare_image
+
+    image = Image.effect_noise((400, 200), 64).convert("RGB")
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 시계 방향 90도 회전
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+
+    prepared = prepare_image(
+        buffer.getvalue(), max_dimension=100, thumbnail_size=40,
+        image_format="webp", quality=80, thumbnail_quality=70,
+    )
+    assert prepared.content_type == "image/webp"
+    normalized = Image.open(io.BytesIO(prepared.data))
+    assert normalized.format == "WEBP"
+    assert normalized.size == (50, 100)  # 세로로 회전된 뒤 축소
+    assert not normalized.getexif()
+    assert Image.open(io.BytesIO(prepared.thumbnail)).size == (20, 40)
+    assert len(prepared.phash) == 16
+
+
+def test_image_pipeline_phash_matches_duplicate_check(monkeypatch):
+    """업로드 때 저장하는 pHash와 중복 검사 pHash가 같은 값 (축소 디코딩되는 큰 JPEG, PNG)"""
+    from app.services.image_hash import phash_hex
+    from app.services.image_pipeline import prepare_image
+
+    # 중복 검사는 설정된 정규화 크기와 같은 배율로 디코딩
+    monkeypatch.setattr(settings, "IMAGE_MAX_DIMENSION", 800)
+
+    image = Image.radial_gradient("L").resize((2000, 1200)).convert("RGB")
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    for image_format in ("JPEG", "PNG"):
+        buffer = io.BytesIO()
+        image.save(buffer, format=image_format, exif=exif)
+        prepared = prepare_image(
+            buffer.getvalue(), max_dimension=800, thumbnail_size=40,
+            image_format="webp", quality=80, thumbnail_quality=70,
+        )
+        assert prepared.phash == phash_hex(buffer.getvalue())
+
+
+def test_direct_upload_finalize(client, auth_headers, tmp_path, monkeypatch):
+    """서명 URL로 직접 올린 사진으로 목격 등록, 임시 파일은 정리"""
+    backend = LocalStorageBackend(str(tmp_path / "media"), base_url="http://testserver")
+    monkeypatch.setattr(storage_service, "backend", backend)
+
+    signed = client.post(
+        "/api/uploads/sign", json={"content_type": "image/png"}, headers=auth_headers
+    ).json()
+    object_key = signed["object_key"]
+    assert object_key.startswith("uploads/")
+
+    # 업로드 토큰은 액세스 토큰으로 쓸 수 없고, 서명이 틀린 URL로는 올릴 수 없음
+    upload_token_headers = {"Authorization": f"Bearer {signed['upload_token']}"}
+    assert client.get("/api/users/me", headers=upload_token_headers).status_code == 401
+    forged_url = signed["upload_url"].replace("signature=", "signature=0")
+    assert client.put(forged_url, content=make_image_bytes(1)).status_code == 403
+
+    response = client.put(signed["upload_url"], content=make_image_bytes(1), headers=signed["headers"])
+    assert response.status_code == 204
+    assert asyncio.run(backend.exists(object_key))
+
+    response = client.post(
+        "/api/sightings/finalize",
+        json={"latitude": 35.1, "longitude": 129.0, "upload_token": signed["upload_token"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201, response.text
+    sighting = response.json()
+    assert "/api/media/sightings/" in sighting["photo_url"]
+    assert client.get(sighting["photo_url"]).status_code == 200
+    assert not asyncio.run(backend.exists(object_key))
+
+    # 이미 처리된 토큰은 다시 쓸 수 없음
+    response = client.post(
+        "/api/sightings/finalize",
+        json={"latitude": 35.1, "longitude": 129.0, "upload_token": signed["upload_token"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+
+
+def test_direct_upload_staged_files_cleaned_up(client, auth_headers, tmp_path, monkeypatch):
+    """finalize가 어떤 이유로 실패해도 임시 파일을 지우고, finalize되지 않은 파일은 만료 후 정리"""
+    from app.api import sightings
+
+    backend = LocalStorageBackend(str(tmp_path / "media"), base_url="http://testserver")
+    monkeypatch.setattr(storage_service, "backend", backend)
+
+    def sign_and_upload(seed: int) -> dict:
+        signed = client.post(
+            "/api/uploads/sign", json={"content_type": "image/png"}, headers=auth_headers
+        ).json()
+        client.put(signed["upload_url"], content=make_image_bytes(seed), headers=signed["headers"])
+        assert asyncio.run(backend.exists(signed["object_key"]))
+        return signed
+
+    async def broken_register(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    signed = sign_and_upload(1)
+    monkeypatch.setattr(sightings, "register_sighting", broken_register)
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/api/sightings/finalize",
+            json={"latitude": 35.1, "longitude": 129.0, "upload_token": signed["upload_token"]},
+            headers=auth_headers,
+        )
+    assert not asyncio.run(backend.exists(signed["object_key"]))
+
+    abandoned = sign_and_upload(2)
+    assert asyncio.run(storage_service.sweep()) == 0
+    expire_protection()
+    assert asyncio.run(storage_service.sweep()) == 1
+    assert not asyncio.run(backend.exists(abandoned["object_key"]))
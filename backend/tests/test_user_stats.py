@@ -0,0 +1,81 @@
+"""유저 프로필 통계 (user_stats)"""
+import uuid
+
+from sqlalchemy import event
+
+from app.models.badge import UserBadge
+from app.models.cleanup import Cleanup
+from app.models.sighting import Sighting
+from app.models.user import User
+from app.models.user_creature import UserCollection
+from app.models.user_stats import UserStats
+from app.services.point_service import point_service
+from app.services.user_stats import user_stats_service
+from tests.conftest import TestingSessionLocal, async_engine
+
+
+def test_user_stats_follow_approvals_collection_and_badges(client, auth_headers):
+    with TestingSessionLocal() as db:
+        user = db.query(User).one()
+        # 유저를 만들 때 통계 행도 같이 생김
+        assert db.get(UserStats, user.id).as_dict() == {
+            "sighting_count": 0, "cleanup_count": 0, "creature_count": 0, "badge_count": 0,
+        }
+
+        approved = Sighting(user_id=user.id, latitude=35.0, longitude=129.0, status="approved")
+        pending = Sighting(user_id=user.id, latitude=35.0, longitude=129.0)
+        cleanup = Cleanup(
+            user_id=user.id, latitude=35.0, longitude=129.0,
+            trash_type="plastic", amount="handful", status="pending",
+        )
+        db.add_all([approved, pending, cleanup])
+        db.flush()
+        db.add(UserCollection(user_id=user.id, creature_id="creature-001", first_sighting_id=approved.id))
+        db.add(UserBadge(user_id=user.id, badge_id=uuid.uuid4()))
+        db.commit()
+
+        # 커밋 후 만료된 객체의 상태 변경도 반영 (승인/취소)
+        pending.status = "approved"
+        cleanup.status = "approved"
+        db.commit()
+        approved.status = "rejected"
+        db.commit()
+        db.delete(pending)
+        db.commit()
+
+        expected = {"sighting_count": 0, "cleanup_count": 1, "creature_count": 1, "badge_count": 1}
+        assert db.get(UserStats, user.id).as_dict() == expected
+        # 원본 테이블 집계와 일치
+        assert dict(db.execute(user_stats_service.aggregate_query(user.id)).one()._mapping) == expected
+        assert point_service.get_user_stats(db, str(user.id))["cleanup_count"] == 1
+        user_id = user.id
+
+    profile = client.get("/api/users/me", headers=auth_headers).json()
+    assert {key: profile[key] for key in expected} == expected
+    public = client.get(f"/api/users/{user_id}").json()
+    assert {key: public[key] for key in expected} == expected
+
+    # 통계 행이 없어도 (초기화 전) 원본에서 집계
+    with TestingSessionLocal() as db:
+        db.query(UserStats).delete()
+        db.commit()
+    profile = client.get("/api/users/me", headers=auth_headers).json()
+    assert {key: profile[key] for key in expected} == expected
+
+
+def test_profile_stats_single_query(client, auth_headers):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/users/me", headers=auth_headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    # 현재 유저 조회 1번 + 통계 1번
+    assert len(statements) == 2, statements
+    assert "user_stats" in statements[1]